@@ -0,0 +1,66 @@
+# agenda_avisos.py
+
+import heapq
+import math
+from datetime import datetime
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+# A espera é limitada para que a agenda se recupere de ajustes no relógio do sistema
+# (sincronização NTP após ligar, suspensão), já que o QTimer conta tempo monotônico.
+ESPERA_MAXIMA_MS = 5 * 60 * 1000
+
+class AgendaAvisos(QObject):
+    """Exibe e retira avisos no instante de data_inicio/data_fim, sem depender da API.
+
+    Guarda os avisos programados (vigentes e futuros) da última sincronização e um heap com os
+    próximos instantes em que a seleção muda; um único QTimer fica armado para o mais próximo.
+    """
+    vigentes_mudaram = pyqtSignal(list)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.programados = []
+        self.vigentes = []
+        self.fronteiras = []  # heap de datetime com inícios e fins ainda por vir
+        self.timer = QTimer(self); self.timer.setSingleShot(True)
+        # O timer padrão (CoarseTimer) admite 5% de erro: uma hora de espera poderia atrasar 3 minutos.
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self._quando_fronteira)
+
+    def programar(self, avisos) -> list:
+        """Substitui os avisos programados e retorna os vigentes agora, na ordem recebida."""
+        agora = datetime.now()
+        self.programados = [aviso for aviso in avisos if aviso['data_fim_obj'] >= agora]
+        self.fronteiras = []
+        for aviso in self.programados:
+            if aviso['data_inicio_obj'] > agora: self.fronteiras.append(aviso['data_inicio_obj'])
+            self.fronteiras.append(aviso['data_fim_obj'])
+        heapq.heapify(self.fronteiras)
+        self.vigentes = self._selecionar(agora)
+        self._armar(agora)
+        return self.vigentes
+
+    def proxima_mudanca(self):
+        """Instante da próxima entrada ou saída de aviso, ou None."""
+        return self.fronteiras[0] if self.fronteiras else None
+
+    def _selecionar(self, agora) -> list:
+        return [aviso for aviso in self.programados if aviso['data_inicio_obj'] <= agora <= aviso['data_fim_obj']]
+
+    def _armar(self, agora):
+        if not self.fronteiras:
+            self.timer.stop(); return
+        espera = math.ceil((self.fronteiras[0] - agora).total_seconds() * 1000)
+        self.timer.start(max(1, min(ESPERA_MAXIMA_MS, espera)))
+
+    def _quando_fronteira(self):
+        agora = datetime.now()
+        # Um aviso ainda aparece no próprio instante de data_fim; a fronteira passa logo depois.
+        while self.fronteiras and self.fronteiras[0] < agora:
+            heapq.heappop(self.fronteiras)
+        self.programados = [aviso for aviso in self.programados if aviso['data_fim_obj'] >= agora]
+        vigentes = self._selecionar(agora)
+        if vigentes != self.vigentes:
+            self.vigentes = vigentes
+            self.vigentes_mudaram.emit(vigentes)
+        self._armar(agora)
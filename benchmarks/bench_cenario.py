@@ -0,0 +1,340 @@
+# benchmarks/bench_cenario.py
+#
+# Benchmark de ponta a ponta de main.AplicacaoPainel, sem tela e sem ninguém tocando: a janela
+# abre na plataforma offscreen do Qt, com um servidor local (servidor_local.py) no lugar do feed,
+# da API de avisos, das imagens e das páginas do menu, e segue um roteiro fixo de fases:
+#
+#   inicio       da criação da janela à primeira pintura e ao primeiro conteúdo do carrossel;
+#   carrossel    N trocas de item, com movimentos de mouse periódicos para não cair na inatividade;
+#   menu         clique em cada botão de URLS e espera do loadFinished (exige o QtWebEngine);
+#   inatividade  sem entrada até a volta ao início;
+#   bolinha      a animação de inatividade por alguns segundos, até um novo movimento do mouse.
+#
+# As amostras são as mesmas observações que alimentam o endpoint de métricas (troca de item,
+# pintura de cada quadro, volta ao início, requisições), capturadas envolvendo metricas.observar;
+# CPU e memória residente (painel e renderizador do WebEngine) são medidas por fase. Cada execução
+# roda num processo novo, e o JSON final usa em 'casos' o esquema de bench_pipeline.py, de modo que
+# duas versões se comparam com `comparar.py ANTES.json DEPOIS.json`.
+#
+# Uso: python benchmarks/bench_cenario.py [--execucoes N] [--trocas N] [--intervalo S] [--inatividade S]
+#                                         [--bolinha S] [--tempo-pagina S] [--tamanho LxA] [--saida ARQUIVO]
+
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from datetime import datetime, timedelta
+from urllib.parse import urlsplit
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QObject, QPoint, QTimer, QUrl, Qt, QCoreApplication, QT_VERSION_STR
+from PyQt6.QtTest import QTest
+from PyQt6.QtWidgets import QApplication
+
+from servidor_local import ServidorLocal
+
+DIRETORIO_FIXTURES = os.path.join(RAIZ, "benchmarks", "fixtures")
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+INTERVALO_ROTEIRO_MS = 50  # Período em que o roteiro confere se a fase atual terminou
+INTERVALO_MEMORIA_MS = 250
+
+# --- Conteúdo do servidor local ---
+
+def configurar(servidor: ServidorLocal, argumentos, diretorio: str) -> bool:
+    """Aponta config para o servidor local e um diretório temporário, antes de qualquer módulo do
+    painel ser importado. Retorna se o QtWebEngine está disponível."""
+    import config
+    try:
+        import PyQt6.QtWebEngineWidgets  # noqa: F401
+        webengine = True
+    except ImportError as e:
+        print(f"QtWebEngine indisponível ({e}); a fase do menu será pulada"); webengine = False
+    config.URL_FEED = servidor.url("/feed"); config.URL_AVISOS = servidor.url("/avisos")
+    config.URLS = {nome: servidor.url(f"/paginas/{nome}") for nome in config.URLS}
+    config.URL_RETRANSMISSOR = None; config.HORARIO_NOTURNO = None
+    config.DIRETORIO_CACHE = diretorio
+    config.CAMINHO_INSTANTANEO = os.path.join(diretorio, "conteudo.json")  # sem instantâneo: abertura a frio
+    config.ARQUIVO_TRAVAMENTOS = os.path.join(diretorio, "travamentos.log")
+    config.ARQUIVO_LINHA_TEMPO = None; config.REGISTRAR_LINHA_TEMPO = False; config.REGISTRAR_TEMPOS_WEB = False
+    config.ATIVAR_METRICAS = False
+    config.INTERVALO_CARROSSEL = argumentos.intervalo; config.TEMPO_INATIVIDADE = argumentos.inatividade
+    config.AQUECER_PAGINAS_WEB = False  # o aquecimento encheria o cache antes da fase do menu
+    if not webengine: config.ATRASO_WEBENGINE = 10**6
+    return webengine
+
+def publicar_conteudo(servidor: ServidorLocal):
+    """Feed gravado com as imagens trocadas por cartazes locais, avisos vigentes e as páginas do menu."""
+    import config
+    from bench_pipeline import gerar_cartaz
+    with open(os.path.join(DIRETORIO_FIXTURES, "feed_fct.xml"), "rb") as arquivo:
+        feed = arquivo.read().decode("utf-8")
+    imagens = {}
+    def trocar(achado):
+        if achado.group(1) not in imagens: imagens[achado.group(1)] = servidor.url(f"/imagens/noticia-{len(imagens)}.jpg")
+        return f'src="{imagens[achado.group(1)]}"'
+    feed = re.sub(r'src="([^"]*)"', trocar, feed)
+    servidor.publicar("/feed", feed.encode("utf-8"), "application/rss+xml")
+    cartaz = gerar_cartaz(1600, 1200, "JPEG")
+    for url in imagens.values(): servidor.publicar(urlsplit(url).path, cartaz, "image/jpeg")
+
+    agora = datetime.now()
+    avisos = []
+    for i, formato in enumerate(("JPEG", "PNG", "JPEG")):
+        caminho = f"/imagens/aviso-{i}.{formato.lower()}"
+        servidor.publicar(caminho, gerar_cartaz(1080, 1350, formato), f"image/{formato.lower()}")
+        avisos.append({'id': i, 'titulo': f"Aviso {i}", 'url_imagem': servidor.url(caminho),
+                       'data_inicio': (agora - timedelta(days=1)).strftime('%Y-%m-%d %H:%M'),
+                       'data_fim': (agora + timedelta(days=1)).strftime('%Y-%m-%d %H:%M')})
+    servidor.publicar("/avisos", json.dumps(avisos).encode("utf-8"), "application/json")
+
+    servidor.publicar("/imagens/pagina.jpg", cartaz, "image/jpeg")
+    linhas = "".join(f"<tr><td>{i}</td><td>Linha {i}</td><td>{i * 7 % 13}</td></tr>" for i in range(200))
+    for nome in config.URLS:
+        pagina = (f"<!DOCTYPE html><html><head><meta charset='utf-8'><title>{nome}</title></head><body>"
+                  f"<h1>{nome}</h1><img src='/imagens/pagina.jpg' width='800'><table>{linhas}</table></body></html>")
+        servidor.publicar(f"/paginas/{nome}", pagina.encode("utf-8"), "text/html; charset=utf-8")
+
+# --- Roteiro (processo filho) ---
+
+class Roteiro(QObject):
+    """Conduz a janela pelas fases do cenário e guarda, por fase, as amostras, a CPU e a memória."""
+    def __init__(self, argumentos, webengine: bool, arquivo_saida: str):
+        super().__init__()
+        import diagnostico, main, metricas
+        self.diagnostico = diagnostico
+        self.argumentos, self.webengine, self.arquivo_saida = argumentos, webengine, arquivo_saida
+        self.amostras = defaultdict(list)  # "fase/medida" -> segundos
+        self.fases = {}
+        self.fase = None; self.prazo = None
+        self.paginas_pendentes = []; self.pagina = None
+        self.passo_mouse = 0
+        metricas.observar = self._envolver(metricas.observar)
+        self.criacao = time.time()
+        self.janela = main.AplicacaoPainel()
+        # Com as métricas desligadas o painel não instala o medidor de quadros; o cenário precisa dele.
+        if self.janela.medidor_quadros is None: self.janela.medidor_quadros = diagnostico.MedidorQuadros(self.janela)
+        self.janela.energia.inatividade.connect(self._quando_inatividade)
+        self.janela.resize(*argumentos.tamanho); self.janela.show()
+        self.timer_memoria = QTimer(self); self.timer_memoria.timeout.connect(self._amostrar_memoria)
+        self.timer_memoria.start(INTERVALO_MEMORIA_MS)
+        self.timer_presenca = QTimer(self); self.timer_presenca.timeout.connect(self._mexer_mouse)
+        self.timer_roteiro = QTimer(self); self.timer_roteiro.timeout.connect(self._avancar)
+        self.timer_roteiro.start(INTERVALO_ROTEIRO_MS)
+        self._iniciar_fase("inicio", 60)
+
+    def _envolver(self, observar):
+        """Troca metricas.observar por uma versão que também guarda cada amostra bruta. Os módulos do
+        painel chamam metricas.observar pelo módulo, então todos passam pela versão envolvida."""
+        def observar_e_guardar(nome, valor, **rotulos):
+            observar(nome, valor, **rotulos)
+            self._observar(nome, valor, rotulos)
+        return observar_e_guardar
+
+    def _observar(self, nome, valor, rotulos):
+        # Chamado em qualquer thread; só acrescenta à lista da fase corrente.
+        medida = nome[len("painel_"):].rsplit("_segundos", 1)[0]
+        caso = f"rede/{rotulos.get('fonte', '?')}" if medida == "requisicao" else f"{self.fase}/{medida}"
+        self.amostras[caso].append(valor)
+
+    # --- Fases ---
+
+    def _iniciar_fase(self, nome: str, limite: float):
+        if self.fase is not None: self._encerrar_fase()
+        print(f"[cenario] {nome}")
+        self.fase = nome; self.prazo = time.perf_counter() + limite
+        self.fases[nome] = {'inicio': time.perf_counter(), 'cpu_inicio': time.process_time(),
+                            'rss_max_kb': 0, 'renderizador_rss_max_kb': 0}
+        self._amostrar_memoria()
+
+    def _encerrar_fase(self):
+        fase = self.fases[self.fase]
+        duracao = time.perf_counter() - fase.pop('inicio')
+        quadros = len(self.amostras.get(f"{self.fase}/pintura_quadro", ()))
+        fase.update(duracao_s=duracao, cpu_percentual=(time.process_time() - fase.pop('cpu_inicio')) / duracao * 100,
+                    quadros=quadros, fps=quadros / duracao)
+
+    def _esgotado(self) -> bool:
+        if time.perf_counter() <= self.prazo: return False
+        print(f"[cenario] tempo esgotado na fase {self.fase}")
+        self.fases[self.fase]['tempo_esgotado'] = True
+        return True
+
+    def _avancar(self):
+        if self.fase == "inicio":
+            marcos = self.diagnostico.linha_tempo()
+            if 'conteudo_exibido' in marcos or self._esgotado():
+                deslocamento = self.criacao - self.diagnostico.INICIO_PROCESSO
+                for marco in ('primeira_pintura', 'conteudo_exibido'):
+                    if marco in marcos: self.amostras[f"inicio/{marco}"].append(marcos[marco] - deslocamento)
+                self.timer_presenca.start(1000)
+                self._iniciar_fase("carrossel", self.argumentos.trocas * self.argumentos.intervalo * 2 + 30)
+        elif self.fase == "carrossel":
+            if len(self.amostras["carrossel/troca_item"]) >= self.argumentos.trocas or self._esgotado():
+                self._iniciar_fase("menu", 0)
+                if self.webengine:
+                    botoes = self.janela.menu_lateral.botoes
+                    self.paginas_pendentes = [nome for nome in self._urls() if nome in botoes]
+                else:
+                    self.fases["menu"]['pulada'] = "QtWebEngine indisponível"
+                self._proxima_pagina()
+        elif self.fase == "menu":
+            if self.pagina is not None and self._esgotado():
+                self._desconectar_pagina(); self._proxima_pagina()
+        elif self.fase == "inatividade":
+            if self.amostras["inatividade/volta_inicio"] or self._esgotado():
+                self._iniciar_fase("bolinha", self.argumentos.bolinha)
+        elif self.fase == "bolinha":
+            if time.perf_counter() >= self.prazo: self._concluir()
+
+    @staticmethod
+    def _urls() -> dict:
+        import config
+        return config.URLS
+
+    def _proxima_pagina(self):
+        if not self.paginas_pendentes:
+            self.pagina = None; self.timer_presenca.stop()
+            self._iniciar_fase("inatividade", self.argumentos.inatividade + 30); return
+        nome = self.paginas_pendentes.pop(0)
+        self.prazo = time.perf_counter() + self.argumentos.tempo_pagina
+        self.pagina = (nome, time.perf_counter())
+        QTest.mouseClick(self.janela.menu_lateral.botoes[nome], Qt.MouseButton.LeftButton)
+        self.janela.webview.loadFinished.connect(self._quando_pagina_carregada)
+
+    def _desconectar_pagina(self):
+        try: self.janela.webview.loadFinished.disconnect(self._quando_pagina_carregada)
+        except (TypeError, AttributeError): pass
+
+    def _quando_pagina_carregada(self, ok: bool):
+        nome, inicio = self.pagina
+        if self.janela.webview.page().requestedUrl() != QUrl(self._urls()[nome]): return
+        self._desconectar_pagina()
+        self.amostras[f"menu/pagina_{nome}"].append(time.perf_counter() - inicio)
+        if not ok: self.fases["menu"].setdefault('falhas', []).append(nome)
+        self._proxima_pagina()
+
+    def _quando_inatividade(self):
+        if self.fase != "inatividade": return
+        energia = self.janela.energia
+        self.amostras["inatividade/atraso_deteccao"].append(time.monotonic() - energia.ultima_atividade - energia.tempo_inatividade)
+
+    def _concluir(self):
+        self._encerrar_fase()
+        self.timer_roteiro.stop(); self.timer_memoria.stop()
+        QTest.mouseMove(self.janela, QPoint(10, 10))  # encerra a animação, como um toque faria
+        resultado = {'webengine': self.webengine, 'fases': self.fases, 'amostras': dict(self.amostras)}
+        with open(self.arquivo_saida, "w", encoding="utf-8") as arquivo: json.dump(resultado, arquivo)
+        QApplication.instance().quit()
+
+    # --- Entrada e memória ---
+
+    def _mexer_mouse(self):
+        self.passo_mouse += 1
+        QTest.mouseMove(self.janela, QPoint(self.janela.width() // 2 + self.passo_mouse % 2, self.janela.height() // 2))
+
+    def _amostrar_memoria(self):
+        if self.fase is None: return
+        fase = self.fases[self.fase]
+        fase['rss_max_kb'] = max(fase['rss_max_kb'], (self.diagnostico.rss_processo(os.getpid()) or 0) // 1024)
+        webview = self.janela.webview
+        if webview is not None:
+            rss = self.diagnostico.rss_processo(webview.page().renderProcessPid()) or 0
+            fase['renderizador_rss_max_kb'] = max(fase['renderizador_rss_max_kb'], rss // 1024)
+
+def executar_filho(argumentos):
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
+    servidor = ServidorLocal()
+    webengine = configurar(servidor, argumentos, tempfile.mkdtemp(prefix="bench-cenario-"))
+    app = QApplication(sys.argv)
+    publicar_conteudo(servidor)
+    with servidor:
+        roteiro = Roteiro(argumentos, webengine, argumentos.filho)
+        app.exec()
+
+# --- Consolidação (processo pai) ---
+
+def resumir(amostras: list, pico_kb: int) -> dict:
+    from bench_pipeline import percentil
+    tempos = sorted(amostras)
+    return {
+        'n': len(tempos), 'media_ms': sum(tempos) / len(tempos) * 1000,
+        'p50_ms': percentil(tempos, 0.50) * 1000, 'p90_ms': percentil(tempos, 0.90) * 1000,
+        'p99_ms': percentil(tempos, 0.99) * 1000, 'max_ms': tempos[-1] * 1000,
+        'pico_memoria_kb': pico_kb
+    }
+
+def consolidar(execucoes: list) -> dict:
+    """Junta as amostras de todas as execuções em casos no esquema de bench_pipeline.py.
+
+    O pico de memória de cada caso é o maior RSS do painel na fase em que ele foi medido.
+    """
+    amostras, picos = defaultdict(list), defaultdict(int)
+    for execucao in execucoes:
+        pico_total = max(fase['rss_max_kb'] for fase in execucao['fases'].values())
+        for caso, valores in execucao['amostras'].items():
+            amostras[caso] += valores
+            fase = execucao['fases'].get(caso.split("/", 1)[0])
+            picos[caso] = max(picos[caso], fase['rss_max_kb'] if fase else pico_total)
+    return {f"cenario/{caso}": resumir(valores, picos[caso]) for caso, valores in sorted(amostras.items()) if valores}
+
+def tamanho_tela(texto: str):
+    largura, altura = texto.lower().split("x")
+    return int(largura), int(altura)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Reproduz um roteiro de uso do painel sem tela e mede a interface de ponta a ponta")
+    parser.add_argument("--execucoes", type=int, default=3, help="quantas vezes o roteiro roda, cada uma num processo novo")
+    parser.add_argument("--trocas", type=int, default=10, help="trocas de item medidas na fase do carrossel")
+    parser.add_argument("--intervalo", type=int, default=2, help="segundos de cada item do carrossel (INTERVALO_CARROSSEL)")
+    parser.add_argument("--inatividade", type=int, default=5, help="segundos sem entrada até a volta ao início (TEMPO_INATIVIDADE)")
+    parser.add_argument("--bolinha", type=float, default=8, help="segundos medidos da animação de inatividade")
+    parser.add_argument("--tempo-pagina", type=float, default=30, help="espera máxima pelo carregamento de cada página do menu")
+    parser.add_argument("--tamanho", type=tamanho_tela, default=(1920, 1080), help="tamanho da janela, LARGURAxALTURA")
+    parser.add_argument("--saida", help="arquivo JSON de resultados (padrão: benchmarks/resultados/cenario-<commit>.json)")
+    parser.add_argument("--filho", help=argparse.SUPPRESS)  # uma execução, gravando as amostras brutas neste arquivo
+    argumentos = parser.parse_args()
+    if argumentos.filho:
+        executar_filho(argumentos); sys.exit(0)
+
+    from bench_pipeline import commit_atual
+    execucoes = []
+    for numero in range(argumentos.execucoes):
+        with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as arquivo: caminho = arquivo.name
+        try:
+            comando = [sys.executable, os.path.abspath(__file__), "--trocas", str(argumentos.trocas),
+                       "--intervalo", str(argumentos.intervalo), "--inatividade", str(argumentos.inatividade),
+                       "--bolinha", str(argumentos.bolinha), "--tempo-pagina", str(argumentos.tempo_pagina),
+                       "--tamanho", "x".join(map(str, argumentos.tamanho)), "--filho", caminho]
+            subprocess.run(comando, check=True)
+            with open(caminho, "r", encoding="utf-8") as arquivo: execucoes.append(json.load(arquivo))
+        finally:
+            os.unlink(caminho)
+    casos = consolidar(execucoes)
+    resultados = {
+        'commit': commit_atual(), 'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'qt': QT_VERSION_STR, 'plataforma': platform.platform(),
+        'parametros': {chave: valor for chave, valor in vars(argumentos).items() if chave not in ("saida", "filho")},
+        'webengine': all(execucao['webengine'] for execucao in execucoes),
+        'fases': [execucao['fases'] for execucao in execucoes], 'casos': casos
+    }
+    for nome, medicao in casos.items():
+        print(f"{nome:<42} p50={medicao['p50_ms']:9.2f}ms  p90={medicao['p90_ms']:9.2f}ms  "
+              f"max={medicao['max_ms']:9.2f}ms  rss={medicao['pico_memoria_kb'] / 1024:7.1f}MB  n={medicao['n']}")
+    for fase, medicao in execucoes[-1]['fases'].items():
+        print(f"fase {fase:<12} " + ("pulada: " + medicao['pulada'] if 'pulada' in medicao else
+              f"{medicao['duracao_s']:6.1f}s  CPU {medicao['cpu_percentual']:5.1f}%  {medicao['fps']:5.1f} fps  "
+              f"RSS máx {medicao['rss_max_kb'] / 1024:6.1f}MB"))
+    saida = argumentos.saida or os.path.join(DIRETORIO_RESULTADOS, f"cenario-{resultados['commit']}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {saida}")
@@ -0,0 +1,77 @@
+# benchmarks/bench_extrator.py
+#
+# Confere que extrator_html.extrair_descricao produz o mesmo resultado que o caminho anterior
+# com BeautifulSoup nas descrições dos feeds em benchmarks/fixtures e mede o ganho de tempo,
+# inclusive em um feed grande sintético (descrições longas, como as de WordPress com galerias).
+#
+# Uso: python benchmarks/bench_extrator.py [repeticoes]
+
+import glob
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+from bs4 import BeautifulSoup
+
+from config import LIMITE_DESCRICAO
+from extrator_html import extrair_descricao
+
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+def extrair_descricao_bs4(html: str, limite: int):
+    """Caminho anterior de workers.py, mantido aqui como referência."""
+    sopa = BeautifulSoup(html, 'html.parser')
+    tag_img = sopa.find('img')
+    url_imagem = tag_img['src'] if tag_img and tag_img.get('src') else None
+    if url_imagem and url_imagem.startswith(("http://fct.ufg.brhttps:", "https://fct.ufg.brhttps:")):
+        url_imagem = url_imagem.replace("https://fct.ufg.br", "").replace("http://fct.ufg.br", "")
+    [s.decompose() for s in sopa(["script", "style"])]
+    descricao = ' '.join(sopa.get_text(separator=' ', strip=True).split())
+    if len(descricao) > limite: descricao = descricao[:limite].rsplit(' ', 1)[0] + '... - '
+    return url_imagem, descricao
+
+def carregar_descricoes() -> list:
+    descricoes = []
+    for caminho in sorted(glob.glob(os.path.join(DIRETORIO_FIXTURES, "*.xml"))):
+        with open(caminho, "rb") as arquivo:
+            dados = arquivo.read()
+        feed = feedparser.parse(dados)
+        descricoes += [entrada.get('description', '') for entrada in feed.entries]
+        # O HTML bruto também é conferido, sem a sanitização do feedparser (scripts, estilos, comentários).
+        texto = dados.decode("utf-8")
+        descricoes += [bloco.split("]]>", 1)[0] for bloco in texto.split("<description><![CDATA[")[1:]]
+    return descricoes
+
+def descricoes_grandes(base: list, quantidade: int = 200) -> list:
+    paragrafo = "<p>" + " ".join(f"palavra{i} <a href='#{i}'>ligação</a>" for i in range(40)) + "</p>"
+    galeria = "".join(f"<figure><img src='https://fct.ufg.br/up/g{i}.jpg'/><figcaption>Foto {i}</figcaption></figure>" for i in range(30))
+    return [base[i % len(base)] + paragrafo * 60 + galeria for i in range(quantidade)]
+
+def medir(funcao, descricoes, repeticoes) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        for html in descricoes: funcao(html, LIMITE_DESCRICAO)
+    return (time.perf_counter() - inicio) / (repeticoes * len(descricoes))
+
+def conferir(descricoes) -> int:
+    divergencias = 0
+    for html in descricoes:
+        esperado, obtido = extrair_descricao_bs4(html, LIMITE_DESCRICAO), extrair_descricao(html, LIMITE_DESCRICAO)
+        if esperado != obtido:
+            divergencias += 1
+            print(f"DIVERGÊNCIA:\n  html={html[:120]!r}\n  bs4={esperado!r}\n  novo={obtido!r}")
+    return divergencias
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    base = carregar_descricoes()
+    grandes = descricoes_grandes(base)
+    divergencias = conferir(base) + conferir(grandes)
+    print(f"{len(base) + len(grandes)} descrições conferidas, {divergencias} divergência(s)")
+    for rotulo, descricoes, vezes in (("fixtures", base, repeticoes), ("feed grande", grandes, max(1, repeticoes // 10))):
+        antigo, novo = medir(extrair_descricao_bs4, descricoes, vezes), medir(extrair_descricao, descricoes, vezes)
+        print(f"{rotulo:<12} BeautifulSoup={antigo * 1e6:9.1f}µs  extrator={novo * 1e6:9.1f}µs  ganho={antigo / novo:5.1f}x")
+    sys.exit(1 if divergencias else 0)
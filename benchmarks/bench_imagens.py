@@ -0,0 +1,84 @@
+# benchmarks/bench_imagens.py
+#
+# Compara o caminho anterior das imagens do carrossel (decodificação em tamanho cheio + QPixmap
+# no trabalhador, escala suave na thread da interface) com o atual (QImageReader decodificando
+# já no tamanho do rótulo e só o QPixmap.fromImage na interface). Mede o tempo no trabalhador,
+# o tempo na thread da interface e o pico de memória residente de cada caminho, este num
+# processo separado para que um não contamine o outro.
+#
+# Uso: python benchmarks/bench_imagens.py [repeticoes]
+
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from bench_pipeline import gerar_cartaz, TAMANHO_ROTULO
+from utils import decodificar_imagem
+
+CARTAZES = (("jpeg_4000x6000", 4000, 6000, "JPEG"), ("png_2000x3000", 2000, 3000, "PNG"), ("jpeg_1920x1080", 1920, 1080, "JPEG"))
+
+def caminho_anterior(dados: bytes):
+    inicio = time.perf_counter()
+    pixmap = QPixmap.fromImage(QImage.fromData(dados))  # no trabalhador
+    meio = time.perf_counter()
+    escalado = pixmap.scaled(*TAMANHO_ROTULO, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    return meio - inicio, time.perf_counter() - meio, escalado
+
+def caminho_atual(dados: bytes):
+    inicio = time.perf_counter()
+    imagem = decodificar_imagem(dados, TAMANHO_ROTULO)  # no trabalhador
+    meio = time.perf_counter()
+    pixmap = QPixmap.fromImage(imagem)
+    return meio - inicio, time.perf_counter() - meio, pixmap
+
+CAMINHOS = {'anterior': caminho_anterior, 'atual': caminho_atual}
+
+def pico_rss_kb() -> int:
+    """Pico de memória residente deste processo (VmHWM; ao contrário de ru_maxrss, não herda o do processo pai)."""
+    with open("/proc/self/status", "r") as status:
+        for linha in status:
+            if linha.startswith("VmHWM:"): return int(linha.split()[1])
+    return 0
+
+def pico_memoria_mb(caminho: str, arquivo: str) -> float:
+    """Executa um caminho uma vez num processo novo e retorna quanto o pico de RSS subiu."""
+    saida = subprocess.run([sys.executable, os.path.abspath(__file__), "--memoria", caminho, arquivo],
+                           capture_output=True, text=True, check=True)
+    return float(saida.stdout.strip().splitlines()[-1])
+
+def mediana(valores):
+    return sorted(valores)[len(valores) // 2]
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    if len(sys.argv) == 4 and sys.argv[1] == "--memoria":
+        with open(sys.argv[3], "rb") as arquivo: dados = arquivo.read()
+        base = pico_rss_kb()
+        CAMINHOS[sys.argv[2]](dados)
+        print((pico_rss_kb() - base) / 1024)
+        sys.exit(0)
+
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    print(f"rótulo de {TAMANHO_ROTULO[0]}x{TAMANHO_ROTULO[1]}, mediana de {repeticoes} execuções")
+    for nome, largura, altura, formato in CARTAZES:
+        dados = gerar_cartaz(largura, altura, formato)
+        with tempfile.NamedTemporaryFile(suffix="." + formato.lower(), delete=False) as arquivo:
+            arquivo.write(dados)
+        try:
+            for caminho, funcao in CAMINHOS.items():
+                medicoes = [funcao(dados)[:2] for _ in range(repeticoes)]
+                trabalhador = mediana([m[0] for m in medicoes]) * 1000
+                interface = mediana([m[1] for m in medicoes]) * 1000
+                memoria = pico_memoria_mb(caminho, arquivo.name)
+                print(f"{nome:<16} {caminho:<9} trabalhador={trabalhador:8.1f}ms  interface={interface:7.2f}ms  pico RSS=+{memoria:6.1f}MB")
+        finally:
+            os.unlink(arquivo.name)
@@ -0,0 +1,212 @@
+# benchmarks/bench_pipeline.py
+#
+# Micro-benchmarks do caminho de conteúdo (workers.py e utils.py) sem depender da rede:
+# um servidor local (servidor_local.py) serve o feed gravado em benchmarks/fixtures, listas de
+# avisos geradas de 5 a 10 mil itens e cartazes JPEG/PNG. Para cada caso são medidos os
+# percentis de latência e o pico de memória alocada pelo Python (tracemalloc), e o resultado
+# é gravado em JSON para comparação entre commits com benchmarks/comparar.py.
+#
+# Uso: python benchmarks/bench_pipeline.py [--repeticoes N] [--filtro TEXTO] [--saida ARQUIVO]
+
+import argparse
+import glob
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import feedparser
+from PyQt6.QtCore import Qt, QBuffer, QIODevice, QRectF
+from PyQt6.QtGui import QColor, QImage, QLinearGradient, QPainter, QPixmap, QFont
+from PyQt6.QtWidgets import QApplication
+
+import cache
+import workers
+from servidor_local import ServidorLocal
+from utils import criar_qr_code, decodificar_imagem, gerar_imagem_qr
+
+DIRETORIO_FIXTURES = os.path.join(RAIZ, "benchmarks", "fixtures")
+DIRETORIO_RESULTADOS = os.path.join(RAIZ, "benchmarks", "resultados")
+QUANTIDADES_AVISOS = (5, 100, 1000, 10000)
+TAMANHO_ROTULO = (960, 720)  # tamanho típico do rótulo de imagem do carrossel em 1080p
+
+# --- Dados de entrada ---
+
+def gerar_avisos(quantidade: int, semente: int = 42) -> list:
+    """Lista de avisos no formato da API: vigentes, expirados, futuros e direcionados a telas."""
+    aleatorio = random.Random(semente)
+    agora = datetime.now().replace(second=0, microsecond=0)
+    avisos = []
+    for i in range(quantidade):
+        inicio = agora + timedelta(hours=aleatorio.randint(-24 * 30, 24 * 7))
+        fim = inicio + timedelta(hours=aleatorio.randint(1, 24 * 30))
+        aviso = {
+            'id': i, 'titulo': f"Aviso {i}", 'url_imagem': f"https://fct.ufg.br/avisos/{i}.jpg",
+            'data_inicio': inicio.strftime('%Y-%m-%d %H:%M'), 'data_fim': fim.strftime('%Y-%m-%d %H:%M')
+        }
+        if aleatorio.random() < 0.1: aviso['targetScreens'] = [f"tela-{aleatorio.randint(1, 5)}"]
+        avisos.append(aviso)
+    return avisos
+
+def gerar_cartaz(largura: int, altura: int, formato: str, qualidade: int = 85) -> bytes:
+    """Cartaz sintético com degradê, blocos e texto, para que a compressão se pareça com a real."""
+    imagem = QImage(largura, altura, QImage.Format.Format_RGB32)
+    pintor = QPainter(imagem)
+    degrade = QLinearGradient(0, 0, largura, altura)
+    degrade.setColorAt(0, QColor("#0b3d91")); degrade.setColorAt(1, QColor("#f2a900"))
+    pintor.fillRect(0, 0, largura, altura, degrade)
+    aleatorio = random.Random(largura * altura)
+    for _ in range(40):
+        pintor.fillRect(aleatorio.randrange(largura), aleatorio.randrange(altura), aleatorio.randint(20, 300),
+                        aleatorio.randint(20, 300), QColor(aleatorio.randrange(256), aleatorio.randrange(256), aleatorio.randrange(256), 160))
+    pintor.setPen(QColor("white")); pintor.setFont(QFont("Sans", max(12, altura // 20)))
+    pintor.drawText(QRectF(0, 0, largura, altura), Qt.AlignmentFlag.AlignCenter, "Semana Acadêmica da FCT")
+    pintor.end()
+    buffer = QBuffer(); buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    imagem.save(buffer, formato, qualidade)
+    return bytes(buffer.data())
+
+# --- Medição ---
+
+def percentil(valores_ordenados: list, fracao: float) -> float:
+    """Percentil pelo posto mais próximo."""
+    indice = max(0, min(len(valores_ordenados) - 1, round(fracao * len(valores_ordenados) + 0.5) - 1))
+    return valores_ordenados[indice]
+
+def medir(funcao, repeticoes: int, preparar=None) -> dict:
+    """Tempos de `repeticoes` chamadas (após uma de aquecimento) e pico de memória de uma chamada extra."""
+    if preparar: preparar()
+    funcao()
+    tempos = []
+    for _ in range(repeticoes):
+        if preparar: preparar()
+        inicio = time.perf_counter()
+        funcao()
+        tempos.append(time.perf_counter() - inicio)
+    # O tracemalloc deixa as alocações lentas; por isso o pico é medido numa execução separada.
+    if preparar: preparar()
+    tracemalloc.start()
+    funcao()
+    pico = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    tempos.sort()
+    return {
+        'n': len(tempos), 'media_ms': sum(tempos) / len(tempos) * 1000,
+        'p50_ms': percentil(tempos, 0.50) * 1000, 'p90_ms': percentil(tempos, 0.90) * 1000,
+        'p99_ms': percentil(tempos, 0.99) * 1000, 'max_ms': tempos[-1] * 1000,
+        'pico_memoria_kb': pico / 1024
+    }
+
+def decodificar_e_escalar(dados: bytes) -> QPixmap:
+    """Mesmo caminho das imagens no carrossel: decodificação já escalada no trabalhador e QPixmap na interface."""
+    return QPixmap.fromImage(decodificar_imagem(dados, TAMANHO_ROTULO))
+
+def montar_casos(servidor: ServidorLocal) -> list:
+    """Publica os dados no servidor local e retorna a lista de (nome, funcao, preparar)."""
+    casos = []
+    diretorio_cache = tempfile.mkdtemp(prefix="bench-pipeline-")
+
+    # Feed: análise pura, atualização completa pela rede local e atualização condicional (304).
+    for caminho in sorted(glob.glob(os.path.join(DIRETORIO_FIXTURES, "*.xml"))):
+        nome = os.path.splitext(os.path.basename(caminho))[0]
+        with open(caminho, "rb") as arquivo: dados = arquivo.read()
+        url = servidor.publicar(f"/feed/{nome}", dados, "application/rss+xml")
+        casos.append((f"feed/{nome}/analise", lambda dados=dados: [workers.processar_entrada_feed(e) for e in feedparser.parse(dados).entries[:6]], None))
+        def atualizar_completo(url=url):
+            workers.URL_FEED = url
+            assert workers.BaixadorNoticias().run() is not None
+        casos.append((f"feed/{nome}/completo", atualizar_completo, gerar_imagem_qr.cache_clear))
+        # A chamada de aquecimento de medir() baixa o feed; as seguintes recebem 304.
+        baixador = workers.BaixadorNoticias()
+        def atualizar_condicional(url=url, baixador=baixador):
+            workers.URL_FEED = url
+            assert baixador.run() is not None
+        casos.append((f"feed/{nome}/condicional", atualizar_condicional, None))
+
+    # Avisos: filtro e ordenação em memória, a tarefa completa (download + JSON + filtro) e as incrementais.
+    for quantidade in QUANTIDADES_AVISOS:
+        avisos = gerar_avisos(quantidade)
+        url = servidor.publicar(f"/avisos/{quantidade}", json.dumps(avisos).encode("utf-8"), "application/json")
+        casos.append((f"avisos/{quantidade}/filtro", lambda avisos=avisos: workers.filtrar_avisos(avisos), None))
+        def baixar_avisos(url=url):
+            workers.URL_AVISOS = url
+            assert workers.BaixadorAvisos().run() is not None
+        casos.append((f"avisos/{quantidade}/completo", baixar_avisos, None))
+        # Atualizações seguintes: sem mudanças (304 pelo ETag) e com um delta de 10 avisos.
+        baixador = workers.BaixadorAvisos()
+        def baixar_avisos_sem_mudancas(url=url, baixador=baixador):
+            workers.URL_AVISOS = url
+            assert baixador.run() is not None
+        casos.append((f"avisos/{quantidade}/sem_mudancas", baixar_avisos_sem_mudancas, None))
+        loja = workers.LojaAvisos(); loja.aplicar_lista(avisos)
+        delta = [dict(aviso, titulo=aviso['titulo'] + " (editado)") for aviso in avisos[:10]]
+        def aplicar_delta(loja=loja, delta=delta, avisos=avisos):
+            loja.aplicar_delta(delta, []); loja.vigentes()
+            loja.aplicar_delta(avisos[:10], []); loja.vigentes()
+        casos.append((f"avisos/{quantidade}/delta_10", aplicar_delta, None))
+
+    # Imagens: decodificação + escala, e o download pelo cache em disco (frio e aquecido).
+    for nome, largura, altura, formato in (("cartaz_jpeg", 1920, 1080, "JPEG"), ("cartaz_png", 1080, 1350, "PNG")):
+        dados = gerar_cartaz(largura, altura, formato)
+        url = servidor.publicar(f"/imagens/{nome}", dados, f"image/{formato.lower()}")
+        casos.append((f"imagem/{nome}/decodificar_escalar", lambda dados=dados: decodificar_e_escalar(dados), None))
+        def cache_frio():
+            cache._cache_imagens = cache.CacheHTTPDisco(tempfile.mkdtemp(dir=diretorio_cache), 2**30, 3600)
+        casos.append((f"imagem/{nome}/baixar_cache_frio", lambda url=url: workers.baixar_imagem(url, None, TAMANHO_ROTULO), cache_frio))
+        casos.append((f"imagem/{nome}/baixar_cache_disco", lambda url=url: workers.baixar_imagem(url, None, TAMANHO_ROTULO), None))
+
+    # QR Codes: geração com o cache LRU vazio e, como em produção, a chamada da interface depois do
+    # aquecimento feito pelo trabalhador ao receber a notícia.
+    link = "https://fct.ufg.br/n/1234-noticia-de-exemplo-do-campus"
+    def aquecer_como_trabalhador():
+        gerar_imagem_qr.cache_clear(); gerar_imagem_qr(link)
+    casos.append(("qr/criar_qr_code/frio", lambda: criar_qr_code(link), gerar_imagem_qr.cache_clear))
+    casos.append(("qr/criar_qr_code/aquecido", lambda: criar_qr_code(link), aquecer_como_trabalhador))
+    return casos
+
+def commit_atual() -> str:
+    try:
+        saida = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=RAIZ, capture_output=True, text=True, check=True)
+        return saida.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "desconhecido"
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=30)
+    parser.add_argument("--filtro", default="", help="roda apenas os casos cujo nome contém este texto")
+    parser.add_argument("--saida", help="arquivo JSON de resultados (padrão: benchmarks/resultados/<commit>.json)")
+    argumentos = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    commit = commit_atual()
+    resultados = {
+        'commit': commit, 'data': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(), 'plataforma': platform.platform(),
+        'repeticoes': argumentos.repeticoes, 'casos': {}
+    }
+    with ServidorLocal() as servidor:
+        for nome, funcao, preparar in montar_casos(servidor):
+            if argumentos.filtro not in nome: continue
+            # Os casos com milhares de itens usam menos repetições para o conjunto terminar em tempo razoável.
+            repeticoes = max(5, argumentos.repeticoes // 5) if "/10000/" in nome else argumentos.repeticoes
+            medicao = medir(funcao, repeticoes, preparar)
+            resultados['casos'][nome] = medicao
+            print(f"{nome:<42} p50={medicao['p50_ms']:9.3f}ms  p90={medicao['p90_ms']:9.3f}ms  "
+                  f"p99={medicao['p99_ms']:9.3f}ms  pico={medicao['pico_memoria_kb']:9.1f}KB  n={medicao['n']}")
+
+    saida = argumentos.saida or os.path.join(DIRETORIO_RESULTADOS, f"{commit}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(saida)), exist_ok=True)
+    with open(saida, "w", encoding="utf-8") as arquivo:
+        json.dump(resultados, arquivo, indent=2, ensure_ascii=False)
+    print(f"Resultados gravados em {saida}")
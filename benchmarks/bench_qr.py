@@ -0,0 +1,72 @@
+# benchmarks/bench_qr.py
+#
+# Compara a geração de QR Code antiga (PIL -> PNG -> QImage.fromData -> escala suave)
+# com a atual (matriz desenhada direto em QImage, com cache LRU). O caso aquecido segue a sequência
+# de produção: o trabalhador gera a imagem ao receber a notícia e a interface a pede ao exibir o slide.
+#
+# Uso: python benchmarks/bench_qr.py [repeticoes]
+
+import os
+import sys
+import time
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import qrcode
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtWidgets import QApplication
+
+from utils import gerar_imagem_qr, criar_qr_code
+
+URLS = [f"https://fct.ufg.br/n/{numero}-noticia-de-exemplo-do-campus" for numero in range(6)]
+
+def criar_qr_code_png(url: str, tamanho: int = 150) -> QPixmap:
+    """Implementação anterior, mantida aqui apenas como referência de comparação."""
+    qr = qrcode.QRCode(version=1, box_size=10, border=4)
+    qr.add_data(url)
+    qr.make(fit=True)
+    img_pil = qr.make_image(fill_color="black", back_color="white")
+    buffer = BytesIO()
+    img_pil.save(buffer, format='PNG')
+    return QPixmap.fromImage(QImage.fromData(buffer.getvalue())).scaled(
+        tamanho, tamanho, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+
+def medir(rotulo: str, funcao, repeticoes: int, preparar=None):
+    """Mede funcao(url); `preparar(url)`, se dado, roda antes de cada chamada, fora da medição."""
+    tempos = []
+    for _ in range(repeticoes):
+        for url in URLS:
+            if preparar: preparar(url)
+            inicio = time.perf_counter()
+            funcao(url)
+            tempos.append(time.perf_counter() - inicio)
+    tempos.sort()
+    mediana = tempos[len(tempos) // 2] * 1000
+    p95 = tempos[int(len(tempos) * 0.95)] * 1000
+    print(f"{rotulo:<38} mediana={mediana:8.3f}ms  p95={p95:8.3f}ms  n={len(tempos)}")
+    return mediana
+
+acertos_interface = 0
+
+def aquecer_como_trabalhador(url):
+    """Cache vazio e depois a chamada feita por BaixadorNoticias ao receber a entrada.
+
+    Antes de limpar, soma os acertos da chamada anterior da interface (cache_clear zera a contagem).
+    """
+    global acertos_interface
+    acertos_interface += gerar_imagem_qr.cache_info().hits
+    gerar_imagem_qr.cache_clear()
+    gerar_imagem_qr(url)
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    antiga = medir("PNG + escala suave (anterior)", criar_qr_code_png, repeticoes)
+    fria = medir("matriz direta, cache vazio", criar_qr_code, repeticoes, lambda url: gerar_imagem_qr.cache_clear())
+    quente = medir("aquecido pelo trabalhador", criar_qr_code, repeticoes, aquecer_como_trabalhador)
+    acertos = acertos_interface + gerar_imagem_qr.cache_info().hits
+    print(f"ganho sem cache: {antiga / fria:.1f}x | ganho com cache: {antiga / quente:.1f}x")
+    print(f"acertos da interface após o aquecimento: {acertos}/{repeticoes * len(URLS)}")
@@ -0,0 +1,91 @@
+# benchmarks/bench_rss.py
+#
+# Confere que leitor_rss.ler_rss produz, para o carrossel, as mesmas entradas que o feedparser
+# nos feeds de benchmarks/fixtures e compara os dois em feeds grandes sintéticos no estilo do
+# WordPress (centenas de itens de arquivo, cada um com um content:encoded longo). O feedparser
+# analisa o documento inteiro; o leitor incremental recebe blocos como os da rede e para no
+# último item pedido. São medidos o tempo, o pico de memória alocada pelo Python (tracemalloc)
+# e quantos bytes do documento foram consumidos.
+#
+# Uso: python benchmarks/bench_rss.py [repeticoes]
+
+import glob
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import feedparser
+
+from config import LIMITE_POR_FONTE, TAMANHO_BLOCO_DOWNLOAD
+from leitor_rss import ler_rss
+from workers import _entrada_feed, processar_entrada_feed
+
+DIRETORIO_FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+QUANTIDADES_ITENS = (20, 100, 500)
+
+def blocos(dados: bytes, consumidos: list):
+    for inicio in range(0, len(dados), TAMANHO_BLOCO_DOWNLOAD):
+        bloco = dados[inicio:inicio + TAMANHO_BLOCO_DOWNLOAD]
+        consumidos[0] += len(bloco)
+        yield bloco
+
+def com_feedparser(dados: bytes):
+    return feedparser.parse(dados).entries[:LIMITE_POR_FONTE], len(dados)
+
+def com_leitor(dados: bytes):
+    consumidos = [0]
+    return ler_rss(blocos(dados, consumidos), LIMITE_POR_FONTE), consumidos[0]
+
+def para_carrossel(entradas) -> list:
+    """O que o carrossel usa de cada entrada: registro processado, GUID, marca e instante de publicação."""
+    resultado = []
+    for entrada in entradas:
+        guid, _, marca, instante, _ = _entrada_feed(entrada)
+        resultado.append((processar_entrada_feed(entrada), guid, marca, instante))
+    return resultado
+
+def feed_grande(base: bytes, quantidade: int) -> bytes:
+    """Repete os itens da fixture até `quantidade`, com GUIDs distintos e um content:encoded longo."""
+    texto = base.decode("utf-8")
+    cabecalho, resto = texto.split("<item>", 1)
+    itens = ["<item>" + bloco.split("</item>", 1)[0] + "</item>" for bloco in ("<item>" + resto).split("<item>")[1:]]
+    corpo = "<p>" + " ".join(f"palavra{i} <a href='#{i}'>ligação</a>" for i in range(40)) + "</p>"
+    conteudo = f"<content:encoded><![CDATA[{corpo * 5}]]></content:encoded>"
+    gerados = []
+    for i in range(quantidade):
+        item = itens[i % len(itens)].replace("</guid>", f"-{i}</guid>", 1)
+        gerados.append(item.replace("</item>", conteudo + "</item>", 1))
+    return (cabecalho + "".join(gerados) + "</channel></rss>").encode("utf-8")
+
+def medir(funcao, dados: bytes, repeticoes: int):
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter(); funcao(dados); tempos.append(time.perf_counter() - inicio)
+    tracemalloc.start(); _, consumidos = funcao(dados); pico = tracemalloc.get_traced_memory()[1]; tracemalloc.stop()
+    return sorted(tempos)[len(tempos) // 2], pico, consumidos
+
+def conferir(dados: bytes, nome: str) -> int:
+    esperado, obtido = para_carrossel(com_feedparser(dados)[0]), para_carrossel(com_leitor(dados)[0])
+    if esperado == obtido: return 0
+    print(f"DIVERGÊNCIA em {nome}:")
+    for antes, depois in zip(esperado, obtido):
+        if antes != depois: print(f"  feedparser={antes!r}\n  leitor    ={depois!r}")
+    return 1
+
+if __name__ == "__main__":
+    repeticoes = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    fixtures = []
+    for caminho in sorted(glob.glob(os.path.join(DIRETORIO_FIXTURES, "*.xml"))):
+        with open(caminho, "rb") as arquivo: fixtures.append((os.path.basename(caminho), arquivo.read()))
+    grandes = [(f"{nome[:-4]}_x{quantidade}", feed_grande(dados, quantidade)) for nome, dados in fixtures for quantidade in QUANTIDADES_ITENS]
+    divergencias = sum(conferir(dados, nome) for nome, dados in fixtures + grandes)
+    print(f"{len(fixtures) + len(grandes)} feeds conferidos ({LIMITE_POR_FONTE} itens cada), {divergencias} divergência(s)")
+    for nome, dados in fixtures + grandes:
+        vezes = max(1, repeticoes * 100_000 // len(dados))  # os feeds grandes custam segundos ao feedparser
+        antigo, novo = medir(com_feedparser, dados, vezes), medir(com_leitor, dados, vezes)
+        print(f"{nome:<22} {len(dados) / 1024:8.0f}KB  feedparser={antigo[0] * 1000:8.2f}ms {antigo[1] / 1024:8.0f}KB  "
+              f"leitor={novo[0] * 1000:7.2f}ms {novo[1] / 1024:6.0f}KB lidos={novo[2] / 1024:5.0f}KB  ganho={antigo[0] / novo[0]:6.1f}x")
+    sys.exit(1 if divergencias else 0)
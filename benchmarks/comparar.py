@@ -0,0 +1,41 @@
+# benchmarks/comparar.py
+#
+# Compara dois arquivos de resultados de bench_pipeline.py ou bench_cenario.py (por exemplo, de dois commits)
+# e aponta os casos cuja mediana piorou além do limiar.
+#
+# Uso: python benchmarks/comparar.py ANTES.json DEPOIS.json [--limiar 10]
+
+import argparse
+import json
+import sys
+
+def carregar(caminho: str) -> dict:
+    with open(caminho, "r", encoding="utf-8") as arquivo:
+        return json.load(arquivo)
+
+def variacao(antes: float, depois: float) -> float:
+    return (depois - antes) / antes * 100 if antes else 0.0
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("antes")
+    parser.add_argument("depois")
+    parser.add_argument("--limiar", type=float, default=10.0, help="piora percentual da mediana considerada regressão")
+    argumentos = parser.parse_args()
+
+    antes, depois = carregar(argumentos.antes), carregar(argumentos.depois)
+    print(f"{antes['commit']} -> {depois['commit']}")
+    regressoes = 0
+    for nome in sorted(set(antes['casos']) | set(depois['casos'])):
+        a, d = antes['casos'].get(nome), depois['casos'].get(nome)
+        if a is None or d is None:
+            print(f"{nome:<42} {'(só no segundo)' if a is None else '(só no primeiro)'}"); continue
+        delta_p50 = variacao(a['p50_ms'], d['p50_ms'])
+        marca = ""
+        if delta_p50 > argumentos.limiar:
+            marca = "  <-- regressão"; regressoes += 1
+        print(f"{nome:<42} p50 {a['p50_ms']:9.3f} -> {d['p50_ms']:9.3f}ms ({delta_p50:+6.1f}%)  "
+              f"p90 {variacao(a['p90_ms'], d['p90_ms']):+6.1f}%  "
+              f"memória {variacao(a['pico_memoria_kb'], d['pico_memoria_kb']):+6.1f}%{marca}")
+    print(f"{regressoes} regressão(ões) acima de {argumentos.limiar:.0f}%")
+    sys.exit(1 if regressoes else 0)
@@ -0,0 +1,62 @@
+# benchmarks/servidor_local.py
+#
+# Servidor HTTP local que substitui o site da FCT e a API de avisos nos benchmarks,
+# para que as medições rodem sem rede e com conteúdo fixo.
+
+import hashlib
+import threading
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # mantém as conexões abertas, como o servidor real
+    # Cabeçalho e corpo em escritas separadas esbarram no Nagle + ACK atrasado (~40 ms por resposta).
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        recurso = self.server.recursos.get(self.path.split("?", 1)[0])
+        if recurso is None:
+            self.send_response(404); self.send_header("Content-Length", "0"); self.end_headers(); return
+        dados, tipo, etag = recurso
+        self.server.requisicoes += 1
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304); self.send_header("ETag", etag); self.send_header("Content-Length", "0"); self.end_headers(); return
+        self.send_response(200)
+        self.send_header("Content-Type", tipo)
+        self.send_header("Content-Length", str(len(dados)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        pass
+
+class ServidorLocal:
+    """Serve recursos em memória (caminho -> bytes) numa porta livre de 127.0.0.1, numa thread própria."""
+    def __init__(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Manipulador)
+        self.servidor.daemon_threads = True
+        self.servidor.recursos = {}
+        self.servidor.requisicoes = 0
+        self.thread = None
+
+    def publicar(self, caminho: str, dados: bytes, tipo: str = "application/octet-stream") -> str:
+        """Publica (ou substitui) um recurso e retorna sua URL completa."""
+        etag = '"' + hashlib.sha1(dados).hexdigest()[:16] + '"'
+        self.servidor.recursos[caminho] = (dados, tipo, etag)
+        return self.url(caminho)
+
+    def url(self, caminho: str) -> str:
+        return f"http://127.0.0.1:{self.servidor.server_address[1]}{caminho}"
+
+    @property
+    def requisicoes(self) -> int:
+        return self.servidor.requisicoes
+
+    def __enter__(self):
+        self.thread = threading.Thread(target=self.servidor.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def __exit__(self, *args):
+        self.servidor.shutdown()
+        self.servidor.server_close()
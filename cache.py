@@ -0,0 +1,263 @@
+# cache.py
+
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+from config import (DIRETORIO_CACHE, LIMITE_CACHE_IMAGENS, VALIDADE_CACHE_IMAGENS, CAMINHO_INSTANTANEO,
+                    TAMANHO_MAXIMO_IMAGEM)
+
+# Content-Types aceitos nos downloads de imagem; sem o cabeçalho, o conteúdo também é aceito.
+TIPOS_IMAGEM = ("image/", "application/octet-stream", "binary/octet-stream")
+
+class CacheHTTPDisco:
+    """Cache HTTP em disco, endereçado pelo conteúdo, com revalidação condicional e descarte LRU."""
+
+    def __init__(self, diretorio: str, limite_bytes: int, validade: int, tamanho_maximo: int = None, tipos=None):
+        self.diretorio = diretorio
+        self.tamanho_maximo = tamanho_maximo or limite_bytes  # de cada objeto baixado
+        self.tipos = tipos
+        self.diretorio_objetos = os.path.join(diretorio, "objetos")
+        self.caminho_indice = os.path.join(diretorio, "indice.json")
+        self.limite_bytes = limite_bytes
+        self.validade = validade
+        self._trava = threading.RLock()
+        # url -> {'hash', 'tamanho', 'etag', 'last_modified', 'validado_em', 'acesso'}
+        self._indice = {}
+        self.acertos = 0
+        self.revalidados = 0
+        self.falhas = 0
+        self.bytes_rede = 0
+        self.bytes_servidos_cache = 0
+        os.makedirs(self.diretorio_objetos, exist_ok=True)
+        self._carregar_indice()
+
+    # --- Persistência do índice ---
+    def _carregar_indice(self):
+        try:
+            with open(self.caminho_indice, "r", encoding="utf-8") as arquivo:
+                indice = json.load(arquivo)
+        except (OSError, ValueError):
+            return
+        # Descarta entradas cujo objeto sumiu do disco.
+        self._indice = {url: meta for url, meta in indice.items() if os.path.exists(self._caminho_objeto(meta['hash']))}
+
+    def _salvar_indice(self):
+        temporario = self.caminho_indice + ".tmp"
+        try:
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(self._indice, arquivo)
+            os.replace(temporario, self.caminho_indice)
+        except OSError as e:
+            print(f"Erro ao salvar índice do cache: {e}")
+
+    def _caminho_objeto(self, hash_conteudo: str) -> str:
+        return os.path.join(self.diretorio_objetos, hash_conteudo[:2], hash_conteudo)
+
+    # --- Objetos ---
+    def _ler_objeto(self, meta: dict):
+        try:
+            with open(self._caminho_objeto(meta['hash']), "rb") as arquivo:
+                return arquivo.read()
+        except OSError:
+            return None
+
+    def _gravar_objeto(self, conteudo: bytes) -> str:
+        hash_conteudo = hashlib.sha256(conteudo).hexdigest()
+        caminho = self._caminho_objeto(hash_conteudo)
+        if not os.path.exists(caminho):
+            os.makedirs(os.path.dirname(caminho), exist_ok=True)
+            temporario = f"{caminho}.{threading.get_ident()}.tmp"
+            with open(temporario, "wb") as arquivo:
+                arquivo.write(conteudo)
+            os.replace(temporario, caminho)
+        return hash_conteudo
+
+    def _bytes_em_uso(self) -> int:
+        # Objetos compartilhados por várias URLs contam uma única vez.
+        return sum({meta['hash']: meta['tamanho'] for meta in self._indice.values()}.values())
+
+    def _descartar_excesso(self):
+        """Remove as entradas menos usadas recentemente até caber no limite de bytes."""
+        em_uso = self._bytes_em_uso()
+        if em_uso <= self.limite_bytes:
+            return
+        for url, meta in sorted(self._indice.items(), key=lambda item: item[1]['acesso']):
+            if em_uso <= self.limite_bytes:
+                break
+            del self._indice[url]
+            if not any(outro['hash'] == meta['hash'] for outro in self._indice.values()):
+                try:
+                    os.remove(self._caminho_objeto(meta['hash']))
+                except OSError:
+                    pass
+                em_uso -= meta['tamanho']
+
+    # --- API pública ---
+    def obter(self, url: str, ao_receber=None, cancelamento=None) -> bytes:
+        """Retorna o conteúdo da URL, usando o disco sempre que possível.
+
+        Entradas dentro da validade são servidas sem acessar a rede; as expiradas são
+        revalidadas com If-None-Match/If-Modified-Since. Se a rede falhar e houver cópia
+        local, a cópia é servida mesmo expirada. Downloads são lidos em blocos (ver
+        rede.ler_corpo, que recebe `ao_receber`) e retornam None quando cancelados.
+        """
+        import requests
+        from rede import requisitar, ler_corpo
+        with self._trava:
+            meta = self._indice.get(url)
+            conteudo = self._ler_objeto(meta) if meta else None
+            if conteudo is None:
+                meta = None
+            elif time.time() - meta['validado_em'] < self.validade:
+                meta['acesso'] = time.time()
+                self.acertos += 1; self.bytes_servidos_cache += len(conteudo)
+                return conteudo
+
+        cabecalhos = {}
+        if meta:
+            if meta.get('etag'): cabecalhos['If-None-Match'] = meta['etag']
+            if meta.get('last_modified'): cabecalhos['If-Modified-Since'] = meta['last_modified']
+        novo = b""
+        try:
+            resposta = requisitar(url, cabecalhos, stream=True, fonte="imagens")
+            if resposta.status_code == 304 or resposta.status_code >= 400: resposta.close()
+            resposta.raise_for_status()
+            if resposta.status_code != 304:
+                novo = ler_corpo(resposta, self.tamanho_maximo, self.tipos, ao_receber, cancelamento)
+                if novo is None: return None
+        except requests.RequestException:
+            if conteudo is None:
+                with self._trava: self.falhas += 1
+                raise
+            with self._trava:
+                self.acertos += 1; self.bytes_servidos_cache += len(conteudo)
+            return conteudo
+
+        with self._trava:
+            agora = time.time()
+            if resposta.status_code == 304 and conteudo is not None:
+                meta.update(validado_em=agora, acesso=agora)
+                self.revalidados += 1; self.bytes_servidos_cache += len(conteudo)
+            else:
+                conteudo = novo
+                self.falhas += 1; self.bytes_rede += len(conteudo)
+                try:
+                    hash_conteudo = self._gravar_objeto(conteudo)
+                except OSError as e:
+                    print(f"Erro ao gravar imagem no cache: {e}")
+                    return conteudo
+                self._indice[url] = {
+                    'hash': hash_conteudo, 'tamanho': len(conteudo),
+                    'etag': resposta.headers.get('ETag'), 'last_modified': resposta.headers.get('Last-Modified'),
+                    'validado_em': agora, 'acesso': agora
+                }
+                self._descartar_excesso()
+            self._salvar_indice()
+            return conteudo
+
+    def estatisticas(self) -> dict:
+        with self._trava:
+            total = self.acertos + self.revalidados + self.falhas
+            return {
+                'acertos': self.acertos, 'revalidados': self.revalidados, 'falhas': self.falhas,
+                'taxa_acerto': (self.acertos + self.revalidados) / total if total else 0.0,
+                'bytes_rede': self.bytes_rede, 'bytes_servidos_cache': self.bytes_servidos_cache,
+                'bytes_em_disco': self._bytes_em_uso(), 'entradas': len(self._indice)
+            }
+
+_cache_imagens = None
+_trava_cache_imagens = threading.Lock()
+
+def obter_cache_imagens() -> CacheHTTPDisco:
+    """Retorna o cache de imagens compartilhado pelo processo, criando-o no primeiro uso."""
+    global _cache_imagens
+    with _trava_cache_imagens:
+        if _cache_imagens is None:
+            _cache_imagens = CacheHTTPDisco(os.path.join(DIRETORIO_CACHE, "imagens"), LIMITE_CACHE_IMAGENS, VALIDADE_CACHE_IMAGENS,
+                                            TAMANHO_MAXIMO_IMAGEM, TIPOS_IMAGEM)
+        return _cache_imagens
+
+class CachePixmaps:
+    """Cache em memória de pixmaps já escalados para o tamanho do rótulo, limitado em bytes.
+
+    Deve ser usado apenas na thread da interface, pois guarda QPixmaps.
+    """
+
+    def __init__(self, limite_bytes: int):
+        self.limite_bytes = limite_bytes
+        self._itens = OrderedDict()  # (url, largura, altura) -> QPixmap
+        self.bytes_em_uso = 0
+        self.acertos = 0
+        self.falhas = 0
+
+    @staticmethod
+    def _custo(pixmap) -> int:
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def obter(self, chave):
+        pixmap = self._itens.get(chave)
+        if pixmap is None:
+            self.falhas += 1
+            return None
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return pixmap
+
+    def contem(self, chave) -> bool:
+        return chave in self._itens
+
+    def inserir(self, chave, pixmap):
+        custo = self._custo(pixmap)
+        if custo > self.limite_bytes:
+            return
+        anterior = self._itens.pop(chave, None)
+        if anterior is not None:
+            self.bytes_em_uso -= self._custo(anterior)
+        self._itens[chave] = pixmap
+        self.bytes_em_uso += custo
+        while self.bytes_em_uso > self.limite_bytes:
+            _, removido = self._itens.popitem(last=False)
+            self.bytes_em_uso -= self._custo(removido)
+
+    def invalidar(self):
+        self._itens.clear()
+        self.bytes_em_uso = 0
+
+# --- Instantâneo do conteúdo exibido ---
+def _serializar(valor):
+    if isinstance(valor, datetime): return {'__datetime__': valor.isoformat()}
+    raise TypeError(f"Tipo não serializável: {type(valor).__name__}")
+
+def _desserializar(objeto: dict):
+    return datetime.fromisoformat(objeto['__datetime__']) if '__datetime__' in objeto else objeto
+
+def salvar_instantaneo(itens: list, caminho: str = CAMINHO_INSTANTANEO):
+    """Grava de forma atômica o último conteúdo combinado válido do carrossel.
+
+    Os itens referenciam as imagens pela URL (servida pelo cache em disco mesmo sem rede)
+    e os QR Codes pelo link, regerados a partir do cache LRU.
+    """
+    temporario = caminho + ".tmp"
+    try:
+        os.makedirs(os.path.dirname(caminho), exist_ok=True)
+        with open(temporario, "w", encoding="utf-8") as arquivo:
+            json.dump({'salvo_em': time.time(), 'itens': itens}, arquivo, default=_serializar, ensure_ascii=False)
+            arquivo.flush(); os.fsync(arquivo.fileno())
+        os.replace(temporario, caminho)
+    except (OSError, TypeError) as e:
+        print(f"Erro ao salvar instantâneo do conteúdo: {e}")
+
+def carregar_instantaneo(caminho: str = CAMINHO_INSTANTANEO) -> list:
+    """Lê o último conteúdo salvo, descartando avisos que já saíram do período de exibição."""
+    try:
+        with open(caminho, "r", encoding="utf-8") as arquivo:
+            itens = json.load(arquivo, object_hook=_desserializar)['itens']
+    except (OSError, ValueError, KeyError, TypeError):
+        return []
+    agora = datetime.now()
+    return [item for item in itens if item.get('type') != 'aviso' or item.get('data_fim_obj', agora) >= agora]
@@ -1,11 +1,20 @@
 # config.py
 
+import os
+
 # --- Configurações da Aplicação ---
 ANIMACAO_BOLINHA_ATIVA = True
 MODO_TELA_CHEIA = True
+MODO_INICIO_RAPIDO = True  # Pinta cabeçalho e carrossel primeiro; o WebEngine só é criado depois
+ATRASO_WEBENGINE = 3  # Segundos após a primeira pintura para criar o WebEngine em segundo plano
 
 # --- Configurações do Feed de Notícias ---
-URL_FEED = "https://fct.ufg.br/feed"
+URL_FEED = "https://fct.ufg.br/feed"  # Uma URL ou uma lista de fontes: [{"url": ..., "limite": 6, "peso": 1}, ...]
+LIMITE_POR_FONTE = 6  # Notícias lidas de cada fonte que não define "limite"
+TEMPO_MAXIMO_FONTE = 10  # Segundos de cada fonte por rodada ("tempo_maximo" na fonte); a que não responder a tempo mantém as notícias anteriores
+LEITURAS_SIMULTANEAS_FEED = 4  # Threads fixas que leem as fontes do feed; a fonte que passa do prazo é cancelada e libera a sua
+LEITURA_INCREMENTAL_FEED = True  # Lê o RSS em blocos e para no último item usado; False (ou Atom/RDF) usa o feedparser com o documento inteiro
+VANTAGEM_PESO_HORAS = 12  # Na ordenação por data, cada unidade de peso acima de 1 adianta as notícias da fonte nessas horas
 LIMITE_TITULO = 80
 LIMITE_DESCRICAO = 300
 INTERVALO_ATUALIZACAO_NOTICIAS = 1800  # meia hora em segundos
@@ -14,9 +23,59 @@ INTERVALO_CARROSSEL = 12  # Tempo em segundos para cada item
 # --- Configurações da API de Avisos ---
 URL_AVISOS = "http://192.168.0.7:3000/api/avisos"
 INTERVALO_ATUALIZACAO_AVISOS = 600 # 10 minutos em segundos
+SINCRONIZACAO_INCREMENTAL_AVISOS = True  # Pede à API apenas o que mudou desde a última resposta, quando ela oferece
+PARAMETRO_AVISOS_DESDE = "updated_since"  # Nome do parâmetro de consulta com o cursor da última sincronização
+
+# --- Retransmissor na Rede Local (retransmissor.py) ---
+URL_RETRANSMISSOR = None  # Ex.: "http://192.168.0.10:8080"; quando definido, notícias, avisos e imagens vêm do retransmissor
+ID_TELA = ""  # Identificador desta tela, comparado ao targetScreens dos avisos direcionados
+PORTA_RETRANSMISSOR = 8080  # Porta HTTP em que o retransmissor atende os painéis
+INTERVALO_RETRANSMISSOR = 300  # Segundos entre as consultas do retransmissor ao site e à API de avisos
+TAMANHO_IMAGENS_RETRANSMISSOR = (1280, 1024)  # Caixa máxima (largura, altura) das imagens pré-escaladas
+LIMITE_IMAGENS_RETRANSMISSOR = 128 * 1024 * 1024  # Bytes de imagens pré-escaladas mantidos em memória
+
+# --- Configurações de Rede ---
+TIMEOUT_CONEXAO = 5  # Segundos para abrir a conexão (DNS + TCP + TLS)
+TIMEOUT_LEITURA = 15  # Segundos de espera por dados da resposta
+HOSTS_NO_POOL = 10  # Quantos hosts distintos mantêm conexões abertas
+CONEXOES_POR_HOST = 4  # Conexões keep-alive mantidas por host
+VALIDADE_CACHE_DNS = 300  # Segundos em que um nome resolvido é reaproveitado
+REGISTRAR_TEMPOS_REDE = False  # Imprime o detalhamento de tempo (DNS/conexão/TTFB/transferência) de cada requisição
+
+# --- Configurações de Cache ---
+DIRETORIO_CACHE = os.path.join(os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), ".cache"), "PainelFCT")
+LIMITE_CACHE_IMAGENS = 200 * 1024 * 1024  # Orçamento em bytes do cache de imagens em disco
+VALIDADE_CACHE_IMAGENS = 3600  # Segundos em que uma imagem é servida do disco sem revalidar
+LIMITE_CACHE_PIXMAPS = 64 * 1024 * 1024  # Orçamento em bytes das imagens já escaladas mantidas em memória
+LIMITE_PIXELS_IMAGEM = 50_000_000  # Imagens maiores que isso (largura x altura) são recusadas antes de decodificar
+TAMANHO_MAXIMO_IMAGEM = 15 * 1024 * 1024  # Bytes; downloads de imagem maiores são interrompidos (pelo Content-Length, antes de começar)
+TAMANHO_BLOCO_DOWNLOAD = 64 * 1024  # Bytes lidos por vez nos downloads em streaming
+EXIBICAO_PROGRESSIVA = True  # Mostra o JPEG parcial (progressivo ou não) enquanto o download avança, no lugar de "Carregando"
+INTERVALO_IMAGEM_PARCIAL = 300  # Milissegundos entre decodificações parciais; downloads mais rápidos que isso nem as fazem
+NUM_TRABALHADORES_DOWNLOAD = 3  # Threads fixas do agendador de downloads
+CAMINHO_INSTANTANEO = os.path.join(DIRETORIO_CACHE, "conteudo.json")  # Último conteúdo válido, exibido já na abertura
+ITENS_PRE_CARREGADOS = 2  # Quantos itens à frente do atual têm a imagem preparada antecipadamente
 
 # --- Configurações de Aparência ---
 LARGURA_MENU = 250
+TAMANHO_QR_CODE = 150  # Lado, em pixels, do QR Code das notícias
+BORDA_QR_CODE = 4  # Margem do QR Code, em módulos
+LIMITE_CACHE_QR_CODES = 64  # Quantos QR Codes prontos ficam em memória
+SOMBRAS_EM_CACHE = True  # Sombras pré-renderizadas (nove-partes) em vez de desfoque a cada quadro; False usa o efeito original do Qt
+PRE_RENDERIZAR_SLIDES = True  # Monta o próximo item fora da tela; a troca passa a ser a cópia de uma imagem pronta
+DURACAO_TRANSICAO = 400  # Milissegundos da transição cruzada entre itens pré-renderizados; 0 troca sem transição
+
+# --- Configurações do Navegador (WebEngine) ---
+PERFIL_WEB_PERSISTENTE = True  # False usa o perfil padrão, sem cache em disco (útil como referência de medição)
+NOME_PERFIL_WEB = "painel-fct"  # Perfil nomeado, guardado em DIRETORIO_CACHE/web
+LIMITE_CACHE_WEB = 300 * 1024 * 1024  # Tamanho máximo, em bytes, do cache HTTP do WebEngine
+AQUECER_PAGINAS_WEB = True  # Carrega as páginas do menu em segundo plano para encher o cache
+ATRASO_AQUECIMENTO_WEB = 30  # Segundos após a criação do WebEngine para iniciar o aquecimento
+TEMPO_MAXIMO_AQUECIMENTO = 30  # Segundos de espera por página durante o aquecimento
+REGISTRAR_TEMPOS_WEB = True  # Imprime o tempo de carregamento (loadStarted -> loadFinished) de cada URL
+MODO_LIBERACAO_WEB = "descartar"  # Ao voltar ao início: "descartar", "congelar", "em_branco" ou None
+INTERVALO_AMOSTRA_MEMORIA = 60  # Segundos entre medições de memória do navegador e do renderizador
+TETO_MEMORIA_WEB = 1024 * 1024 * 1024  # Bytes do renderizador acima dos quais o WebEngine é recriado
 
 # --- Configurações de URLs ---
 URLS = {
@@ -27,4 +86,25 @@ URLS = {
     "onibus": "https://rmtcgoiania.com.br/index.php/linhas-e-trajetos/area-sul?buscar=555",
     "pessoas": "https://app.powerbi.com/view?r=eyJrIjoiNjUzMDMzOWUtNzViNS00NGYyLTk1YTYtMWY5MWE5OGI1YzAzIiwidCI6ImIxY2E3YTgxLWFiZjgtNDJlNS05OGM2LWYyZjJhOTMwYmEzNiJ9",
     "extensao": "https://app.powerbi.com/view?r=eyJrIjoiMDcyZWQ2NWMtZTVkMy00YzMyLTkyYjQtNzFmMjQ1MzVjZDcwIiwidCI6ImIxY2E3YTgxLWFiZjgtNDJlNS05OGM2LWYyZjJhOTMwYmEzNiJ9"
-}
\ No newline at end of file
+}
+
+# --- Configurações de Diagnóstico ---
+REGISTRAR_LINHA_TEMPO = True  # Imprime os marcos da inicialização (primeira pintura, conteúdo, WebEngine)
+ARQUIVO_LINHA_TEMPO = os.path.join(DIRETORIO_CACHE, "inicializacao.jsonl")  # Histórico das aberturas; None desativa
+REGISTRAR_QUADROS = False  # Imprime quadros por segundo, tempo de pintura e CPU do processo (para medir o custo da animação ociosa)
+INTERVALO_REGISTRO_QUADROS = 10  # Segundos entre registros de quadros
+ORCAMENTO_QUADRO_MS = 16  # Com o medidor de quadros ativo, trocas de item que passam disso até chegar à tela são registradas
+VIGIAR_TRAVAMENTOS = True  # Thread vigia que registra a pilha da thread da interface quando ela trava
+LIMITE_TRAVAMENTO_MS = 500  # Acima disso sem responder ao pulso, a interface é considerada travada
+INTERVALO_VIGIA = 1  # Segundos entre pulsos; travamentos mais curtos que isso são detectados por amostragem
+ARQUIVO_TRAVAMENTOS = os.path.join(DIRETORIO_CACHE, "travamentos.log")  # Log rotativo (1 MB x 3) dos travamentos
+
+# --- Métricas (metricas.py) ---
+ATIVAR_METRICAS = False  # Serve métricas no formato Prometheus em http://127.0.0.1:PORTA_METRICAS/metrics
+PORTA_METRICAS = 9464  # Porta local do endpoint de métricas
+INTERVALO_METRICAS = 15  # Segundos entre amostras de caches e memória (e gravações do JSON)
+ARQUIVO_METRICAS = None  # Ex.: os.path.join(DIRETORIO_CACHE, "metricas.json"); instantâneo regravado a cada intervalo
+
+# --- Economia de Energia ---
+TEMPO_INATIVIDADE = 120  # Segundos sem toque, mouse ou teclado até voltar à tela inicial
+HORARIO_NOTURNO = None  # Ex.: ("22:00", "06:00"); nesse intervalo, sem uso, a tela apaga e buscas, carrossel e animações param
@@ -0,0 +1,229 @@
+# diagnostico.py
+
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from datetime import datetime
+
+from PyQt6.QtCore import QObject, QEvent, QTimer, pyqtSignal
+
+import metricas
+
+from config import (REGISTRAR_LINHA_TEMPO, ARQUIVO_LINHA_TEMPO, REGISTRAR_QUADROS, INTERVALO_REGISTRO_QUADROS,
+                    ORCAMENTO_QUADRO_MS, LIMITE_TRAVAMENTO_MS, INTERVALO_VIGIA, ARQUIVO_TRAVAMENTOS)
+
+def _instante_inicio_processo() -> float:
+    """Instante (epoch) em que o processo foi criado; sem /proc, usa a importação deste módulo."""
+    try:
+        with open("/proc/self/stat", "r") as arquivo:
+            # O nome do executável pode conter espaços; os campos seguem o último ')'.
+            campos = arquivo.read().rsplit(")", 1)[1].split()
+        with open("/proc/uptime", "r") as arquivo:
+            tempo_ligado = float(arquivo.read().split()[0])
+        return time.time() - (tempo_ligado - int(campos[19]) / os.sysconf("SC_CLK_TCK"))
+    except (OSError, ValueError, IndexError, AttributeError):
+        return time.time()
+
+INICIO_PROCESSO = _instante_inicio_processo()
+
+# --- Linha do tempo da inicialização ---
+MARCOS_INICIALIZACAO = ("primeira_pintura", "conteudo_exibido", "webengine_pronto")
+_marcos = {}
+
+def marcar(nome: str):
+    """Registra, apenas na primeira vez, quantos segundos após o início do processo o marco ocorreu."""
+    if nome in _marcos: return
+    _marcos[nome] = time.time() - INICIO_PROCESSO
+    if REGISTRAR_LINHA_TEMPO:
+        print(f"[inicio] {nome}: {_marcos[nome]:.3f}s")
+    if all(marco in _marcos for marco in MARCOS_INICIALIZACAO):
+        _gravar_linha_tempo()
+
+def linha_tempo() -> dict:
+    return dict(_marcos)
+
+def _gravar_linha_tempo():
+    """Acrescenta a linha do tempo desta abertura ao arquivo JSONL, para comparar entre versões."""
+    if not ARQUIVO_LINHA_TEMPO: return
+    try:
+        os.makedirs(os.path.dirname(ARQUIVO_LINHA_TEMPO), exist_ok=True)
+        with open(ARQUIVO_LINHA_TEMPO, "a", encoding="utf-8") as arquivo:
+            arquivo.write(json.dumps({'inicio': INICIO_PROCESSO, 'marcos': _marcos}) + "\n")
+    except OSError as e:
+        print(f"Erro ao gravar linha do tempo da inicialização: {e}")
+
+# --- Memória ---
+
+def rss_processo(pid: int):
+    """Memória residente do processo, em bytes, ou None se não for possível medir."""
+    if not pid: return None
+    try:
+        with open(f"/proc/{pid}/status", "r") as arquivo:
+            for linha in arquivo:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) * 1024
+    except (OSError, ValueError):
+        pass
+    try:
+        import psutil
+        return psutil.Process(pid).memory_info().rss
+    except Exception:
+        return None
+
+# --- Quadros e tempo de pintura ---
+
+_medidor = None
+
+def _despertares_thread_principal():
+    """Trocas de contexto voluntárias da thread principal: cada uma é um despertar depois de dormir (só Linux)."""
+    try:
+        with open("/proc/self/status", "r") as status:
+            for linha in status:
+                if linha.startswith("voluntary_ctxt_switches:"): return int(linha.split()[1])
+    except OSError:
+        pass
+    return None
+
+def medir_quadro(rotulo: str, inicio: float, metrica: str = None, **rotulos):
+    """Mede de `inicio` (perf_counter) até o fim da próxima pintura da janela: o custo de uma mudança até a tela.
+
+    Com `metrica`, a duração também vai para esse histograma de metricas.py, com os `rotulos`.
+    """
+    if _medidor is not None: _medidor.marcacao = (rotulo, inicio, metrica, rotulos)
+
+class MedidorQuadros(QObject):
+    """Conta os quadros que a janela pinta, o tempo gasto pintando, a CPU do processo e os despertares.
+
+    Cada UpdateRequest da janela de topo corresponde a um quadro: o Qt pinta nele, de forma
+    síncrona, todos os widgets com áreas pendentes. O filtro processa o evento ele mesmo para
+    medir essa pintura. O painel só o instala com ATIVAR_METRICAS ou REGISTRAR_QUADROS; sem ele,
+    medir_quadro não faz nada. O registro periódico só é impresso com REGISTRAR_QUADROS; as mudanças
+    marcadas com medir_quadro são impressas quando estouram ORCAMENTO_QUADRO_MS.
+    """
+    def __init__(self, janela, intervalo: int = INTERVALO_REGISTRO_QUADROS):
+        global _medidor
+        super().__init__(janela)
+        self.janela = janela
+        self.ultimo_registro = {}
+        self.marcacao = None  # (rótulo, início) da mudança à espera do próximo quadro
+        self._zerar()
+        janela.installEventFilter(self)
+        self.timer = QTimer(self); self.timer.timeout.connect(self.registrar)
+        if REGISTRAR_QUADROS: self.timer.start(intervalo * 1000)
+        _medidor = self
+
+    def _zerar(self):
+        self.quadros = 0
+        self.tempo_pintura = 0.0
+        self.maior_pintura = 0.0
+        self.inicio = time.perf_counter()
+        self.cpu_inicio = time.process_time()
+        self.despertares_inicio = _despertares_thread_principal()
+
+    def eventFilter(self, fonte, evento) -> bool:
+        if fonte is self.janela and evento.type() == QEvent.Type.UpdateRequest:
+            inicio = time.perf_counter()
+            fonte.event(evento)
+            fim = time.perf_counter()
+            duracao = fim - inicio
+            self.quadros += 1; self.tempo_pintura += duracao
+            self.maior_pintura = max(self.maior_pintura, duracao)
+            metricas.observar('painel_pintura_quadro_segundos', duracao)
+            if self.marcacao is not None:
+                rotulo, inicio_mudanca, metrica, rotulos = self.marcacao; self.marcacao = None
+                if metrica: metricas.observar(metrica, fim - inicio_mudanca, **rotulos)
+                total = (fim - inicio_mudanca) * 1000
+                if REGISTRAR_QUADROS or total > ORCAMENTO_QUADRO_MS:
+                    print(f"[quadros] {rotulo}: {total:.1f} ms até a tela (pintura {duracao * 1000:.1f} ms)")
+            return True
+        return False
+
+    def registrar(self) -> dict:
+        decorrido = max(time.perf_counter() - self.inicio, 1e-9)
+        self.ultimo_registro = {
+            'fps': self.quadros / decorrido,
+            'pintura_media_ms': self.tempo_pintura / self.quadros * 1000 if self.quadros else 0.0,
+            'pintura_max_ms': self.maior_pintura * 1000,
+            'cpu_percentual': (time.process_time() - self.cpu_inicio) / decorrido * 100
+        }
+        despertares = _despertares_thread_principal()
+        if despertares is not None and self.despertares_inicio is not None:
+            self.ultimo_registro['despertares_por_s'] = (despertares - self.despertares_inicio) / decorrido
+        r = self.ultimo_registro
+        print(f"[quadros] {r['fps']:.1f} fps, pintura média {r['pintura_media_ms']:.2f} ms "
+              f"(máx {r['pintura_max_ms']:.2f} ms), CPU do processo {r['cpu_percentual']:.1f}%"
+              + (f", {r['despertares_por_s']:.1f} despertares/s" if 'despertares_por_s' in r else ""))
+        self._zerar()
+        return self.ultimo_registro
+
+# --- Vigia de travamentos da interface ---
+
+INTERVALO_AMOSTRA_PILHA = 0.1  # Segundos entre capturas da pilha durante um travamento
+
+class VigiaTravamentos(QObject):
+    """Thread que pede um pulso à thread da interface e, se ele demora, captura a pilha dela.
+
+    O pedido vai pelo laço de eventos (sinal enfileirado); enquanto não é atendido, a pilha Python
+    da thread da interface é amostrada a cada INTERVALO_AMOSTRA_PILHA. Quando o laço volta a
+    responder, o travamento é gravado em ARQUIVO_TRAVAMENTOS com a duração e as pilhas agrupadas.
+    A duração conta a partir do pedido do pulso, portanto é um limite inferior.
+    """
+    _pulso_pedido = pyqtSignal()
+
+    def __init__(self, parent=None, limite_ms: int = LIMITE_TRAVAMENTO_MS, intervalo: float = INTERVALO_VIGIA):
+        super().__init__(parent)
+        self.limite = limite_ms / 1000
+        self.intervalo = intervalo
+        self.id_thread_interface = threading.get_ident()
+        self.respondido = threading.Event()
+        self.travamentos = 0
+        self.registro = self._criar_registro()
+        self._pulso_pedido.connect(self.respondido.set)  # executado na thread da interface
+        self.thread = threading.Thread(target=self._vigiar, name="vigia-travamentos", daemon=True)
+        QTimer.singleShot(0, self.thread.start)  # só vigia depois que o laço de eventos começa a rodar
+
+    @staticmethod
+    def _criar_registro():
+        registro = logging.getLogger("painel.travamentos")
+        registro.propagate = False; registro.setLevel(logging.WARNING)
+        if ARQUIVO_TRAVAMENTOS and not registro.handlers:
+            try:
+                os.makedirs(os.path.dirname(ARQUIVO_TRAVAMENTOS), exist_ok=True)
+                manipulador = logging.handlers.RotatingFileHandler(ARQUIVO_TRAVAMENTOS, maxBytes=1024 * 1024, backupCount=3, encoding="utf-8")
+                manipulador.setFormatter(logging.Formatter("%(message)s"))
+                registro.addHandler(manipulador)
+            except OSError as e:
+                print(f"Erro ao abrir o log de travamentos: {e}")
+        return registro
+
+    def _pilha_interface(self):
+        quadro = sys._current_frames().get(self.id_thread_interface)
+        return tuple(traceback.format_stack(quadro)) if quadro is not None else ("(pilha indisponível)\n",)
+
+    def _vigiar(self):
+        while True:
+            self.respondido.clear()
+            pedido = time.perf_counter(); inicio = datetime.now()
+            self._pulso_pedido.emit()
+            if not self.respondido.wait(self.limite):
+                amostras = Counter()
+                while not self.respondido.wait(INTERVALO_AMOSTRA_PILHA if amostras else 0):
+                    amostras[self._pilha_interface()] += 1
+                self._registrar(inicio, time.perf_counter() - pedido, amostras)
+            time.sleep(self.intervalo)
+
+    def _registrar(self, inicio, duracao: float, amostras: Counter):
+        self.travamentos += 1
+        metricas.observar('painel_travamento_segundos', duracao)
+        print(f"Interface travada por {duracao * 1000:.0f} ms; pilha gravada em {ARQUIVO_TRAVAMENTOS}")
+        linhas = [f"{inicio:%Y-%m-%d %H:%M:%S} travamento de {duracao * 1000:.0f} ms ({sum(amostras.values())} amostras da pilha)"]
+        for pilha, vezes in amostras.most_common():
+            linhas.append(f"  [{vezes}x]")
+            linhas.extend("    " + linha.rstrip("\n").replace("\n", "\n    ") for linha in pilha)
+        self.registro.warning("\n".join(linhas) + "\n")
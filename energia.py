@@ -0,0 +1,96 @@
+# energia.py
+
+import math
+import time
+from datetime import datetime, timedelta
+from PyQt6.QtCore import QObject, QTimer, Qt, pyqtSignal
+
+from config import TEMPO_INATIVIDADE, HORARIO_NOTURNO
+
+# Como na agenda de avisos, a espera é limitada por causa de ajustes no relógio do sistema.
+ESPERA_MAXIMA_MS = 5 * 60 * 1000
+
+def _horario(texto: str):
+    return datetime.strptime(texto, "%H:%M").time()
+
+class AgendadorEnergia(QObject):
+    """Concentra num único timer os despertares periódicos do painel.
+
+    O timer é armado para o mais próximo entre a virada do minuto (relógio do cabeçalho), o fim do
+    prazo de inatividade e a próxima fronteira do horário noturno. Um evento de entrada só guarda
+    o instante da atividade; nenhum timer é reiniciado por evento. Em repouso (horário noturno e
+    sem uso) o minuto deixa de ser sinalizado e o painel suspende buscas, carrossel e animações.
+    """
+    minuto_mudou = pyqtSignal()
+    inatividade = pyqtSignal()
+    atividade_retomada = pyqtSignal()
+    repouso_mudou = pyqtSignal(bool)
+
+    def __init__(self, tempo_inatividade: int = TEMPO_INATIVIDADE, horario_noturno=HORARIO_NOTURNO, parent=None):
+        super().__init__(parent)
+        self.tempo_inatividade = tempo_inatividade
+        self.horario_noturno = tuple(_horario(h) for h in horario_noturno) if horario_noturno else None
+        self.ultima_atividade = time.monotonic()
+        self.ocioso = False
+        self.em_repouso = False
+        self.minuto = None
+        self.despertares = 0
+        self.timer = QTimer(self); self.timer.setSingleShot(True)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)  # o relógio deve virar junto com o minuto
+        self.timer.timeout.connect(self._quando_timer)
+
+    def iniciar(self):
+        self._atualizar()
+
+    def registrar_atividade(self):
+        """Chamado a cada evento de entrada: só guarda o instante, exceto ao sair da ociosidade."""
+        self.ultima_atividade = time.monotonic()
+        if self.ocioso:
+            self.ocioso = False
+            self.atividade_retomada.emit()
+            self._atualizar()
+
+    def noite(self, agora=None) -> bool:
+        """Se o instante está dentro de HORARIO_NOTURNO (que pode atravessar a meia-noite)."""
+        if self.horario_noturno is None: return False
+        hora = (agora or datetime.now()).time(); inicio, fim = self.horario_noturno
+        return inicio <= hora < fim if inicio <= fim else (hora >= inicio or hora < fim)
+
+    def _quando_timer(self):
+        self.despertares += 1
+        self._atualizar()
+
+    def _atualizar(self):
+        agora = datetime.now()
+        if not self.ocioso and time.monotonic() - self.ultima_atividade >= self.tempo_inatividade:
+            self.ocioso = True
+            self.inatividade.emit()
+        em_repouso = self.ocioso and self.noite(agora)
+        if em_repouso != self.em_repouso:
+            self.em_repouso = em_repouso
+            self.repouso_mudou.emit(em_repouso)
+        minuto = agora.replace(second=0, microsecond=0)
+        if not self.em_repouso and minuto != self.minuto:
+            self.minuto = minuto
+            self.minuto_mudou.emit()
+        self._armar(agora)
+
+    def _proxima_fronteira_noturna(self, agora):
+        instantes = []
+        for horario in self.horario_noturno:
+            instante = datetime.combine(agora.date(), horario)
+            if instante <= agora: instante += timedelta(days=1)
+            instantes.append(instante)
+        return min(instantes)
+
+    def _armar(self, agora):
+        esperas = [ESPERA_MAXIMA_MS]
+        if not self.em_repouso:
+            proximo_minuto = agora.replace(second=0, microsecond=0) + timedelta(minutes=1)
+            esperas.append((proximo_minuto - agora).total_seconds() * 1000)
+        if not self.ocioso:
+            esperas.append((self.ultima_atividade + self.tempo_inatividade - time.monotonic()) * 1000)
+        elif self.horario_noturno is not None:
+            # Ocioso, o repouso começa ou termina na fronteira do horário noturno.
+            esperas.append((self._proxima_fronteira_noturna(agora) - agora).total_seconds() * 1000)
+        self.timer.start(max(1, math.ceil(min(esperas))))
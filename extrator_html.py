@@ -0,0 +1,92 @@
+# extrator_html.py
+
+from html.parser import HTMLParser
+
+# Prefixos de URLs de imagem malformadas pelo WordPress da FCT (domínio repetido antes do https:).
+_PREFIXOS_URL_QUEBRADA = ("http://fct.ufg.brhttps:", "https://fct.ufg.brhttps:")
+
+class _Concluido(Exception):
+    """Interrompe a leitura quando texto e imagem já foram obtidos."""
+
+class _ExtratorDescricao(HTMLParser):
+    """Leitura única do HTML da descrição: primeira <img>, texto visível e parada antecipada.
+
+    Reproduz BeautifulSoup(...).find('img') e get_text(separator=' ', strip=True) após remover
+    <script> e <style>: cada trecho de texto entre tags vira uma sequência de palavras.
+    """
+
+    def __init__(self, limite: int):
+        super().__init__(convert_charrefs=True)
+        self.limite = limite
+        self.palavras = []
+        self.tamanho = -1  # comprimento de ' '.join(self.palavras)
+        self.trecho = []  # texto do nó atual; o HTMLParser pode entregá-lo em pedaços
+        self.dentro_script = 0
+        self.img_vista = False
+        self.url_imagem = None
+
+    def _texto_completo(self) -> bool:
+        return self.tamanho > self.limite
+
+    def _verificar_fim(self):
+        if self.img_vista and self._texto_completo():
+            raise _Concluido()
+
+    def _fechar_trecho(self):
+        if not self.trecho: return
+        texto = ''.join(self.trecho); self.trecho = []
+        if self.dentro_script or self._texto_completo(): return
+        for palavra in texto.split():
+            self.palavras.append(palavra)
+            self.tamanho += len(palavra) + 1
+            if self._texto_completo(): break
+        self._verificar_fim()
+
+    def handle_starttag(self, tag, attrs):
+        self._fechar_trecho()
+        if tag in ("script", "style"):
+            self.dentro_script += 1
+        elif tag == "img" and not self.img_vista:
+            self.img_vista = True
+            self.url_imagem = dict(attrs).get("src") or None
+            self._verificar_fim()
+
+    def handle_endtag(self, tag):
+        self._fechar_trecho()
+        if tag in ("script", "style") and self.dentro_script:
+            self.dentro_script -= 1
+
+    def handle_data(self, data):
+        if not self.dentro_script and not self._texto_completo():
+            self.trecho.append(data)
+
+    def unknown_decl(self, data):
+        # Seções CDATA contam como texto para o BeautifulSoup.
+        self._fechar_trecho()
+        if data.startswith("CDATA["):
+            self.trecho.append(data[6:]); self._fechar_trecho()
+
+    def handle_comment(self, data): self._fechar_trecho()
+    def handle_decl(self, decl): self._fechar_trecho()
+    def handle_pi(self, data): self._fechar_trecho()
+
+def extrair_descricao(html: str, limite: int):
+    """Retorna (url_imagem, descricao) da descrição HTML de uma entrada do feed.
+
+    A URL da imagem vem da primeira <img> (com o domínio duplicado corrigido) e a descrição é o
+    texto sem scripts/estilos, com espaços normalizados e truncado na última palavra inteira
+    dentro de `limite`, terminando em '... - '. A leitura para assim que ambos estão definidos.
+    """
+    extrator = _ExtratorDescricao(limite)
+    try:
+        extrator.feed(html or '')
+        extrator.close()
+        extrator._fechar_trecho()
+    except _Concluido:
+        pass
+    url_imagem = extrator.url_imagem
+    if url_imagem and url_imagem.startswith(_PREFIXOS_URL_QUEBRADA):
+        url_imagem = url_imagem.replace("https://fct.ufg.br", "").replace("http://fct.ufg.br", "")
+    descricao = ' '.join(extrator.palavras)
+    if len(descricao) > limite: descricao = descricao[:limite].rsplit(' ', 1)[0] + '... - '
+    return url_imagem, descricao
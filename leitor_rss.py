@@ -0,0 +1,56 @@
+# leitor_rss.py
+
+import time
+from email.utils import parsedate_tz, mktime_tz
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+_CONTEUDO = "{http://purl.org/rss/1.0/modules/content/}encoded"
+# Filhos do <item> usados pelo carrossel -> chave da entrada, com os mesmos nomes do feedparser.
+_CAMPOS = {'title': 'title', 'link': 'link', 'description': 'description', 'pubDate': 'published',
+           'guid': 'id', _CONTEUDO: 'conteudo'}
+
+class FormatoNaoSuportado(Exception):
+    """O documento não é RSS 2.0 bem-formado. `lidos` traz os bytes já consumidos, para o feedparser."""
+    def __init__(self, mensagem: str, lidos: bytes):
+        super().__init__(mensagem)
+        self.lidos = lidos
+
+def _entrada(item) -> dict:
+    entrada = {}
+    for filho in item:
+        chave = _CAMPOS.get(filho.tag)
+        if chave and chave not in entrada: entrada[chave] = (filho.text or '').strip()
+    # Como no feedparser, content:encoded só entra na falta de description.
+    conteudo = entrada.pop('conteudo', None)
+    if not entrada.get('description') and conteudo: entrada['description'] = conteudo
+    data = parsedate_tz(entrada['published']) if entrada.get('published') else None
+    if data: entrada['published_parsed'] = time.gmtime(mktime_tz(data))
+    return entrada
+
+def ler_rss(blocos, limite: int) -> list:
+    """Lê os primeiros `limite` itens de um RSS 2.0 a partir de um iterável de blocos de bytes.
+
+    Para de consumir os blocos assim que o último item pedido se fecha; o restante do documento
+    (o arquivo do feed, com o content:encoded de cada item) nem é baixado. Retorna dicionários com
+    title, link, description, published, published_parsed e id. Atom, RDF e XML inválido levantam
+    FormatoNaoSuportado.
+    """
+    leitor = XMLPullParser(events=('start', 'end'))
+    lidos = bytearray(); entradas = []; raiz = None
+    try:
+        for bloco in blocos:
+            lidos += bloco
+            leitor.feed(bloco)
+            for evento, elemento in leitor.read_events():
+                if evento == 'start':
+                    if raiz is None:
+                        raiz = elemento
+                        if raiz.tag != 'rss': raise FormatoNaoSuportado(f"Formato {raiz.tag} não é RSS 2.0", bytes(lidos))
+                elif elemento.tag == 'item':
+                    entradas.append(_entrada(elemento)); elemento.clear()
+                    if len(entradas) >= limite: return entradas
+        leitor.close()
+    except ParseError as e:
+        raise FormatoNaoSuportado(f"XML inválido: {e}", bytes(lidos)) from e
+    if raiz is None: raise FormatoNaoSuportado("Documento vazio", bytes(lidos))
+    return entradas
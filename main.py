@@ -2,18 +2,23 @@
 
 import sys
 import os
+import time
 os.environ["QTWEBENGINE_CHROMIUM_FLAGS"] = "--disable-gpu"
 
-from PyQt6.QtCore import (QUrl, QTimer, Qt, QEvent, QPropertyAnimation, QEasingCurve, QPoint, 
-                          QSequentialAnimationGroup)
+import diagnostico
+import metricas
+from PyQt6.QtCore import (QUrl, QTimer, Qt, QEvent, QPropertyAnimation, QEasingCurve, QPoint, QRect,
+                          QSequentialAnimationGroup, QCoreApplication, QLoggingCategory)
 from PyQt6.QtGui import QGuiApplication, QPainter, QBrush, QColor, QPen, QFont
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                              QPushButton, QLabel, QStackedWidget, QGraphicsDropShadowEffect)
-from PyQt6.QtWebEngineWidgets import QWebEngineView
-from PyQt6.QtWebEngineCore import QWebEngineSettings
 
-from config import (INTERVALO_ATUALIZACAO_AVISOS, URLS, LARGURA_MENU, 
-                    MODO_TELA_CHEIA, ANIMACAO_BOLINHA_ATIVA)
+from config import (VIGIAR_TRAVAMENTOS, INTERVALO_ATUALIZACAO_AVISOS, URLS, LARGURA_MENU, 
+                    MODO_TELA_CHEIA, ANIMACAO_BOLINHA_ATIVA, MODO_INICIO_RAPIDO, ATRASO_WEBENGINE,
+                    AQUECER_PAGINAS_WEB, ATRASO_AQUECIMENTO_WEB, SOMBRAS_EM_CACHE, ATIVAR_METRICAS,
+                    REGISTRAR_QUADROS, EXIBICAO_PROGRESSIVA)
+from energia import AgendadorEnergia
+from renderizacao import renderizar_com_sombra
 from ui_components import CarrosselNoticias, MenuLateral, ClockWidget
 
 class BolinhaAnimada(QWidget):
@@ -27,8 +32,14 @@ class BolinhaAnimada(QWidget):
         self.mensagem = "Olá, utilize\no mouse abaixo\npara interagir"
         self.fonte_texto = QFont("Arial", 12, QFont.Weight.Bold)
         self.setFixedSize(self.raio * 2, self.raio * 2)
-        shadow = QGraphicsDropShadowEffect(); shadow.setBlurRadius(20); shadow.setColor(QColor(0,0,0,90))
-        self.setGraphicsEffect(shadow)
+        self.pixmap, self.margem = None, 0
+        if SOMBRAS_EM_CACHE:
+            # Bolinha e sombra são desenhadas uma única vez; cada quadro da animação só move o widget.
+            self.pixmap, self.margem = renderizar_com_sombra(self._desenhar, self.raio * 2, self.raio * 2, 20, QColor(0, 0, 0, 90))
+            self.setFixedSize(self.pixmap.size())
+        else:
+            shadow = QGraphicsDropShadowEffect(); shadow.setBlurRadius(20); shadow.setColor(QColor(0,0,0,90))
+            self.setGraphicsEffect(shadow)
         self._configurar_animacao()
         self.hide()
 
@@ -41,19 +52,25 @@ class BolinhaAnimada(QWidget):
         self.animacao_grupo.addAnimation(anim1); self.animacao_grupo.addAnimation(anim2)
         self.animacao_grupo.addAnimation(anim3); self.animacao_grupo.addAnimation(anim4)
 
-    def paintEvent(self, evento):
-        painter = QPainter(self); painter.setRenderHint(QPainter.RenderHint.Antialiasing)
+    def _desenhar(self, painter):
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing)
         painter.setBrush(QBrush(self.cor_bolinha)); painter.setPen(QPen(Qt.PenStyle.NoPen))
         painter.drawEllipse(0, 0, self.raio * 2, self.raio * 2)
         painter.setPen(QPen(Qt.GlobalColor.white)); painter.setFont(self.fonte_texto)
-        painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, self.mensagem)
+        painter.drawText(QRect(0, 0, self.raio * 2, self.raio * 2), Qt.AlignmentFlag.AlignCenter, self.mensagem)
+
+    def paintEvent(self, evento):
+        painter = QPainter(self)
+        if self.pixmap is not None: painter.drawPixmap(0, 0, self.pixmap)
+        else: self._desenhar(painter)
 
     def start_animation(self):
         w_pai, h_pai = self.parent().width(), self.parent().height(); borda = self.raio * 2
-        anim1 = self.animacao_grupo.animationAt(0); anim1.setStartValue(QPoint(borda, borda)); anim1.setEndValue(QPoint(w_pai - borda, h_pai - borda)); anim1.setEasingCurve(QEasingCurve.Type.InOutSine)
-        anim2 = self.animacao_grupo.animationAt(1); anim2.setEndValue(QPoint(w_pai - borda, borda)); anim2.setEasingCurve(QEasingCurve.Type.InOutQuad)
-        anim3 = self.animacao_grupo.animationAt(2); anim3.setEndValue(QPoint(borda, h_pai - borda)); anim3.setEasingCurve(QEasingCurve.Type.InOutCubic)
-        anim4 = self.animacao_grupo.animationAt(3); anim4.setEndValue(QPoint(borda, borda)); anim4.setEasingCurve(QEasingCurve.Type.InOutSine)
+        ponto = lambda x, y: QPoint(x - self.margem, y - self.margem)  # o pixmap com sombra começa antes da bolinha
+        anim1 = self.animacao_grupo.animationAt(0); anim1.setStartValue(ponto(borda, borda)); anim1.setEndValue(ponto(w_pai - borda, h_pai - borda)); anim1.setEasingCurve(QEasingCurve.Type.InOutSine)
+        anim2 = self.animacao_grupo.animationAt(1); anim2.setEndValue(ponto(w_pai - borda, borda)); anim2.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        anim3 = self.animacao_grupo.animationAt(2); anim3.setEndValue(ponto(borda, h_pai - borda)); anim3.setEasingCurve(QEasingCurve.Type.InOutCubic)
+        anim4 = self.animacao_grupo.animationAt(3); anim4.setEndValue(ponto(borda, borda)); anim4.setEasingCurve(QEasingCurve.Type.InOutSine)
         self.show(); self.raise_(); self.animacao_grupo.start()
 
     def stop_animation(self):
@@ -62,7 +79,12 @@ class BolinhaAnimada(QWidget):
 class AplicacaoPainel(QMainWindow):
     def __init__(self):
         super().__init__()
+        self.primeira_pintura = False
+        self.energia = AgendadorEnergia(parent=self)
         QGuiApplication.instance().installEventFilter(self)
+        # O medidor intercepta cada UpdateRequest da janela; só é instalado quando alguém lê as medições.
+        self.medidor_quadros = diagnostico.MedidorQuadros(self) if ATIVAR_METRICAS or REGISTRAR_QUADROS else None
+        self.vigia = diagnostico.VigiaTravamentos(self) if VIGIAR_TRAVAMENTOS else None
         self.setWindowTitle("Painel Interativo FCT/UFG"); self.setStyleSheet("background-color: #f0f2f5;")
         widget_central = QWidget(); self.setCentralWidget(widget_central)
         layout_principal = QVBoxLayout(widget_central); layout_principal.setContentsMargins(0, 0, 0, 0); layout_principal.setSpacing(0)
@@ -74,8 +96,11 @@ class AplicacaoPainel(QMainWindow):
         layout_conteudo.addWidget(self.menu_lateral)
         self.area_conteudo = QStackedWidget()
         self.carrossel_conteudo = CarrosselNoticias()
-        self.webview = self._criar_webview()
-        self.area_conteudo.addWidget(self.carrossel_conteudo); self.area_conteudo.addWidget(self.webview)
+        self.webview = None
+        self.aquecedor = None
+        self.governador_memoria = None
+        self.area_conteudo.addWidget(self.carrossel_conteudo)
+        if not MODO_INICIO_RAPIDO: self._obter_webview(aquecer=True)
         self.area_conteudo.setCurrentWidget(self.carrossel_conteudo)
         layout_conteudo.addWidget(self.area_conteudo, 1)
         layout_principal.addLayout(layout_conteudo)
@@ -83,6 +108,9 @@ class AplicacaoPainel(QMainWindow):
         self.bolinha = None
         if ANIMACAO_BOLINHA_ATIVA:
             self.bolinha = BolinhaAnimada(self)
+        self.cobertura_repouso = QWidget(self); self.cobertura_repouso.setAttribute(Qt.WidgetAttribute.WA_StyledBackground)
+        self.cobertura_repouso.setStyleSheet("background-color: black;"); self.cobertura_repouso.hide()
+        if metricas.iniciar(self): metricas.registrar_coleta(self._coletar_metricas)
     
     def _criar_cabecalho(self) -> QWidget:
         cabecalho = QWidget(); cabecalho.setFixedHeight(60); cabecalho.setStyleSheet("background-color: #005a9e; padding: 0 10px;")
@@ -93,14 +121,65 @@ class AplicacaoPainel(QMainWindow):
         layout_cabecalho.addWidget(self.btn_hamburger); layout_cabecalho.addWidget(titulo); layout_cabecalho.addStretch(); layout_cabecalho.addWidget(self.relogio)
         return cabecalho
 
-    def _criar_webview(self) -> QWebEngineView:
+    def _criar_webview(self):
+        # Importação tardia: o Chromium só é carregado quando o WebEngine é realmente necessário.
+        from PyQt6.QtWebEngineWidgets import QWebEngineView
+        from PyQt6.QtWebEngineCore import QWebEngineSettings, QWebEnginePage
+        from navegador import obter_perfil, MedidorCarregamento
         view = QWebEngineView()
+        view.setPage(QWebEnginePage(obter_perfil(), view))
+        self.medidor_carregamento = MedidorCarregamento(view.page())
         settings = view.settings()
         settings.setAttribute(QWebEngineSettings.WebAttribute.PdfViewerEnabled, True)
         settings.setAttribute(QWebEngineSettings.WebAttribute.PluginsEnabled, True)
         settings.setAttribute(QWebEngineSettings.WebAttribute.JavascriptEnabled, True)
         return view
 
+    def _obter_webview(self, aquecer: bool = False):
+        """Cria o WebEngine no primeiro uso: clique no menu ou ociosidade após a primeira pintura."""
+        if self.webview is None:
+            self.webview = self._criar_webview()
+            if self.governador_memoria is None:
+                from navegador import GovernadorMemoria
+                self.governador_memoria = GovernadorMemoria(lambda: self.webview, self)
+                self.governador_memoria.reciclagem_necessaria.connect(self._reciclar_webview)
+            self.webview.loadFinished.connect(lambda ok: diagnostico.marcar("webengine_pronto"))
+            self.area_conteudo.addWidget(self.webview)
+            # Carregar uma página vazia já sobe o processo de renderização do Chromium.
+            if aquecer: self.webview.load(QUrl("about:blank"))
+            # O aquecimento só é agendado quando o WebEngine nasce na ociosidade, não por um clique.
+            if aquecer and AQUECER_PAGINAS_WEB:
+                from navegador import AquecedorPaginas
+                self.aquecedor = AquecedorPaginas(URLS.values(), self)
+                QTimer.singleShot(ATRASO_AQUECIMENTO_WEB * 1000, self.aquecedor.iniciar)
+        return self.webview
+
+    def _reciclar_webview(self):
+        """Destrói o WebEngine (encerrando seus renderizadores); o próximo uso cria um novo."""
+        if self.webview is None: return
+        if self.area_conteudo.currentWidget() is self.webview: self.area_conteudo.setCurrentWidget(self.carrossel_conteudo)
+        self.area_conteudo.removeWidget(self.webview)
+        self.webview.deleteLater(); self.webview = None
+
+    def _quando_primeira_pintura(self):
+        self.primeira_pintura = True
+        diagnostico.marcar("primeira_pintura")
+        if MODO_INICIO_RAPIDO:
+            QTimer.singleShot(ATRASO_WEBENGINE * 1000, lambda: self._obter_webview(aquecer=True))
+
+    def _coletar_metricas(self):
+        from cache import obter_cache_imagens
+        from utils import gerar_imagem_qr
+        pixmaps = self.carrossel_conteudo.cache_pixmaps
+        metricas.definir_cache("pixmaps", pixmaps.acertos, pixmaps.falhas)
+        info_qr = gerar_imagem_qr.cache_info()
+        metricas.definir_cache("qr_codes", info_qr.hits, info_qr.misses)
+        disco = obter_cache_imagens().estatisticas()
+        metricas.definir_cache("imagens_disco", disco['acertos'] + disco['revalidados'], disco['falhas'])
+        metricas.definir('painel_memoria_residente_bytes', diagnostico.rss_processo(os.getpid()) or 0, processo="painel")
+        pid_renderizador = self.webview.page().renderProcessPid() if self.webview is not None else 0
+        metricas.definir('painel_memoria_residente_bytes', diagnostico.rss_processo(pid_renderizador) or 0, processo="renderizador")
+
     def _conectar_sinais(self):
         self.btn_hamburger.clicked.connect(self.alternar_menu)
         botoes = self.menu_lateral.botoes
@@ -114,11 +193,12 @@ class AplicacaoPainel(QMainWindow):
         self.timer_atualizacao_conteudo = QTimer(self); self.timer_atualizacao_conteudo.timeout.connect(self.carrossel_conteudo.atualizar_conteudo)
         self.timer_atualizacao_conteudo.start(INTERVALO_ATUALIZACAO_AVISOS * 1000)
         
-        self.timer_inatividade = QTimer(self)
-        # MUDANÇA: Intervalo alterado para 2 minutos (2 * 60 * 1000 = 120000 ms).
-        self.timer_inatividade.setInterval(120000)
-        self.timer_inatividade.timeout.connect(self.voltar_para_home)
-        self.timer_inatividade.start()
+        # Relógio, inatividade e horário noturno compartilham um único timer.
+        self.energia.minuto_mudou.connect(self.relogio.update_time)
+        self.energia.inatividade.connect(self.voltar_para_home)
+        self.energia.atividade_retomada.connect(self._quando_atividade_retomada)
+        self.energia.repouso_mudou.connect(self._quando_repouso_mudar)
+        self.energia.iniciar()
 
     def alternar_menu(self):
         largura_alvo = 0 if self.menu_visivel else LARGURA_MENU; self.menu_visivel = not self.menu_visivel
@@ -131,28 +211,53 @@ class AplicacaoPainel(QMainWindow):
 
     def voltar_para_home(self):
         """Retorna o painel para seu estado inicial após inatividade."""
+        diagnostico.medir_quadro("volta ao início", time.perf_counter(), 'painel_volta_inicio_segundos')
         self.mostrar_inicio() 
         self.abrir_menu()     
         
-        if self.bolinha:
+        if self.bolinha and not self.energia.noite():
             self.bolinha.start_animation() 
 
+    def _quando_atividade_retomada(self):
+        if self.bolinha:
+            self.bolinha.stop_animation()
+
+    def _quando_repouso_mudar(self, repouso: bool):
+        """Horário noturno sem uso: apaga a tela e suspende buscas, carrossel e animações até o próximo toque."""
+        if repouso:
+            if self.bolinha: self.bolinha.stop_animation()
+            self.carrossel_conteudo.pausar("repouso"); self.timer_atualizacao_conteudo.stop()
+            self.cobertura_repouso.setGeometry(self.rect()); self.cobertura_repouso.show(); self.cobertura_repouso.raise_()
+        else:
+            self.cobertura_repouso.hide()
+            self.carrossel_conteudo.retomar("repouso")
+            # O conteúdo ficou a noite sem atualizar.
+            self.timer_atualizacao_conteudo.start(); self.carrossel_conteudo.atualizar_conteudo()
+
     def mostrar_inicio(self):
         self.area_conteudo.setCurrentWidget(self.carrossel_conteudo)
+        if self.governador_memoria: self.governador_memoria.liberar()
 
     def carregar_url(self, url: str):
-        self.webview.load(QUrl(url))
-        self.area_conteudo.setCurrentWidget(self.webview)
+        webview = self._obter_webview()
+        if self.aquecedor: self.aquecedor.parar()
+        self.governador_memoria.reativar()
+        webview.load(QUrl(url))
+        self.area_conteudo.setCurrentWidget(webview)
 
     def eventFilter(self, fonte, evento) -> bool:
+        if not self.primeira_pintura and evento.type() == QEvent.Type.Paint:
+            self._quando_primeira_pintura()
         if evento.type() in (QEvent.Type.MouseMove, QEvent.Type.KeyPress, QEvent.Type.MouseButtonPress):
-            if self.bolinha:
-                self.bolinha.stop_animation()
-            self.timer_inatividade.start()
+            self.energia.registrar_atividade()
         return super().eventFilter(fonte, evento)
 
 if __name__ == "__main__":
+    # Necessário para importar o QtWebEngine depois de criar a QApplication.
+    QCoreApplication.setAttribute(Qt.ApplicationAttribute.AA_ShareOpenGLContexts)
     app = QApplication(sys.argv)
+    # Cada quadro parcial de um JPEG geraria um aviso de "premature end of data segment".
+    if EXIBICAO_PROGRESSIVA: QLoggingCategory.setFilterRules("qt.gui.imageio.jpeg.warning=false")
     janela = AplicacaoPainel()
     if MODO_TELA_CHEIA: janela.showFullScreen()
     else: janela.showMaximized()
@@ -0,0 +1,201 @@
+# metricas.py
+#
+# Métricas do painel, opcionais (ATIVAR_METRICAS): texto no formato Prometheus em
+# http://127.0.0.1:PORTA_METRICAS/metrics e, com ARQUIVO_METRICAS, um instantâneo JSON regravado
+# a cada INTERVALO_METRICAS segundos.
+#
+# Os pontos quentes (requisições, quadros, trocas de item) só chamam incrementar/observar, que
+# nada fazem com as métricas desativadas e, ativadas, custam uma busca em dicionário e um bisect
+# sob trava. Os valores que dependem de objetos do Qt (caches, memória, renderizador) são
+# amostrados na thread da interface pelas funções de registrar_coleta, nunca na do servidor.
+
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from PyQt6.QtCore import QObject, QTimer, Qt
+
+from config import ATIVAR_METRICAS, PORTA_METRICAS, INTERVALO_METRICAS, ARQUIVO_METRICAS
+
+SEGUNDOS_REDE = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+SEGUNDOS_QUADRO = (0.002, 0.005, 0.01, 0.016, 0.033, 0.05, 0.1, 0.25, 1)
+AMOSTRA_LACO_MS = 1000  # Período do timer que mede o atraso do laço de eventos
+
+# nome -> (tipo, descrição, limites dos baldes dos histogramas)
+METRICAS = {
+    'painel_requisicao_segundos': ('histogram', "Duração das requisições HTTP, por fonte", SEGUNDOS_REDE),
+    'painel_requisicao_erros_total': ('counter', "Requisições que falharam (exceção ou status >= 400), por fonte", None),
+    'painel_cache_consultas_total': ('counter', "Consultas aos caches, por cache e resultado", None),
+    'painel_cache_taxa_acerto': ('gauge', "Fração das consultas atendidas pelo cache", None),
+    'painel_troca_item_segundos': ('histogram', "Da troca de item do carrossel até o fim da pintura na tela", SEGUNDOS_QUADRO),
+    'painel_volta_inicio_segundos': ('histogram', "Da inatividade até o início pintado na tela", SEGUNDOS_QUADRO),
+    'painel_pintura_quadro_segundos': ('histogram', "Tempo de pintura de cada quadro da janela", SEGUNDOS_QUADRO),
+    'painel_travamento_segundos': ('histogram', "Travamentos da thread da interface detectados pelo vigia", (0.5, 1, 2, 5, 10, 30, 60)),
+    'painel_atraso_laco_segundos': ('histogram', "Atraso do laço de eventos da interface em relação ao timer de amostragem", SEGUNDOS_QUADRO),
+    'painel_memoria_residente_bytes': ('gauge', "Memória residente, por processo (painel ou renderizador do WebEngine)", None),
+}
+
+class Histograma:
+    def __init__(self, limites):
+        self.limites = limites
+        self.baldes = [0] * (len(limites) + 1)  # o último é o +Inf
+        self.soma = 0.0
+        self.total = 0
+
+    def observar(self, valor: float):
+        self.baldes[bisect.bisect_left(self.limites, valor)] += 1
+        self.soma += valor; self.total += 1
+
+    def quantil(self, q: float):
+        """Estimativa pelo limite superior do balde que contém o quantil (None no balde +Inf)."""
+        alvo = q * self.total; acumulado = 0
+        for limite, contagem in zip(self.limites, self.baldes):
+            acumulado += contagem
+            if acumulado >= alvo: return limite
+        return None
+
+def _rotulos_texto(rotulos, extra=()) -> str:
+    pares = list(rotulos) + list(extra)
+    if not pares: return ""
+    escapar = lambda v: str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{chave}="{escapar(valor)}"' for chave, valor in pares) + "}"
+
+class ColetorMetricas(QObject):
+    """Guarda contadores, medidores e histogramas, amostra os valores da interface e serve tudo."""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.trava = threading.Lock()
+        self.valores = {}  # (nome, rótulos) -> número, para contadores e medidores
+        self.histogramas = {}  # (nome, rótulos) -> Histograma
+        self.coletas = []
+        self.servidor = None
+        self.timer_coleta = QTimer(self); self.timer_coleta.timeout.connect(self.coletar)
+        self.timer_coleta.start(INTERVALO_METRICAS * 1000)
+        self.timer_laco = QTimer(self); self.timer_laco.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer_laco.timeout.connect(self._medir_laco)
+        self.esperado_laco = time.perf_counter() + AMOSTRA_LACO_MS / 1000
+        self.timer_laco.start(AMOSTRA_LACO_MS)
+
+    def incrementar(self, nome, valor, rotulos):
+        chave = (nome, rotulos)
+        with self.trava: self.valores[chave] = self.valores.get(chave, 0) + valor
+
+    def definir(self, nome, valor, rotulos):
+        with self.trava: self.valores[(nome, rotulos)] = valor
+
+    def observar(self, nome, valor, rotulos):
+        chave = (nome, rotulos)
+        with self.trava:
+            histograma = self.histogramas.get(chave)
+            if histograma is None: histograma = self.histogramas[chave] = Histograma(METRICAS[nome][2])
+            histograma.observar(valor)
+
+    def _medir_laco(self):
+        agora = time.perf_counter()
+        self.observar('painel_atraso_laco_segundos', max(0.0, agora - self.esperado_laco), ())
+        self.esperado_laco = agora + AMOSTRA_LACO_MS / 1000
+
+    def coletar(self):
+        """Chamado na thread da interface: amostra os medidores e grava o instantâneo JSON."""
+        for funcao in self.coletas:
+            try: funcao()
+            except Exception as e: print(f"Erro ao coletar métricas: {e}")
+        if ARQUIVO_METRICAS: self._gravar_json()
+
+    # --- Exportação ---
+
+    def texto_prometheus(self) -> str:
+        with self.trava:
+            valores = sorted(self.valores.items()); histogramas = sorted(self.histogramas.items(), key=lambda item: item[0])
+            histogramas = [(chave, (list(h.baldes), h.soma, h.total, h.limites)) for chave, h in histogramas]
+        linhas = []; anunciadas = set()
+        def anunciar(nome):
+            if nome in anunciadas: return
+            anunciadas.add(nome); tipo, ajuda, _ = METRICAS[nome]
+            linhas.append(f"# HELP {nome} {ajuda}"); linhas.append(f"# TYPE {nome} {tipo}")
+        for (nome, rotulos), valor in valores:
+            anunciar(nome); linhas.append(f"{nome}{_rotulos_texto(rotulos)} {valor}")
+        for (nome, rotulos), (baldes, soma, total, limites) in histogramas:
+            anunciar(nome); acumulado = 0
+            for limite, contagem in zip(list(limites) + ["+Inf"], baldes):
+                acumulado += contagem
+                linhas.append(f"{nome}_bucket{_rotulos_texto(rotulos, [('le', limite)])} {acumulado}")
+            linhas.append(f"{nome}_sum{_rotulos_texto(rotulos)} {soma}")
+            linhas.append(f"{nome}_count{_rotulos_texto(rotulos)} {total}")
+        return "\n".join(linhas) + "\n"
+
+    def instantaneo(self) -> dict:
+        with self.trava:
+            valores = [{'nome': nome, 'rotulos': dict(rotulos), 'valor': valor} for (nome, rotulos), valor in sorted(self.valores.items())]
+            histogramas = [{'nome': nome, 'rotulos': dict(rotulos), 'total': h.total, 'soma': h.soma,
+                            'p50': h.quantil(0.5), 'p95': h.quantil(0.95), 'p99': h.quantil(0.99)}
+                           for (nome, rotulos), h in sorted(self.histogramas.items(), key=lambda item: item[0])]
+        return {'instante': time.time(), 'valores': valores, 'histogramas': histogramas}
+
+    def _gravar_json(self):
+        try:
+            os.makedirs(os.path.dirname(ARQUIVO_METRICAS) or ".", exist_ok=True)
+            temporario = ARQUIVO_METRICAS + ".tmp"
+            with open(temporario, "w", encoding="utf-8") as arquivo:
+                json.dump(self.instantaneo(), arquivo, ensure_ascii=False)
+            os.replace(temporario, ARQUIVO_METRICAS)
+        except OSError as e:
+            print(f"Erro ao gravar métricas: {e}")
+
+    def servir(self, porta: int, endereco: str = "127.0.0.1"):
+        coletor = self
+        class Manipulador(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split("?")[0] not in ("/metrics", "/"):
+                    self.send_response(404); self.send_header("Content-Length", "0"); self.end_headers(); return
+                corpo = coletor.texto_prometheus().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(corpo))); self.end_headers()
+                self.wfile.write(corpo)
+            def log_message(self, formato, *args):
+                pass
+        try:
+            self.servidor = ThreadingHTTPServer((endereco, porta), Manipulador)
+        except OSError as e:
+            print(f"Erro ao abrir a porta de métricas {porta}: {e}"); return
+        self.servidor.daemon_threads = True
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+
+# --- API usada pelo restante do painel; sem coletor ativo, nada é feito ---
+
+_coletor = None
+
+def iniciar(parent=None, porta: int = PORTA_METRICAS):
+    """Cria o coletor e o servidor quando ATIVAR_METRICAS; deve ser chamado na thread da interface."""
+    global _coletor
+    if ATIVAR_METRICAS and _coletor is None:
+        _coletor = ColetorMetricas(parent)
+        _coletor.servir(porta)
+    return _coletor
+
+def ativas() -> bool:
+    return _coletor is not None
+
+def incrementar(nome: str, valor=1, **rotulos):
+    if _coletor is not None: _coletor.incrementar(nome, valor, tuple(sorted(rotulos.items())))
+
+def definir(nome: str, valor, **rotulos):
+    if _coletor is not None: _coletor.definir(nome, valor, tuple(sorted(rotulos.items())))
+
+def observar(nome: str, valor: float, **rotulos):
+    if _coletor is not None: _coletor.observar(nome, valor, tuple(sorted(rotulos.items())))
+
+def registrar_coleta(funcao):
+    """Registra uma função chamada na thread da interface a cada INTERVALO_METRICAS para definir medidores."""
+    if _coletor is not None: _coletor.coletas.append(funcao)
+
+def definir_cache(cache: str, acertos: int, falhas: int):
+    """Atualiza as consultas e a taxa de acerto de um cache a partir dos seus contadores acumulados."""
+    if _coletor is None: return
+    definir('painel_cache_consultas_total', acertos, cache=cache, resultado="acerto")
+    definir('painel_cache_consultas_total', falhas, cache=cache, resultado="falha")
+    definir('painel_cache_taxa_acerto', acertos / (acertos + falhas) if acertos + falhas else 0.0, cache=cache)
@@ -0,0 +1,142 @@
+# navegador.py
+
+import os
+import time
+
+from PyQt6.QtCore import QObject, QTimer, QUrl, QCoreApplication, pyqtSignal
+from PyQt6.QtWebEngineCore import QWebEngineProfile, QWebEnginePage
+
+from diagnostico import rss_processo
+from config import (DIRETORIO_CACHE, NOME_PERFIL_WEB, LIMITE_CACHE_WEB, PERFIL_WEB_PERSISTENTE,
+                    REGISTRAR_TEMPOS_WEB, TEMPO_MAXIMO_AQUECIMENTO, MODO_LIBERACAO_WEB,
+                    INTERVALO_AMOSTRA_MEMORIA, TETO_MEMORIA_WEB)
+
+_perfil = None
+
+def obter_perfil() -> QWebEngineProfile:
+    """Perfil do WebEngine compartilhado pelo painel, com cache HTTP e armazenamento em disco."""
+    global _perfil
+    if _perfil is None:
+        if not PERFIL_WEB_PERSISTENTE:
+            _perfil = QWebEngineProfile.defaultProfile()
+            return _perfil
+        _perfil = QWebEngineProfile(NOME_PERFIL_WEB, QCoreApplication.instance())
+        diretorio = os.path.join(DIRETORIO_CACHE, "web")
+        _perfil.setCachePath(os.path.join(diretorio, "cache"))
+        _perfil.setPersistentStoragePath(os.path.join(diretorio, "armazenamento"))
+        _perfil.setHttpCacheType(QWebEngineProfile.HttpCacheType.DiskHttpCache)
+        _perfil.setHttpCacheMaximumSize(LIMITE_CACHE_WEB)
+        _perfil.setPersistentCookiesPolicy(QWebEngineProfile.PersistentCookiesPolicy.AllowPersistentCookies)
+    return _perfil
+
+class MedidorCarregamento(QObject):
+    """Mede o tempo entre loadStarted e loadFinished de cada URL carregada numa página."""
+    def __init__(self, pagina: QWebEnginePage, rotulo: str = "menu"):
+        super().__init__(pagina)
+        self.pagina = pagina
+        self.rotulo = rotulo
+        self.inicio = None
+        self.tempos = {}  # url -> lista de durações em segundos
+        pagina.loadStarted.connect(self._quando_iniciar)
+        pagina.loadFinished.connect(self._quando_terminar)
+
+    def _quando_iniciar(self):
+        self.inicio = time.perf_counter()
+
+    def _quando_terminar(self, ok: bool):
+        if self.inicio is None: return
+        duracao = time.perf_counter() - self.inicio; self.inicio = None
+        url = self.pagina.requestedUrl().toString()
+        if url in ("", "about:blank"): return
+        self.tempos.setdefault(url, []).append(duracao)
+        if REGISTRAR_TEMPOS_WEB:
+            print(f"[web:{self.rotulo}] {url} carregada em {duracao:.2f}s{'' if ok else ' (falhou)'}")
+
+class AquecedorPaginas(QObject):
+    """Carrega as páginas do menu, uma por vez e fora da tela, para encher o cache do perfil."""
+    def __init__(self, urls, parent=None):
+        super().__init__(parent)
+        self.pendentes = list(urls)
+        self.pagina = None
+        # Páginas que não terminam a tempo são interrompidas; o loadFinished resultante segue a fila.
+        self.timer_limite = QTimer(self); self.timer_limite.setSingleShot(True)
+        self.timer_limite.timeout.connect(self._interromper)
+
+    def iniciar(self):
+        if self.pagina is not None: return
+        self.pagina = QWebEnginePage(obter_perfil(), self)
+        self.medidor = MedidorCarregamento(self.pagina, "aquecimento")
+        self.pagina.loadFinished.connect(self._proxima)
+        self._proxima()
+
+    def parar(self):
+        """Interrompe o aquecimento, por exemplo quando o usuário abre uma página do menu."""
+        self.pendentes.clear()
+        self.timer_limite.stop()
+        if self.pagina is not None:
+            self.pagina.loadFinished.disconnect(self._proxima)
+            self.pagina.deleteLater(); self.pagina = None
+
+    def _interromper(self):
+        if self.pagina is not None: self.pagina.triggerAction(QWebEnginePage.WebAction.Stop)
+
+    def _proxima(self, *args):
+        if not self.pendentes:
+            self.parar(); return
+        self.timer_limite.start(TEMPO_MAXIMO_AQUECIMENTO * 1000)
+        self.pagina.load(QUrl(self.pendentes.pop(0)))
+
+class GovernadorMemoria(QObject):
+    """Libera o renderizador quando o painel volta ao início e pede a reciclagem do WebEngine
+    quando a memória do renderizador passa do teto configurado."""
+    reciclagem_necessaria = pyqtSignal()
+
+    def __init__(self, obter_view, parent=None, medir_memoria=rss_processo):
+        super().__init__(parent)
+        self.obter_view = obter_view  # função que retorna o QWebEngineView atual ou None
+        self.medir_memoria = medir_memoria  # pid -> bytes residentes ou None
+        self.ultima_amostra = {}
+        self.reciclagem_pendente = False
+        self.timer_amostragem = QTimer(self)
+        self.timer_amostragem.timeout.connect(self.amostrar)
+        self.timer_amostragem.start(INTERVALO_AMOSTRA_MEMORIA * 1000)
+
+    def liberar(self):
+        """Chamado ao voltar para o carrossel: descarta, congela ou esvazia a página conforme a configuração."""
+        view = self.obter_view()
+        if view is None: return
+        if self.reciclagem_pendente:
+            self.reciclagem_pendente = False
+            self.reciclagem_necessaria.emit(); return
+        pagina = view.page()
+        if MODO_LIBERACAO_WEB == "congelar":
+            pagina.setLifecycleState(QWebEnginePage.LifecycleState.Frozen)
+        elif MODO_LIBERACAO_WEB in ("descartar", "em_branco"):
+            view.stop()
+            view.setUrl(QUrl("about:blank"))
+            if MODO_LIBERACAO_WEB == "descartar":
+                # Uma página oculta e descartada encerra o renderizador; um novo load() a reativa.
+                pagina.setLifecycleState(QWebEnginePage.LifecycleState.Discarded)
+
+    def reativar(self):
+        """Devolve a página ao estado ativo antes de um novo carregamento."""
+        view = self.obter_view()
+        if view is not None and view.page().lifecycleState() != QWebEnginePage.LifecycleState.Active:
+            view.page().setLifecycleState(QWebEnginePage.LifecycleState.Active)
+
+    def amostrar(self) -> dict:
+        """Mede o processo do painel (navegador) e o renderizador. Só o renderizador conta para o teto:
+        é a única parte que a reciclagem devolve, e o processo do painel inclui Python, Qt e o carrossel."""
+        view = self.obter_view()
+        pid_renderizador = view.page().renderProcessPid() if view is not None else 0
+        self.ultima_amostra = {
+            'navegador': self.medir_memoria(os.getpid()),
+            'renderizador': self.medir_memoria(pid_renderizador) if pid_renderizador else 0
+        }
+        renderizador = self.ultima_amostra['renderizador'] or 0
+        if view is not None and renderizador > TETO_MEMORIA_WEB:
+            print(f"Renderizador do WebEngine em {renderizador / 2**20:.0f} MB (painel em {(self.ultima_amostra['navegador'] or 0) / 2**20:.0f} MB), "
+                  f"acima do teto de {TETO_MEMORIA_WEB / 2**20:.0f} MB: reciclando.")
+            if view.isVisible(): self.reciclagem_pendente = True  # espera o usuário voltar ao início
+            else: self.reciclagem_necessaria.emit()
+        return self.ultima_amostra
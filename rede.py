@@ -0,0 +1,189 @@
+# rede.py
+
+import socket
+import sys
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import urlsplit
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NameResolutionError, NewConnectionError
+from urllib3.util import connection
+
+import metricas
+from config import (TIMEOUT_CONEXAO, TIMEOUT_LEITURA, HOSTS_NO_POOL, CONEXOES_POR_HOST,
+                    VALIDADE_CACHE_DNS, REGISTRAR_TEMPOS_REDE, TAMANHO_BLOCO_DOWNLOAD)
+
+# Medições da conexão em andamento; cada thread faz uma requisição por vez.
+_medicao_local = threading.local()
+
+# --- Resolução de nomes com cache ---
+_cache_dns = {}  # (host, porta) -> (endereços de getaddrinfo, instante da resolução)
+_trava_dns = threading.Lock()
+
+def _resolver(host: str, porta: int) -> list:
+    """Resolve o host reaproveitando respostas recentes por VALIDADE_CACHE_DNS segundos.
+
+    Retorna todos os endereços, na ordem do getaddrinfo (respeitando a família permitida pelo urllib3).
+    """
+    agora = time.monotonic()
+    with _trava_dns:
+        entrada = _cache_dns.get((host, porta))
+        if entrada and agora - entrada[1] < VALIDADE_CACHE_DNS:
+            return entrada[0]
+    enderecos = socket.getaddrinfo(host.strip("[]"), porta, connection.allowed_gai_family(), socket.SOCK_STREAM)
+    with _trava_dns:
+        _cache_dns[(host, porta)] = (enderecos, agora)
+    return enderecos
+
+def _esquecer_dns(host: str, porta: int):
+    with _trava_dns:
+        _cache_dns.pop((host, porta), None)
+
+class _ConexaoMedida:
+    """Mistura para as conexões do urllib3 que mede DNS, TCP e TLS e usa o cache de DNS."""
+
+    def _new_conn(self):
+        # Só a resolução é nossa: cada endereço, na ordem, passa pelo create_connection do urllib3 (como
+        # um IP literal, sem nova consulta); as exceções são as mesmas que o urllib3 levanta.
+        inicio = time.perf_counter()
+        try:
+            enderecos = _resolver(self.host, self.port)
+        except socket.gaierror as e:
+            raise NameResolutionError(self.host, self, e) from e
+        resolvido = time.perf_counter()
+        erro = None
+        for _, _, _, _, endereco in enderecos:
+            try:
+                sock = connection.create_connection((endereco[0], self.port), self.timeout,
+                                                    source_address=self.source_address, socket_options=self.socket_options)
+                break
+            except OSError as e:
+                erro = e
+        else:
+            # Nenhum endereço respondeu: a próxima conexão resolve o nome de novo.
+            _esquecer_dns(self.host, self.port)
+            if isinstance(erro, socket.timeout):
+                raise ConnectTimeoutError(self, f"Connection to {self.host} timed out. (connect timeout={self.timeout})") from erro
+            raise NewConnectionError(self, f"Failed to establish a new connection: {erro or 'nenhum endereço'}") from erro
+        sys.audit("http.client.connect", self, self.host, self.port)
+        _medicao_local.dns += resolvido - inicio
+        _medicao_local.tcp += time.perf_counter() - resolvido
+        return sock
+
+    def connect(self):
+        inicio = time.perf_counter()
+        super().connect()
+        _medicao_local.conexao += time.perf_counter() - inicio
+
+class ConexaoHTTP(_ConexaoMedida, HTTPConnection): pass
+class ConexaoHTTPS(_ConexaoMedida, HTTPSConnection): pass
+class PoolHTTP(HTTPConnectionPool): ConnectionCls = ConexaoHTTP
+class PoolHTTPS(HTTPSConnectionPool): ConnectionCls = ConexaoHTTPS
+
+class AdaptadorPainel(HTTPAdapter):
+    """Adaptador com pools limitados por host cujas conexões registram os tempos de abertura."""
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {'http': PoolHTTP, 'https': PoolHTTPS}
+
+# --- Sessão compartilhada ---
+_sessao = None
+_trava_sessao = threading.Lock()
+_medicoes = deque(maxlen=200)
+_trava_medicoes = threading.Lock()
+
+def obter_sessao() -> requests.Session:
+    """Retorna a sessão HTTP do processo, com keep-alive e pool de conexões por host."""
+    global _sessao
+    with _trava_sessao:
+        if _sessao is None:
+            _sessao = requests.Session()
+            _sessao.headers.update({'Accept-Encoding': 'gzip, deflate', 'Connection': 'keep-alive',
+                                    'User-Agent': 'PainelInterativoFCT'})
+            adaptador = AdaptadorPainel(pool_connections=HOSTS_NO_POOL, pool_maxsize=CONEXOES_POR_HOST)
+            _sessao.mount('http://', adaptador); _sessao.mount('https://', adaptador)
+        return _sessao
+
+def requisitar(url: str, cabecalhos: dict = None, stream: bool = False, fonte: str = None) -> requests.Response:
+    """Faz um GET pela sessão compartilhada com os timeouts padrão do painel.
+
+    A resposta recebe o atributo `medicao` com os tempos, em segundos, de DNS, TCP, conexão
+    (TCP + TLS), TTFB (do envio ao primeiro byte, sem a abertura da conexão) e transferência
+    do corpo. Conexões reaproveitadas do pool têm DNS e conexão iguais a zero. Com stream=True
+    a transferência fica a cargo do chamador e não é medida.
+    `fonte` (notícias, avisos, imagens...) agrupa as métricas; sem ela, vale o host da URL.
+    """
+    _medicao_local.dns = _medicao_local.tcp = _medicao_local.conexao = 0.0
+    fonte = fonte or urlsplit(url).hostname or "?"
+    inicio = time.perf_counter()
+    try:
+        resposta = obter_sessao().get(url, headers=cabecalhos, timeout=(TIMEOUT_CONEXAO, TIMEOUT_LEITURA), stream=True)
+        primeiro_byte = time.perf_counter()
+        if not stream:
+            resposta.content
+    except Exception:
+        metricas.incrementar('painel_requisicao_erros_total', fonte=fonte)
+        raise
+    fim = time.perf_counter()
+    metricas.observar('painel_requisicao_segundos', fim - inicio, fonte=fonte)
+    if resposta.status_code >= 400: metricas.incrementar('painel_requisicao_erros_total', fonte=fonte)
+    abertura = _medicao_local.dns + _medicao_local.conexao
+    medicao = {
+        'url': url, 'status': resposta.status_code, 'reutilizada': _medicao_local.conexao == 0.0,
+        'dns': _medicao_local.dns, 'tcp': _medicao_local.tcp,
+        'tls': max(_medicao_local.conexao - _medicao_local.tcp, 0.0), 'conexao': _medicao_local.conexao,
+        'ttfb': max(primeiro_byte - inicio - abertura, 0.0),
+        'transferencia': None if stream else fim - primeiro_byte, 'total': fim - inicio,
+        'bytes': None if stream else len(resposta.content)
+    }
+    resposta.medicao = medicao
+    with _trava_medicoes:
+        _medicoes.append(medicao)
+    if REGISTRAR_TEMPOS_REDE:
+        print(formatar_medicao(medicao))
+    return resposta
+
+class RespostaRecusada(requests.RequestException):
+    """Download interrompido por ler_corpo: tipo de conteúdo inesperado ou corpo acima do limite."""
+
+def ler_corpo(resposta: requests.Response, limite: int, tipos=None, ao_receber=None, cancelamento=None):
+    """Lê em blocos o corpo de uma resposta pedida com stream=True e fecha a resposta.
+
+    Um Content-Type que não comece por um dos prefixos de `tipos` e um Content-Length acima de
+    `limite` são recusados antes de ler o corpo; sem Content-Length, a leitura para assim que
+    passa do limite. `ao_receber(dados)` recebe o bytearray acumulado após cada bloco (não deve
+    guardá-lo). Retorna os bytes, ou None se `cancelamento` for sinalizado no meio do caminho.
+    """
+    try:
+        tipo = resposta.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if tipos and tipo and not tipo.startswith(tuple(tipos)):
+            raise RespostaRecusada(f"Tipo de conteúdo {tipo} recusado: {resposta.url}", response=resposta)
+        anunciado = resposta.headers.get('Content-Length', '')
+        if anunciado.isdigit() and int(anunciado) > limite:
+            raise RespostaRecusada(f"{anunciado} bytes acima do limite de {limite}: {resposta.url}", response=resposta)
+        dados = bytearray()
+        for bloco in resposta.iter_content(TAMANHO_BLOCO_DOWNLOAD):
+            if cancelamento is not None and cancelamento.is_set(): return None
+            dados += bloco
+            if len(dados) > limite:
+                raise RespostaRecusada(f"Corpo acima do limite de {limite} bytes: {resposta.url}", response=resposta)
+            if ao_receber is not None: ao_receber(dados)
+        return bytes(dados)
+    finally:
+        resposta.close()
+
+def formatar_medicao(medicao: dict) -> str:
+    def ms(valor): return "-" if valor is None else f"{valor * 1000:.0f}ms"
+    return (f"[rede] {medicao['status']} {medicao['url']} dns={ms(medicao['dns'])} conexao={ms(medicao['conexao'])} "
+            f"(tls={ms(medicao['tls'])}) ttfb={ms(medicao['ttfb'])} transf={ms(medicao['transferencia'])} "
+            f"total={ms(medicao['total'])}{' reutilizada' if medicao['reutilizada'] else ''}")
+
+def medicoes_recentes() -> list:
+    """Últimas medições de requisições, da mais antiga para a mais recente."""
+    with _trava_medicoes:
+        return list(_medicoes)
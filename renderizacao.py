@@ -0,0 +1,146 @@
+# renderizacao.py
+
+from functools import lru_cache
+from PyQt6.QtCore import Qt, QMargins, QPointF, QRect, QRectF, QVariantAnimation, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter, QPixmap
+from PyQt6.QtWidgets import (QGraphicsBlurEffect, QGraphicsDropShadowEffect, QGraphicsEffect,
+                             QGraphicsPixmapItem, QGraphicsScene, QWidget, qDrawBorderPixmap)
+
+from config import SOMBRAS_EM_CACHE
+
+# Para o mesmo raio, o QGraphicsBlurEffect espalha bem mais que o desfoque do QGraphicsDropShadowEffect;
+# com 0,4 do raio o perfil da borda coincide com o da sombra original (medido com um retângulo opaco).
+FATOR_RAIO_SOMBRA = 0.4
+
+def desfocar(imagem: QImage, raio: float) -> QImage:
+    """Aplica o mesmo desfoque do QGraphicsDropShadowEffect, uma única vez, a uma imagem com margem livre."""
+    cena = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(imagem))
+    efeito = QGraphicsBlurEffect(); efeito.setBlurRadius(raio * FATOR_RAIO_SOMBRA)
+    item.setGraphicsEffect(efeito); cena.addItem(item)
+    resultado = QImage(imagem.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    resultado.fill(Qt.GlobalColor.transparent)
+    pintor = QPainter(resultado)
+    cena.render(pintor, QRectF(resultado.rect()), QRectF(imagem.rect()))
+    pintor.end()
+    return resultado
+
+@lru_cache(maxsize=16)
+def sombra_nove_partes(desfoque: int, rgba: tuple, raio_canto: int):
+    """Sombra de um retângulo (arredondado) como nove-partes: (pixmap, margem da borda em pixels).
+
+    Só os cantos e as bordas têm desenho; o miolo de 2 px é esticado para qualquer tamanho.
+    """
+    margem = desfoque + raio_canto
+    lado = 2 * margem + 2
+    forma = QImage(lado, lado, QImage.Format.Format_ARGB32_Premultiplied)
+    forma.fill(Qt.GlobalColor.transparent)
+    pintor = QPainter(forma); pintor.setRenderHint(QPainter.RenderHint.Antialiasing)
+    pintor.setPen(Qt.PenStyle.NoPen); pintor.setBrush(QColor(*rgba))
+    pintor.drawRoundedRect(QRectF(desfoque, desfoque, lado - 2 * desfoque, lado - 2 * desfoque), raio_canto, raio_canto)
+    pintor.end()
+    return QPixmap.fromImage(desfocar(forma, desfoque)), margem
+
+class SombraEmCache(QGraphicsEffect):
+    """Substituto do QGraphicsDropShadowEffect que não redesfoca a cada pintura.
+
+    A sombra vem de um nove-partes pré-renderizado e o widget é desenhado direto, sem pixmap
+    intermediário; uma atualização dentro do widget custa só o desenho do que mudou.
+    """
+    def __init__(self, desfoque: int, cor: QColor, deslocamento=(0, 0), raio_canto: int = 0, parent=None):
+        super().__init__(parent)
+        self.desfoque = desfoque
+        self.deslocamento = QPointF(*deslocamento)
+        self.pixmap, self.margem = sombra_nove_partes(desfoque, cor.getRgb(), raio_canto)
+
+    def boundingRectFor(self, retangulo: QRectF) -> QRectF:
+        d = self.desfoque
+        return retangulo.united(retangulo.translated(self.deslocamento).adjusted(-d, -d, d, d))
+
+    def draw(self, pintor: QPainter):
+        d, m = self.desfoque, self.margem
+        alvo = self.sourceBoundingRect(Qt.CoordinateSystem.LogicalCoordinates).translated(self.deslocamento).adjusted(-d, -d, d, d)
+        qDrawBorderPixmap(pintor, alvo.toRect(), QMargins(m, m, m, m), self.pixmap)
+        self.drawSource(pintor)
+
+def criar_sombra(desfoque: int, cor: QColor, deslocamento=(8, 8), raio_canto: int = 0, parent=None) -> QGraphicsEffect:
+    """Sombra projetada conforme SOMBRAS_EM_CACHE: nove-partes em cache ou o efeito original do Qt."""
+    if SOMBRAS_EM_CACHE:
+        return SombraEmCache(desfoque, cor, deslocamento, raio_canto, parent)
+    sombra = QGraphicsDropShadowEffect(parent)
+    sombra.setBlurRadius(desfoque); sombra.setColor(cor); sombra.setOffset(*deslocamento)
+    return sombra
+
+def renderizar_com_sombra(desenhar, largura: int, altura: int, desfoque: int, cor: QColor, deslocamento=(8, 8)):
+    """Renderiza uma vez `desenhar(pintor)` (em largura x altura) com sua sombra projetada.
+
+    Retorna (pixmap, margem): o desenho começa em (margem, margem) dentro do pixmap.
+    """
+    margem = desfoque + max(abs(deslocamento[0]), abs(deslocamento[1]))
+    forma = QImage(largura + 2 * margem, altura + 2 * margem, QImage.Format.Format_ARGB32_Premultiplied)
+    forma.fill(Qt.GlobalColor.transparent)
+    pintor = QPainter(forma); pintor.translate(margem, margem); desenhar(pintor); pintor.end()
+    # A sombra é a silhueta do desenho na cor da sombra, desfocada e deslocada.
+    silhueta = QImage(forma)
+    pintor = QPainter(silhueta)
+    pintor.setCompositionMode(QPainter.CompositionMode.CompositionMode_SourceIn)
+    pintor.fillRect(silhueta.rect(), cor); pintor.end()
+    resultado = QImage(forma.size(), QImage.Format.Format_ARGB32_Premultiplied)
+    resultado.fill(Qt.GlobalColor.transparent)
+    pintor = QPainter(resultado)
+    pintor.drawImage(QPointF(*deslocamento), desfocar(silhueta, desfoque))
+    pintor.drawImage(0, 0, forma); pintor.end()
+    return QPixmap.fromImage(resultado), margem
+
+def renderizar_opaco(widget: QWidget) -> QPixmap:
+    """grab() do widget sobre a cor de fundo da paleta, sem transparência, para uma sobreposição opaca."""
+    imagem = widget.grab()
+    quadro = QPixmap(imagem.size()); quadro.setDevicePixelRatio(imagem.devicePixelRatio())
+    quadro.fill(widget.palette().color(widget.backgroundRole()))
+    pintor = QPainter(quadro); pintor.drawPixmap(0, 0, imagem); pintor.end()
+    return quadro
+
+class TransicaoCruzada(QWidget):
+    """Sobreposição que exibe um quadro já renderizado por cima dos widgets reais.
+
+    Com um quadro anterior e duração, o novo surge sobre ele em transição cruzada. Ao final emite
+    `concluida`, para que os widgets de baixo recebam o mesmo conteúdo e a sobreposição seja retirada.
+    Os quadros devem ser opacos (renderizar_opaco): assim o Qt não repinta o que fica por baixo.
+    """
+    concluida = pyqtSignal()
+    DURACAO_MINIMA_MS = 50  # Sem transição, o quadro novo fica ao menos alguns quadros sozinho na tela
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.anterior = None; self.novo = None; self.progresso = 1.0
+        self.animacao = QVariantAnimation(self); self.animacao.setStartValue(0.0); self.animacao.setEndValue(1.0)
+        self.animacao.valueChanged.connect(self._quando_progresso)
+        self.animacao.finished.connect(self.concluida)
+        self.hide()
+
+    def iniciar(self, geometria: QRect, novo: QPixmap, anterior: QPixmap = None, duracao: int = 0):
+        self.animacao.stop()
+        self.novo = novo
+        self.anterior = anterior if duracao > 0 else None
+        self.progresso = 0.0 if self.anterior is not None else 1.0
+        self.setGeometry(geometria); self.show(); self.raise_()
+        self.animacao.setDuration(max(duracao, self.DURACAO_MINIMA_MS)); self.animacao.start()
+
+    def ativa(self) -> bool:
+        return self.isVisible()
+
+    def encerrar(self):
+        self.animacao.stop(); self.hide()
+        self.anterior = self.novo = None
+
+    def _quando_progresso(self, valor):
+        if self.anterior is not None:
+            self.progresso = valor; self.update()
+
+    def paintEvent(self, evento):
+        pintor = QPainter(self)
+        if self.anterior is not None and self.progresso < 1.0:
+            pintor.drawPixmap(0, 0, self.anterior); pintor.setOpacity(self.progresso)
+        if self.novo is not None: pintor.drawPixmap(0, 0, self.novo)
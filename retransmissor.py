@@ -0,0 +1,244 @@
+# retransmissor.py
+#
+# Modo retransmissor: um único processo na rede local consulta o feed, a API de avisos e as
+# imagens e serve o conteúdo já processado aos painéis, que apontam URL_RETRANSMISSOR para ele.
+#
+#   GET /noticias                      -> {"noticias": [registros prontos para o carrossel]}
+#   GET /avisos?tela=<ID_TELA>         -> lista de avisos no formato da API, filtrada por targetScreens
+#   GET /imagens/<id>[?largura=&altura=] -> imagem pré-escalada (JPEG, ou PNG quando há transparência)
+#
+# Todas as respostas levam ETag e respondem 304 a If-None-Match.
+#
+# Uso: python retransmissor.py [--porta 8080] [--feed URL] [--avisos URL] [--intervalo SEGUNDOS]
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlsplit, parse_qs
+
+from PyQt6.QtCore import QCoreApplication, QBuffer, QIODevice
+
+from cache import CacheHTTPDisco, TIPOS_IMAGEM
+from config import (URL_FEED, URL_AVISOS, PORTA_RETRANSMISSOR, INTERVALO_RETRANSMISSOR, DIRETORIO_CACHE,
+                    LIMITE_CACHE_IMAGENS, TAMANHO_MAXIMO_IMAGEM, TAMANHO_IMAGENS_RETRANSMISSOR, LIMITE_IMAGENS_RETRANSMISSOR)
+from utils import decodificar_imagem
+from workers import BaixadorNoticias, aviso_para_tela
+
+LADO_MAXIMO_IMAGEM = 4096  # Limite para largura/altura pedidas na consulta
+
+def _etag(dados: bytes) -> str:
+    return '"' + hashlib.sha1(dados).hexdigest()[:20] + '"'
+
+def _id_imagem(url: str) -> str:
+    return hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+
+class Retransmissor:
+    """Conteúdo obtido da origem uma vez por ciclo e as respostas prontas para os painéis."""
+    def __init__(self, url_feed=URL_FEED, url_avisos: str = URL_AVISOS):
+        self.url_avisos = url_avisos
+        self.baixador_noticias = BaixadorNoticias(url_feed=url_feed, aquecer_qr=False)
+        self.etag_avisos = None
+        self.noticias = []  # registros processados, com as URLs de imagem originais
+        self.avisos = []  # avisos como vieram da API
+        self.imagens = {}  # id -> URL original
+        self.versoes = {}  # id -> hash do conteúdo original obtido na última consulta
+        self.trava = threading.Lock()
+        self.respostas = {}  # (recurso, base, tela) -> (corpo, tipo, etag); limpo a cada mudança na origem
+        self.imagens_prontas = OrderedDict()  # (versão, largura, altura) -> (dados, tipo, etag)
+        # Validade zero: cada consulta à origem revalida (If-None-Match) a imagem, e uma troca de
+        # conteúdo na mesma URL chega aos painéis no ciclo seguinte. O diretório é próprio do
+        # retransmissor, separado do cache de um painel que rode na mesma máquina.
+        self.cache_imagens = CacheHTTPDisco(os.path.join(DIRETORIO_CACHE, "retransmissor"), LIMITE_CACHE_IMAGENS, 0,
+                                            TAMANHO_MAXIMO_IMAGEM, TIPOS_IMAGEM)
+        self.bytes_imagens = 0
+        self.ultima_atualizacao = None
+
+    # --- Origem ---
+
+    def atualizar(self):
+        """Um ciclo de consulta à origem; o que falhar mantém o conteúdo anterior."""
+        mudou = False
+        diff = self.baixador_noticias.run()
+        if diff is not None and not diff['inalterado']:
+            estado = self.baixador_noticias.estado
+            with self.trava: self.noticias = [estado.registros[guid][1] for guid in estado.ordem]
+            mudou = True
+        avisos = self._baixar_avisos()
+        if avisos is not None:
+            with self.trava: self.avisos = avisos
+            mudou = True
+        if mudou:
+            urls = [item.get('url_imagem') for item in self.noticias + self.avisos]
+            with self.trava:
+                self.imagens = {_id_imagem(url): url for url in urls if url}
+                self.respostas.clear()
+        self.ultima_atualizacao = time.time()
+        # Revalida cada imagem na origem e deixa as do tamanho padrão prontas antes de os painéis pedirem.
+        for id_imagem in list(self.imagens):
+            try:
+                self._original(id_imagem)
+                self.imagem(id_imagem, *TAMANHO_IMAGENS_RETRANSMISSOR)
+            except Exception as e: print(f"Erro ao preparar imagem {self.imagens.get(id_imagem)}: {e}")
+        self._descartar_versoes_antigas()
+
+    def _baixar_avisos(self):
+        """Lista completa de avisos da API, ou None se não mudou ou não foi possível obtê-la."""
+        from rede import requisitar
+        try:
+            resposta = requisitar(self.url_avisos, {'If-None-Match': self.etag_avisos} if self.etag_avisos else None, fonte="avisos")
+            if resposta.status_code == 304: return None
+            resposta.raise_for_status()
+            dados = resposta.json()
+            self.etag_avisos = resposta.headers.get('ETag')
+            return dados['avisos'] if isinstance(dados, dict) else dados
+        except Exception as e:
+            print(f"Erro ao obter avisos: {e}"); return None
+
+    # --- Respostas ---
+
+    def _url_imagem(self, base: str, url):
+        return f"{base}/imagens/{_id_imagem(url)}" if url else None
+
+    def _resposta_json(self, chave, montar):
+        with self.trava:
+            resposta = self.respostas.get(chave)
+            if resposta is None:
+                corpo = json.dumps(montar(), ensure_ascii=False, default=str).encode("utf-8")
+                resposta = self.respostas[chave] = (corpo, "application/json; charset=utf-8", _etag(corpo))
+            return resposta
+
+    def noticias_para(self, base: str):
+        return self._resposta_json(('noticias', base, None), lambda: {
+            'noticias': [dict(registro, url_imagem=self._url_imagem(base, registro.get('url_imagem'))) for registro in self.noticias]
+        })
+
+    def avisos_para(self, base: str, tela: str):
+        return self._resposta_json(('avisos', base, tela), lambda: [
+            dict(aviso, url_imagem=self._url_imagem(base, aviso.get('url_imagem'))) for aviso in self.avisos if aviso_para_tela(aviso, tela)
+        ])
+
+    def _original(self, id_imagem: str):
+        """Bytes da imagem na origem (revalidada pelo cache em disco) e sua versão, ou (None, None)."""
+        with self.trava: url = self.imagens.get(id_imagem)
+        if url is None: return None, None
+        dados = self.cache_imagens.obter(url)
+        versao = hashlib.sha1(dados).hexdigest()[:16]
+        with self.trava: self.versoes[id_imagem] = versao
+        return dados, versao
+
+    def _descartar_versoes_antigas(self):
+        """Esquece as imagens que saíram do conteúdo e as prontas de versões que não são mais as atuais."""
+        with self.trava:
+            self.versoes = {id_imagem: versao for id_imagem, versao in self.versoes.items() if id_imagem in self.imagens}
+            atuais = set(self.versoes.values())
+            for chave in [chave for chave in self.imagens_prontas if chave[0] not in atuais]:
+                self.bytes_imagens -= len(self.imagens_prontas.pop(chave)[0])
+
+    def imagem(self, id_imagem: str, largura: int, altura: int):
+        """Imagem reduzida para caber em largura x altura, ou None se o id não for conhecido.
+
+        As prontas são guardadas pela versão (hash do conteúdo) do original: quando a origem troca a
+        imagem mantendo a URL, a nova versão gera outra entrada, com outro ETag.
+        """
+        with self.trava:
+            versao = self.versoes.get(id_imagem)
+            pronta = self.imagens_prontas.get((versao, largura, altura)) if versao else None
+            if pronta is not None:
+                self.imagens_prontas.move_to_end((versao, largura, altura)); return pronta
+        dados, versao = self._original(id_imagem)
+        if dados is None: return None
+        chave = (versao, largura, altura)
+        imagem = decodificar_imagem(dados, (largura, altura), ampliar=False)
+        if imagem.isNull(): return None
+        formato, tipo = ("PNG", "image/png") if imagem.hasAlphaChannel() else ("JPEG", "image/jpeg")
+        buffer = QBuffer(); buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        imagem.save(buffer, formato, 90)
+        dados = bytes(buffer.data())
+        pronta = (dados, tipo, _etag(dados))
+        with self.trava:
+            anterior = self.imagens_prontas.pop(chave, None)
+            if anterior is not None: self.bytes_imagens -= len(anterior[0])
+            self.imagens_prontas[chave] = pronta; self.bytes_imagens += len(dados)
+            while self.bytes_imagens > LIMITE_IMAGENS_RETRANSMISSOR and len(self.imagens_prontas) > 1:
+                _, removida = self.imagens_prontas.popitem(last=False)
+                self.bytes_imagens -= len(removida[0])
+        return pronta
+
+class _Manipulador(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        retransmissor = self.server.retransmissor
+        partes = urlsplit(self.path)
+        consulta = parse_qs(partes.query)
+        # As URLs de imagem usam o mesmo endereço pelo qual o painel chegou ao retransmissor.
+        base = f"http://{self.headers.get('Host') or '%s:%d' % self.server.server_address[:2]}"
+        try:
+            if partes.path == "/noticias":
+                resposta = retransmissor.noticias_para(base)
+            elif partes.path == "/avisos":
+                resposta = retransmissor.avisos_para(base, consulta.get('tela', [''])[0])
+            elif partes.path.startswith("/imagens/"):
+                largura = min(LADO_MAXIMO_IMAGEM, int(consulta.get('largura', [TAMANHO_IMAGENS_RETRANSMISSOR[0]])[0]))
+                altura = min(LADO_MAXIMO_IMAGEM, int(consulta.get('altura', [TAMANHO_IMAGENS_RETRANSMISSOR[1]])[0]))
+                resposta = retransmissor.imagem(partes.path[len("/imagens/"):], max(1, largura), max(1, altura))
+            else:
+                resposta = None
+        except ValueError:
+            self._responder(400); return
+        except Exception as e:
+            print(f"Erro ao atender {self.path}: {e}"); self._responder(502); return
+        if resposta is None:
+            self._responder(404); return
+        dados, tipo, etag = resposta
+        if self.headers.get('If-None-Match') == etag:
+            self._responder(304, etag=etag); return
+        self._responder(200, dados, tipo, etag)
+
+    def _responder(self, status, dados=b"", tipo=None, etag=None):
+        self.send_response(status)
+        if tipo: self.send_header("Content-Type", tipo)
+        if etag: self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(dados)))
+        self.end_headers()
+        if dados: self.wfile.write(dados)
+
+    def log_message(self, formato, *args):
+        pass
+
+def iniciar_servidor(retransmissor: Retransmissor, porta: int, endereco: str = "0.0.0.0") -> ThreadingHTTPServer:
+    servidor = ThreadingHTTPServer((endereco, porta), _Manipulador)
+    servidor.daemon_threads = True
+    servidor.retransmissor = retransmissor
+    return servidor
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Retransmissor de conteúdo do Painel FCT na rede local")
+    parser.add_argument("--porta", type=int, default=PORTA_RETRANSMISSOR)
+    parser.add_argument("--feed", default=URL_FEED, help="URL do feed RSS de origem (padrão: as fontes de URL_FEED)")
+    parser.add_argument("--avisos", default=URL_AVISOS, help="URL da API de avisos de origem")
+    parser.add_argument("--intervalo", type=int, default=INTERVALO_RETRANSMISSOR, help="segundos entre consultas à origem")
+    argumentos = parser.parse_args()
+
+    app = QCoreApplication(sys.argv)  # necessário para os plugins de imagem do Qt
+    retransmissor = Retransmissor(argumentos.feed, argumentos.avisos)
+
+    def ciclo():
+        while True:
+            retransmissor.atualizar()
+            time.sleep(argumentos.intervalo)
+    threading.Thread(target=ciclo, daemon=True).start()
+
+    servidor = iniciar_servidor(retransmissor, argumentos.porta)
+    print(f"Retransmissor atendendo na porta {argumentos.porta} (origem: {argumentos.feed}, {argumentos.avisos})")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        servidor.server_close()
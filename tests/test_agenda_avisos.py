@@ -0,0 +1,101 @@
+# tests/test_agenda_avisos.py
+#
+# Agenda local dos avisos: cada aviso entra no carrossel em data_inicio e sai logo depois de
+# data_fim (o próprio instante do fim ainda o exibe), sem nova consulta à API.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import time
+import unittest
+from datetime import datetime, timedelta
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import agenda_avisos
+from agenda_avisos import AgendaAvisos, ESPERA_MAXIMA_MS
+
+T0 = datetime(2026, 10, 18, 12, 0)
+
+def aviso(titulo, inicio, fim):
+    return {'type': 'aviso', 'titulo': titulo, 'url_imagem': None, 'data_inicio_obj': inicio, 'data_fim_obj': fim}
+
+def titulos(avisos):
+    return [item['titulo'] for item in avisos]
+
+class TestFronteiras(unittest.TestCase):
+    def setUp(self):
+        self.relogio = mock.patch.object(agenda_avisos, "datetime"); relogio = self.relogio.start()
+        self.agora = T0; relogio.now.side_effect = lambda: self.agora
+        self.agenda = AgendaAvisos()
+        self.mudancas = []
+        self.agenda.vigentes_mudaram.connect(lambda vigentes: self.mudancas.append(titulos(vigentes)))
+
+    def tearDown(self):
+        self.agenda.timer.stop()
+        self.relogio.stop()
+
+    def disparar_em(self, instante):
+        self.agora = instante; self.agenda._quando_fronteira()
+
+    def test_programar_descarta_vencidos_e_separa_futuros(self):
+        vigentes = self.agenda.programar([
+            aviso("vencido", T0 - timedelta(hours=2), T0 - timedelta(hours=1)),
+            aviso("vigente", T0 - timedelta(hours=1), T0 + timedelta(hours=1)),
+            aviso("futuro", T0 + timedelta(minutes=30), T0 + timedelta(hours=2))])
+        self.assertEqual(titulos(vigentes), ["vigente"])
+        self.assertEqual(titulos(self.agenda.programados), ["vigente", "futuro"])
+        self.assertEqual(self.agenda.proxima_mudanca(), T0 + timedelta(minutes=30))
+
+    def test_entra_no_inicio_exato(self):
+        inicio = T0 + timedelta(seconds=10)
+        self.agenda.programar([aviso("A", inicio, inicio + timedelta(minutes=5))])
+        self.disparar_em(inicio - timedelta(milliseconds=1))
+        self.assertEqual(self.mudancas, [])
+        self.disparar_em(inicio)
+        self.assertEqual(self.mudancas, [["A"]])
+
+    def test_fim_exato_ainda_exibe_e_sai_logo_depois(self):
+        fim = T0 + timedelta(seconds=10)
+        self.agenda.programar([aviso("A", T0 - timedelta(minutes=1), fim)])
+        self.disparar_em(fim)
+        self.assertEqual(self.mudancas, [])
+        self.assertEqual(self.agenda.proxima_mudanca(), fim)
+        self.disparar_em(fim + timedelta(milliseconds=1))
+        self.assertEqual(self.mudancas, [[]])
+        self.assertIsNone(self.agenda.proxima_mudanca())
+        self.assertFalse(self.agenda.timer.isActive())
+
+    def test_espera_limitada_e_nunca_nula(self):
+        self.agenda.programar([aviso("longe", T0 + timedelta(days=1), T0 + timedelta(days=2))])
+        self.assertEqual(self.agenda.timer.interval(), ESPERA_MAXIMA_MS)
+        # Acordar antes da fronteira (espera limitada ou relógio ajustado) só rearma o timer.
+        self.disparar_em(T0 + timedelta(minutes=5))
+        self.assertEqual(self.mudancas, [])
+        self.assertEqual(self.agenda.proxima_mudanca(), T0 + timedelta(days=1))
+        self.agenda.programar([aviso("agora", T0, T0 + timedelta(seconds=1))])
+        self.assertGreaterEqual(self.agenda.timer.interval(), 1)
+
+class TestTimerReal(unittest.TestCase):
+    def test_aviso_entra_pelo_timer(self):
+        agenda = AgendaAvisos()
+        mudancas = []
+        agenda.vigentes_mudaram.connect(mudancas.append)
+        inicio = datetime.now() + timedelta(milliseconds=150)
+        self.assertEqual(agenda.programar([aviso("A", inicio, inicio + timedelta(minutes=1))]), [])
+        prazo = time.monotonic() + 3
+        while not mudancas and time.monotonic() < prazo:
+            app.processEvents(); time.sleep(0.005)
+        self.assertEqual([titulos(vigentes) for vigentes in mudancas], [["A"]])
+        self.assertGreaterEqual(datetime.now(), inicio)
+        agenda.timer.stop()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_agendador.py
+#
+# Falhas inesperadas nas tarefas do agendador não podem derrubar a thread da interface:
+# o resultado None chega ao slot do carrossel, que o trata como imagem indisponível.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import time
+import unittest
+from types import SimpleNamespace
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QTimer
+from PyQt6.QtGui import QImage
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import workers
+from ui_components import CarrosselNoticias
+from workers import AgendadorDownloads, baixar_imagem
+
+def esperar(condicao, limite: float = 5):
+    """Processa eventos do Qt até a condição valer ou o limite, em segundos, passar."""
+    prazo = time.monotonic() + limite
+    while not condicao() and time.monotonic() < prazo:
+        app.processEvents(); time.sleep(0.01)
+    return condicao()
+
+class TestAgendador(unittest.TestCase):
+    def setUp(self):
+        self.agendador = AgendadorDownloads(1)
+
+    def tearDown(self):
+        self.agendador.encerrar()
+
+    def test_excecao_qualquer_entrega_none(self):
+        recebidos = []
+        def falhar(cancelamento): raise ValueError("falha inesperada")
+        self.agendador.agendar('x', falhar, ao_concluir=lambda chave, resultado: recebidos.append((chave, resultado)))
+        self.assertTrue(esperar(lambda: recebidos))
+        self.assertEqual(recebidos, [('x', None)])
+
+    def test_trabalhador_continua_depois_da_excecao(self):
+        recebidos = []
+        def falhar(cancelamento): raise RuntimeError("falha inesperada")
+        self.agendador.agendar('a', falhar, ao_concluir=lambda chave, resultado: recebidos.append(resultado))
+        self.agendador.agendar('b', lambda cancelamento: 42, ao_concluir=lambda chave, resultado: recebidos.append(resultado))
+        self.assertTrue(esperar(lambda: len(recebidos) == 2))
+        self.assertEqual(recebidos, [None, 42])
+
+class TestImagemComFalha(unittest.TestCase):
+    def test_erro_do_cache_em_disco_vira_imagem_vazia(self):
+        with mock.patch.object(workers, "obter_cache_imagens", side_effect=PermissionError("sem permissão")):
+            imagem = baixar_imagem("http://exemplo.invalid/a.jpg", None, (100, 100))
+        self.assertIsInstance(imagem, QImage)
+        self.assertTrue(imagem.isNull())
+
+    def test_slot_aceita_resultado_none(self):
+        chave = ("http://exemplo.invalid/a.jpg", 100, 100)
+        exibidos = []
+        carrossel = SimpleNamespace(
+            imagens_solicitadas={chave}, cache_pixmaps=mock.Mock(), indice_atual=0,
+            conteudo_combinado=[{'url_imagem': chave[0]}], _chave_imagem=lambda item: chave,
+            display_stack=SimpleNamespace(exibir_imagem=lambda item, pixmap: exibidos.append(pixmap)),
+            quadro_exibido=object(), timer_preparo=QTimer())
+        CarrosselNoticias._quando_imagem_pronta(carrossel, chave, None)
+        self.assertEqual(len(exibidos), 1)
+        self.assertTrue(exibidos[0].isNull())
+        carrossel.cache_pixmaps.inserir.assert_not_called()
+        self.assertNotIn(chave, carrossel.imagens_solicitadas)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,143 @@
+# tests/test_downloads_imagem.py
+#
+# Downloads de imagem em streaming: o limite de tamanho e o Content-Type são checados antes de
+# ler o corpo (e durante, sem Content-Length), e o JPEG parcial é decodificado enquanto chega.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import rede
+import workers
+from cache import CacheHTTPDisco, TIPOS_IMAGEM
+from rede import RespostaRecusada, ler_corpo, requisitar
+from servidor_local import ServidorLocal
+
+def imagem_codificada(formato: bytes, largura: int = 400, altura: int = 300) -> bytes:
+    imagem = QImage(largura, altura, QImage.Format.Format_RGB32); imagem.fill(QColor(30, 120, 200))
+    buffer = QBuffer(); buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    imagem.save(buffer, formato.decode(), 90)
+    return bytes(buffer.data())
+
+class _SemTamanho(BaseHTTPRequestHandler):
+    """Manda `server.blocos` blocos de 1 KB sem Content-Length e fecha a conexão no fim."""
+    def do_GET(self):
+        self.send_response(200); self.send_header("Content-Type", "image/jpeg"); self.end_headers()
+        try:
+            for _ in range(self.server.blocos):
+                self.wfile.write(b"\0" * 1024); self.wfile.flush()
+        except OSError:
+            pass
+    def log_message(self, *args): pass
+
+class TestLimiteDeTamanho(unittest.TestCase):
+    def setUp(self):
+        self.servidor = ServidorLocal().__enter__()
+
+    def tearDown(self):
+        self.servidor.__exit__()
+
+    def test_content_length_acima_do_limite_recusado_antes_do_corpo(self):
+        url = self.servidor.publicar("/grande.jpg", b"\xff\xd8" + b"\0" * 4096, "image/jpeg")
+        recebidos = []
+        with self.assertRaises(RespostaRecusada):
+            ler_corpo(requisitar(url, stream=True), 1024, TIPOS_IMAGEM, recebidos.append)
+        self.assertEqual(recebidos, [])
+
+    def test_tipo_que_nao_e_imagem_recusado(self):
+        url = self.servidor.publicar("/pagina", b"<html></html>", "text/html; charset=utf-8")
+        with self.assertRaises(RespostaRecusada):
+            ler_corpo(requisitar(url, stream=True), 1024, TIPOS_IMAGEM)
+
+    def test_dentro_do_limite_retorna_os_bytes(self):
+        dados = imagem_codificada(b"PNG")
+        url = self.servidor.publicar("/pequena.png", dados, "image/png")
+        self.assertEqual(ler_corpo(requisitar(url, stream=True), len(dados), TIPOS_IMAGEM), dados)
+
+    def test_recusa_nao_entra_no_cache(self):
+        diretorio = tempfile.mkdtemp(); self.addCleanup(shutil.rmtree, diretorio, True)
+        cache = CacheHTTPDisco(diretorio, 10 ** 6, 0, 1024, TIPOS_IMAGEM)
+        url = self.servidor.publicar("/grande.jpg", b"\xff\xd8" + b"\0" * 4096, "image/jpeg")
+        with self.assertRaises(RespostaRecusada): cache.obter(url)
+        self.assertIsNone(cache._indice.get(url))
+
+class TestLimiteSemContentLength(unittest.TestCase):
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _SemTamanho); self.servidor.daemon_threads = True
+        self.servidor.blocos = 256
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.servidor.server_address[1]}/lenta.jpg"
+        # Blocos do tamanho dos enviados, para acompanhar o corpo crescendo.
+        self.bloco = mock.patch.object(rede, "TAMANHO_BLOCO_DOWNLOAD", 1024); self.bloco.start()
+
+    def tearDown(self):
+        self.bloco.stop()
+        self.servidor.shutdown(); self.servidor.server_close()
+
+    def test_corpo_que_passa_do_limite_e_interrompido(self):
+        recebidos = []
+        with self.assertRaises(RespostaRecusada):
+            ler_corpo(requisitar(self.url, stream=True), 8 * 1024, TIPOS_IMAGEM, lambda dados: recebidos.append(len(dados)))
+        # Nenhum bloco acima do limite chega a quem acompanha o download.
+        self.assertTrue(recebidos); self.assertLessEqual(max(recebidos), 8 * 1024)
+
+    def test_cancelamento_interrompe_a_leitura(self):
+        cancelamento, recebidos = threading.Event(), []
+        def ao_receber(dados):
+            recebidos.append(len(dados))
+            if len(dados) >= 4 * 1024: cancelamento.set()
+        self.assertIsNone(ler_corpo(requisitar(self.url, stream=True), 10 ** 6, TIPOS_IMAGEM, ao_receber, cancelamento))
+        # A leitura para no bloco seguinte ao cancelamento.
+        self.assertEqual(recebidos[-1], 4 * 1024)
+
+class TestJpegParcial(unittest.TestCase):
+    def setUp(self):
+        # Sem intervalo mínimo, cada bloco recebido é decodificado.
+        self.intervalo = mock.patch.object(workers, "INTERVALO_IMAGEM_PARCIAL", 0); self.intervalo.start()
+
+    def tearDown(self):
+        self.intervalo.stop()
+
+    def test_jpeg_incompleto_gera_quadro_parcial_no_tamanho_pedido(self):
+        jpeg = imagem_codificada(b"JPG")
+        quadros = []
+        ao_receber = workers._decodificador_parcial((200, 150), quadros.append)
+        ao_receber(bytearray(jpeg[:len(jpeg) // 2]))
+        self.assertEqual(len(quadros), 1)
+        self.assertFalse(quadros[0].isNull())
+        self.assertEqual((quadros[0].width(), quadros[0].height()), (200, 150))
+
+    def test_png_nao_gera_quadro_parcial(self):
+        png = imagem_codificada(b"PNG")
+        quadros = []
+        workers._decodificador_parcial((200, 150), quadros.append)(bytearray(png[:len(png) // 2]))
+        self.assertEqual(quadros, [])
+
+    def test_quadros_parciais_respeitam_o_intervalo(self):
+        jpeg = imagem_codificada(b"JPG")
+        quadros = []
+        with mock.patch.object(workers, "INTERVALO_IMAGEM_PARCIAL", 60_000):
+            ao_receber = workers._decodificador_parcial((200, 150), quadros.append)
+        ao_receber(bytearray(jpeg))
+        self.assertEqual(quadros, [])
+
+if __name__ == "__main__":
+    unittest.main()
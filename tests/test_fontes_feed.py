@@ -0,0 +1,87 @@
+# tests/test_fontes_feed.py
+#
+# Leitura das fontes do feed em paralelo: uma fonte lenta fica de fora da rodada, é cancelada
+# (conexão encerrada) e não acumula threads nem conexões de uma rodada para a outra.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import threading
+import time
+import unittest
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+
+import workers
+from servidor_local import ServidorLocal
+
+FEED = ("<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel><title>FCT</title>"
+        "<item><title>Notícia rápida</title><link>https://fct.ufg.br/n/1</link><guid>n-1</guid>"
+        "<pubDate>Mon, 06 Oct 2025 10:00:00 -0300</pubDate><description>Texto.</description></item>"
+        "</channel></rss>").encode("utf-8")
+
+class _Gotejador(BaseHTTPRequestHandler):
+    """Começa um RSS e depois manda um byte a cada 50 ms, sem nunca terminar."""
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.server.abertas += 1
+        self.send_response(200); self.send_header("Content-Type", "application/rss+xml"); self.end_headers()
+        try:
+            self.wfile.write(b"<?xml version='1.0'?><rss version='2.0'><channel><title>Lenta</title>"); self.wfile.flush()
+            while not self.server.parar.is_set():
+                time.sleep(0.05); self.wfile.write(b" "); self.wfile.flush()
+        except OSError:
+            pass
+        finally:
+            self.server.abertas -= 1
+
+    def log_message(self, formato, *args):
+        pass
+
+class TestFontesFeed(unittest.TestCase):
+    def setUp(self):
+        self.rapida = ServidorLocal().__enter__()
+        self.url_rapida = self.rapida.publicar("/feed", FEED, "application/rss+xml")
+        self.lenta = ThreadingHTTPServer(("127.0.0.1", 0), _Gotejador)
+        self.lenta.daemon_threads = True; self.lenta.abertas = 0; self.lenta.parar = threading.Event()
+        threading.Thread(target=self.lenta.serve_forever, daemon=True).start()
+        self.url_lenta = f"http://127.0.0.1:{self.lenta.server_address[1]}/feed"
+
+    def tearDown(self):
+        self.lenta.parar.set(); self.lenta.shutdown(); self.lenta.server_close()
+        self.rapida.__exit__()
+
+    def _esperar(self, condicao, limite=3.0):
+        prazo = time.monotonic() + limite
+        while not condicao() and time.monotonic() < prazo: time.sleep(0.02)
+        return condicao()
+
+    def test_fonte_lenta_fica_de_fora_e_e_cancelada(self):
+        baixador = workers.BaixadorNoticias(url_feed=[{'url': self.url_rapida}, {'url': self.url_lenta, 'tempo_maximo': 0.5}])
+        inicio = time.monotonic()
+        diff = baixador.run()
+        self.assertLess(time.monotonic() - inicio, 2)
+        self.assertEqual([registro['titulo'] for registro in diff['adicionadas']], ["Notícia rápida"])
+        # A conexão da fonte cancelada é encerrada logo, não no TIMEOUT_LEITURA.
+        self.assertTrue(self._esperar(lambda: self.lenta.abertas == 0))
+
+    def test_rodadas_seguidas_nao_acumulam_threads(self):
+        baixador = workers.BaixadorNoticias(url_feed=[{'url': self.url_rapida}, {'url': self.url_lenta, 'tempo_maximo': 0.3}])
+        for _ in range(4): baixador.run()
+        self.assertTrue(self._esperar(lambda: self.lenta.abertas == 0))
+        threads_feed = [thread for thread in threading.enumerate() if thread.name.startswith("feed")]
+        self.assertEqual(len(threads_feed), workers.LEITURAS_SIMULTANEAS_FEED)
+
+    def test_leitura_cancelada_antes_de_comecar_nao_acessa_a_rede(self):
+        cancelamento = workers.CancelamentoLeitura(); cancelamento.cancelar()
+        requisicoes = self.rapida.requisicoes
+        self.assertIsNone(workers.ler_fonte({'url': self.url_rapida, 'limite': 6}, workers.EstadoFonte(), cancelamento))
+        self.assertEqual(self.rapida.requisicoes, requisicoes)
+
+if __name__ == "__main__":
+    unittest.main()
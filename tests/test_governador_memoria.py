@@ -0,0 +1,85 @@
+# tests/test_governador_memoria.py
+#
+# Decisão de reciclagem do GovernadorMemoria com leituras de memória injetadas: só o renderizador
+# conta para o teto; o processo do painel é apenas informado.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import types
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+try:
+    import navegador
+except ImportError:
+    # Sem as bibliotecas do Chromium o QtWebEngineCore não carrega; a decisão testada aqui não usa
+    # nenhuma das suas classes, então basta um módulo com os nomes importados por navegador.py.
+    falso = types.ModuleType("PyQt6.QtWebEngineCore")
+    falso.QWebEngineProfile = falso.QWebEnginePage = object
+    with mock.patch.dict(sys.modules, {"PyQt6.QtWebEngineCore": falso}):
+        import navegador
+
+PID_RENDERIZADOR = 4321
+MB = 2**20
+
+class ViewFalsa:
+    def __init__(self, visivel=False):
+        self.visivel = visivel
+    def page(self):
+        return types.SimpleNamespace(renderProcessPid=lambda: PID_RENDERIZADOR)
+    def isVisible(self):
+        return self.visivel
+
+class TestDecisaoReciclagem(unittest.TestCase):
+    def governador(self, view, painel, renderizador):
+        leituras = {os.getpid(): painel, PID_RENDERIZADOR: renderizador}
+        governador = navegador.GovernadorMemoria(lambda: view, medir_memoria=leituras.get)
+        governador.timer_amostragem.stop()
+        self.reciclagens = []
+        governador.reciclagem_necessaria.connect(lambda: self.reciclagens.append(True))
+        return governador
+
+    def test_painel_acima_do_teto_nao_recicla(self):
+        governador = self.governador(ViewFalsa(), navegador.TETO_MEMORIA_WEB * 3, 200 * MB)
+        amostra = governador.amostrar()
+        self.assertEqual(self.reciclagens, [])
+        self.assertEqual(amostra, {'navegador': navegador.TETO_MEMORIA_WEB * 3, 'renderizador': 200 * MB})
+
+    def test_renderizador_acima_do_teto_recicla(self):
+        governador = self.governador(ViewFalsa(), 100 * MB, navegador.TETO_MEMORIA_WEB + 1)
+        governador.amostrar()
+        self.assertEqual(self.reciclagens, [True])
+
+    def test_renderizador_no_teto_nao_recicla(self):
+        governador = self.governador(ViewFalsa(), 100 * MB, navegador.TETO_MEMORIA_WEB)
+        governador.amostrar()
+        self.assertEqual(self.reciclagens, [])
+
+    def test_pagina_visivel_adia_a_reciclagem(self):
+        governador = self.governador(ViewFalsa(visivel=True), 100 * MB, navegador.TETO_MEMORIA_WEB + 1)
+        governador.amostrar()
+        self.assertEqual(self.reciclagens, [])
+        self.assertTrue(governador.reciclagem_pendente)
+
+    def test_sem_webengine_nao_mede_renderizador(self):
+        governador = self.governador(None, navegador.TETO_MEMORIA_WEB * 3, None)
+        amostra = governador.amostrar()
+        self.assertEqual(amostra['renderizador'], 0)
+        self.assertEqual(self.reciclagens, [])
+
+    def test_leitura_indisponivel_nao_recicla(self):
+        governador = self.governador(ViewFalsa(), None, None)
+        governador.amostrar()
+        self.assertEqual(self.reciclagens, [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/test_loja_avisos.py
+#
+# Sincronização incremental dos avisos: a LojaAvisos aplica a lista completa ou só as diferenças,
+# converte de novo apenas o que mudou e tira do índice os avisos removidos ou expirados.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import unittest
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import workers
+from workers import BaixadorAvisos, LojaAvisos
+
+AGORA = datetime(2026, 10, 18, 12, 0)
+
+def aviso(id_, titulo, inicio="2026-10-18 08:00", fim="2026-10-18 18:00", **extras):
+    return {'id': id_, 'titulo': titulo, 'url_imagem': f"http://avisos.exemplo/{id_}.jpg",
+            'data_inicio': inicio, 'data_fim': fim, **extras}
+
+def titulos(loja):
+    return [registro['titulo'] for registro in loja.vigentes(AGORA)]
+
+class TestLojaAvisos(unittest.TestCase):
+    def setUp(self):
+        self.loja = LojaAvisos()
+        self.loja.aplicar_lista([aviso(1, "A", inicio="2026-10-18 09:00"), aviso(2, "B"), aviso(3, "C", inicio="2026-10-18 07:00")], AGORA)
+
+    def test_lista_completa_inicial(self):
+        self.assertEqual(titulos(self.loja), ["A", "B", "C"])
+        self.assertEqual(self.loja.ultima_sincronizacao, {'inseridos': 3, 'atualizados': 0, 'removidos': 0})
+
+    def test_delta_insere_atualiza_e_remove(self):
+        self.loja.aplicar_delta([aviso(2, "B revisado"), aviso(4, "D", inicio="2026-10-18 10:00")], [3], AGORA)
+        self.assertEqual(self.loja.ultima_sincronizacao, {'inseridos': 1, 'atualizados': 1, 'removidos': 1})
+        self.assertEqual(titulos(self.loja), ["D", "A", "B revisado"])
+
+    def test_aviso_sem_mudanca_nao_e_convertido_de_novo(self):
+        with mock.patch.object(workers, "datetime", wraps=datetime) as relogio:
+            self.loja.aplicar_lista([aviso(1, "A", inicio="2026-10-18 09:00"), aviso(2, "B")], AGORA)
+        relogio.strptime.assert_not_called()
+        self.assertEqual(self.loja.ultima_sincronizacao, {'inseridos': 0, 'atualizados': 0, 'removidos': 1})
+        self.assertEqual(titulos(self.loja), ["A", "B"])
+
+    def test_expirado_sai_do_indice_e_nao_volta_a_contar(self):
+        vencido = aviso(5, "E", inicio="2026-10-17 08:00", fim="2026-10-17 18:00")
+        self.loja.aplicar_delta([vencido], [], AGORA)
+        self.assertNotIn(5, self.loja.registros)
+        self.assertIn(5, self.loja.expirados)
+        self.loja.aplicar_delta([vencido], [], AGORA)
+        self.assertEqual(self.loja.ultima_sincronizacao, {'inseridos': 0, 'atualizados': 0, 'removidos': 0})
+
+    def test_aviso_de_tela_especifica_fica_fora_dos_gerais(self):
+        self.loja.aplicar_delta([aviso(6, "Só no bloco B", targetScreens=["bloco-b"])], [], AGORA)
+        self.assertIn(6, self.loja.registros)
+        self.assertNotIn("Só no bloco B", titulos(self.loja))
+
+class TestConsultaIncremental(unittest.TestCase):
+    def test_cursor_vai_no_parametro_de_consulta(self):
+        baixador = BaixadorAvisos()
+        with mock.patch.object(workers, "URL_AVISOS", "http://api.exemplo/avisos"):
+            self.assertEqual(baixador._url(), "http://api.exemplo/avisos")
+            baixador.loja.cursor = "2026-10-18T12:00:00"
+            self.assertEqual(baixador._url(), f"http://api.exemplo/avisos?{workers.PARAMETRO_AVISOS_DESDE}=2026-10-18T12%3A00%3A00")
+            baixador.loja.incremental = False
+            self.assertEqual(baixador._url(), "http://api.exemplo/avisos")
+
+if __name__ == "__main__":
+    unittest.main()
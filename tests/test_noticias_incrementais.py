@@ -0,0 +1,89 @@
+# tests/test_noticias_incrementais.py
+#
+# Atualização condicional e incremental do feed: 304 não gera trabalho, e só as entradas novas ou
+# com nova marca de atualização são processadas de novo.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import workers
+from workers import BaixadorNoticias
+
+def item(guid: str, data: str) -> str:
+    return (f"<item><title>Notícia {guid}</title><link>http://fct.exemplo/{guid}</link><guid>{guid}</guid>"
+            f"<pubDate>{data}</pubDate><description>Texto da notícia {guid}.</description></item>")
+
+def feed(*itens) -> bytes:
+    return ('<?xml version="1.0" encoding="UTF-8"?><rss version="2.0"><channel><title>FCT</title>'
+            + "".join(itens) + "</channel></rss>").encode("utf-8")
+
+SEG = "Mon, 05 Oct 2026 10:00:00 +0000"
+TER = "Tue, 06 Oct 2026 10:00:00 +0000"
+
+class _Feed(BaseHTTPRequestHandler):
+    """Serve `servidor.corpo` com ETag `servidor.etag`, respondendo 304 ao validador atual."""
+    protocol_version = "HTTP/1.1"
+    def do_GET(self):
+        servidor = self.server; servidor.pedidos.append(self.headers.get("If-None-Match"))
+        if self.headers.get("If-None-Match") == servidor.etag:
+            self.send_response(304); self.send_header("ETag", servidor.etag); self.send_header("Content-Length", "0")
+            self.end_headers(); return
+        self.send_response(200); self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", servidor.etag); self.send_header("Content-Length", str(len(servidor.corpo)))
+        self.end_headers(); self.wfile.write(servidor.corpo)
+    def log_message(self, *args): pass
+
+class TestFeedIncremental(unittest.TestCase):
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Feed); self.servidor.daemon_threads = True
+        self.servidor.pedidos = []
+        self.publicar('"v1"', item("a", SEG), item("b", SEG), item("c", SEG))
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        url = f"http://127.0.0.1:{self.servidor.server_address[1]}/feed"
+        self.url = mock.patch.object(workers, "URL_FEED", url); self.url.start()
+        self.baixador = BaixadorNoticias()
+
+    def tearDown(self):
+        self.url.stop()
+        self.servidor.shutdown(); self.servidor.server_close()
+
+    def publicar(self, etag: str, *itens):
+        self.servidor.etag, self.servidor.corpo = etag, feed(*itens)
+
+    def test_primeira_leitura_adiciona_tudo(self):
+        diff = self.baixador.run()
+        self.assertEqual([r['guid'] for r in diff['adicionadas']], ["a", "b", "c"])
+        self.assertEqual(diff['ordem'], ["a", "b", "c"])
+        self.assertEqual((diff['alteradas'], diff['removidas'], diff['inalterado']), ([], [], False))
+
+    def test_feed_inalterado_responde_304(self):
+        self.baixador.run()
+        with mock.patch.object(workers, "processar_entrada_feed") as processar:
+            diff = self.baixador.run()
+        self.assertEqual(self.servidor.pedidos, [None, '"v1"'])
+        self.assertTrue(diff['inalterado'])
+        self.assertEqual(diff['ordem'], ["a", "b", "c"])
+        processar.assert_not_called()
+
+    def test_so_as_entradas_novas_ou_alteradas_sao_processadas(self):
+        self.baixador.run()
+        self.publicar('"v2"', item("d", TER), item("a", SEG), item("b", TER))
+        with mock.patch.object(workers, "processar_entrada_feed", wraps=workers.processar_entrada_feed) as processar:
+            diff = self.baixador.run()
+        self.assertEqual(processar.call_count, 2)
+        self.assertEqual([r['guid'] for r in diff['adicionadas']], ["d"])
+        self.assertEqual([r['guid'] for r in diff['alteradas']], ["b"])
+        self.assertEqual(diff['removidas'], ["c"])
+        # A ordem de exibição segue a data de publicação: "b" passou a ser de terça.
+        self.assertEqual(diff['ordem'], ["d", "b", "a"])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,41 @@
+# tests/test_qr.py
+#
+# O QR Code gerado pelo trabalhador ao receber a notícia é o mesmo que a interface pede ao exibir o
+# slide: as duas chamadas precisam cair na mesma entrada do cache.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+from config import TAMANHO_QR_CODE
+from utils import gerar_imagem_qr, criar_qr_code
+
+LINK = "https://fct.ufg.br/n/1-noticia-de-exemplo"
+
+class TestCacheQR(unittest.TestCase):
+    def setUp(self):
+        gerar_imagem_qr.cache_clear()
+
+    def test_interface_acerta_o_cache_aquecido_pelo_trabalhador(self):
+        gerar_imagem_qr(LINK)
+        pixmap = criar_qr_code(LINK)
+        info = gerar_imagem_qr.cache_info()
+        self.assertEqual((info.misses, info.hits, info.currsize), (1, 1, 1))
+        self.assertEqual((pixmap.width(), pixmap.height()), (TAMANHO_QR_CODE, TAMANHO_QR_CODE))
+
+    def test_argumentos_explicitos_iguais_aos_padroes_compartilham_a_entrada(self):
+        gerar_imagem_qr(LINK, TAMANHO_QR_CODE)
+        gerar_imagem_qr(LINK)
+        self.assertEqual(gerar_imagem_qr.cache_info().currsize, 1)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+# tests/test_rede.py
+#
+# Conexões da sessão compartilhada: o cache de DNS guarda todos os endereços do nome e cada um é
+# tentado na ordem, como o urllib3 faria sem o cache.
+#
+# Uso: python -m unittest discover -s tests
+
+import os
+import socket
+import sys
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+
+import rede
+
+HOST = "painel.teste"
+_getaddrinfo = socket.getaddrinfo
+
+class _Ok(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    def do_GET(self):
+        self.send_response(200); self.send_header("Content-Type", "text/plain"); self.send_header("Content-Length", "2")
+        self.end_headers(); self.wfile.write(b"ok")
+    def log_message(self, *args): pass
+
+class TestConexaoComVariosEnderecos(unittest.TestCase):
+    def setUp(self):
+        rede._cache_dns.clear()
+        self.servidor = ThreadingHTTPServer(("127.0.0.1", 0), _Ok); self.servidor.daemon_threads = True
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.porta = self.servidor.server_address[1]
+        self.consultas = 0
+
+    def tearDown(self):
+        self.servidor.shutdown(); self.servidor.server_close()
+        rede._cache_dns.clear()
+
+    def _resolucao_falsa(self, enderecos):
+        """getaddrinfo que responde `enderecos` para HOST e delega os demais nomes ao original."""
+        def getaddrinfo(host, porta, *args, **kwargs):
+            if host != HOST: return _getaddrinfo(host, porta, *args, **kwargs)
+            self.consultas += 1
+            return [(familia, socket.SOCK_STREAM, socket.IPPROTO_TCP, "", (ip, porta) + extra) for familia, ip, extra in enderecos]
+        return mock.patch.object(socket, "getaddrinfo", side_effect=getaddrinfo)
+
+    def test_primeiro_endereco_inacessivel_usa_o_seguinte(self):
+        # O servidor só escuta em 127.0.0.1: o IPv6 recusa (ou nem existe) e o IPv4 responde.
+        with self._resolucao_falsa([(socket.AF_INET6, "::1", (0, 0)), (socket.AF_INET, "127.0.0.1", ())]):
+            resposta = rede.requisitar(f"http://{HOST}:{self.porta}/ok")
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.content, b"ok")
+
+    def test_resolucao_reaproveitada(self):
+        with self._resolucao_falsa([(socket.AF_INET, "127.0.0.1", ())]):
+            for _ in range(2):
+                rede.requisitar(f"http://{HOST}:{self.porta}/ok", {"Connection": "close"})
+        self.assertEqual(self.consultas, 1)
+
+    def test_nenhum_endereco_acessivel_esquece_o_nome(self):
+        with self._resolucao_falsa([(socket.AF_INET, "127.0.0.2", ())]):
+            with self.assertRaises(requests.ConnectionError):
+                rede.requisitar(f"http://{HOST}:{self.porta}/ok")
+        self.assertNotIn((HOST, self.porta), rede._cache_dns)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,115 @@
+# tests/test_retransmissor.py
+#
+# O retransmissor contra a origem simulada de benchmarks/servidor_local.py: notícias, avisos e
+# imagens reescritas para o próprio retransmissor, ETag/304 e a troca de uma imagem na mesma URL.
+#
+# Uso: python -m unittest discover -s tests
+
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import unittest
+from unittest import mock
+
+RAIZ = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, RAIZ)
+sys.path.insert(0, os.path.join(RAIZ, "benchmarks"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+import requests
+from PyQt6.QtCore import QBuffer, QIODevice
+from PyQt6.QtGui import QColor, QImage
+from PyQt6.QtWidgets import QApplication
+
+app = QApplication.instance() or QApplication(sys.argv)
+
+import retransmissor
+import workers
+from servidor_local import ServidorLocal
+
+def imagem_solida(cor: str, formato: str = "JPEG") -> bytes:
+    imagem = QImage(400, 300, QImage.Format.Format_RGB32); imagem.fill(QColor(cor))
+    buffer = QBuffer(); buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    imagem.save(buffer, formato, 90)
+    return bytes(buffer.data())
+
+def cor_central(dados: bytes) -> QColor:
+    imagem = QImage.fromData(dados)
+    return imagem.pixelColor(imagem.width() // 2, imagem.height() // 2)
+
+class TestRetransmissor(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.mkdtemp(prefix="teste-retransmissor-")
+        self.origem = ServidorLocal().__enter__()
+        self.url_imagem = self.origem.publicar("/imagens/noticia.jpg", imagem_solida("red"), "image/jpeg")
+        url_aviso = self.origem.publicar("/imagens/aviso.png", imagem_solida("green", "PNG"), "image/png")
+        feed = (f"<?xml version='1.0' encoding='UTF-8'?><rss version='2.0'><channel><title>FCT</title>"
+                f"<item><title>Notícia</title><link>https://fct.ufg.br/n/1</link><guid>n-1</guid>"
+                f"<pubDate>Mon, 06 Oct 2025 10:00:00 -0300</pubDate>"
+                f"<description><![CDATA[<p><img src=\"{self.url_imagem}\"/> Texto da notícia.</p>]]></description>"
+                f"</item></channel></rss>")
+        avisos = [{'id': 1, 'titulo': "Geral", 'url_imagem': url_aviso, 'data_inicio': "2025-01-01 00:00", 'data_fim': "2099-01-01 00:00"},
+                  {'id': 2, 'titulo': "Outra tela", 'url_imagem': url_aviso, 'targetScreens': ["biblioteca"],
+                   'data_inicio': "2025-01-01 00:00", 'data_fim': "2099-01-01 00:00"}]
+        url_feed = self.origem.publicar("/feed", feed.encode("utf-8"), "application/rss+xml")
+        url_avisos = self.origem.publicar("/avisos", json.dumps(avisos).encode("utf-8"), "application/json")
+        with mock.patch.object(retransmissor, "DIRETORIO_CACHE", self.diretorio):
+            self.retransmissor = retransmissor.Retransmissor(url_feed, url_avisos)
+        self.retransmissor.atualizar()
+        self.servidor = retransmissor.iniciar_servidor(self.retransmissor, 0, "127.0.0.1")
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.base = f"http://127.0.0.1:{self.servidor.server_address[1]}"
+
+    def tearDown(self):
+        self.servidor.shutdown(); self.servidor.server_close()
+        self.origem.__exit__()
+        shutil.rmtree(self.diretorio, ignore_errors=True)
+
+    def _url_imagem_noticia(self) -> str:
+        noticias = requests.get(f"{self.base}/noticias").json()['noticias']
+        self.assertEqual(len(noticias), 1)
+        return noticias[0]['url_imagem']
+
+    def test_noticias_apontam_para_o_retransmissor(self):
+        url = self._url_imagem_noticia()
+        self.assertTrue(url.startswith(f"{self.base}/imagens/"))
+        resposta = requests.get(url)
+        self.assertEqual(resposta.status_code, 200)
+        self.assertEqual(resposta.headers['Content-Type'], "image/jpeg")
+        self.assertGreater(cor_central(resposta.content).red(), 200)
+
+    def test_avisos_filtrados_por_tela(self):
+        self.assertEqual([aviso['id'] for aviso in requests.get(f"{self.base}/avisos?tela=recepcao").json()], [1])
+        self.assertEqual([aviso['id'] for aviso in requests.get(f"{self.base}/avisos?tela=biblioteca").json()], [1, 2])
+
+    def test_etag_e_304(self):
+        resposta = requests.get(f"{self.base}/noticias")
+        repetida = requests.get(f"{self.base}/noticias", headers={'If-None-Match': resposta.headers['ETag']})
+        self.assertEqual(repetida.status_code, 304)
+        self.assertEqual(requests.get(f"{self.base}/imagens/desconhecida").status_code, 404)
+
+    def test_imagem_trocada_na_mesma_url(self):
+        url = self._url_imagem_noticia()
+        antes = requests.get(url)
+        self.origem.publicar("/imagens/noticia.jpg", imagem_solida("blue"), "image/jpeg")
+        self.retransmissor.atualizar()
+        depois = requests.get(url, headers={'If-None-Match': antes.headers['ETag']})
+        self.assertEqual(depois.status_code, 200)
+        self.assertNotEqual(depois.headers['ETag'], antes.headers['ETag'])
+        self.assertGreater(cor_central(depois.content).blue(), 200)
+        # A versão antiga não fica ocupando o limite de memória das imagens prontas.
+        self.assertEqual(len(self.retransmissor.imagens_prontas), 2)
+
+    def test_nao_gera_qr_codes(self):
+        # Os painéis geram os próprios QR Codes; o retransmissor não os serve.
+        self.retransmissor.baixador_noticias.estado = workers.EstadoFeed()
+        with mock.patch.object(workers, "gerar_imagem_qr") as gerar:
+            self.retransmissor.atualizar()
+        self.assertEqual(len(self.retransmissor.noticias), 1)
+        gerar.assert_not_called()
+
+if __name__ == "__main__":
+    unittest.main()
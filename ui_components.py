@@ -1,69 +1,53 @@
 # ui_components.py
 
 import random
-from PyQt6.QtCore import (QUrl, QTimer, Qt, QTime, QDate, QLocale)
+import time
+from PyQt6.QtCore import (QUrl, QTimer, Qt, QTime, QDate, QLocale, pyqtSignal)
 from PyQt6.QtGui import (QPainter, QColor, QPixmap)
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QLabel, 
-                             QGraphicsDropShadowEffect, QSizePolicy, QStackedWidget)
+                             QSizePolicy, QStackedWidget)
 
-from config import INTERVALO_CARROSSEL
+import diagnostico
+from agenda_avisos import AgendaAvisos
+from cache import CachePixmaps, carregar_instantaneo, salvar_instantaneo
+from renderizacao import criar_sombra, renderizar_opaco, TransicaoCruzada
+from config import (INTERVALO_CARROSSEL, LIMITE_CACHE_PIXMAPS, ITENS_PRE_CARREGADOS, TAMANHO_QR_CODE,
+                    PRE_RENDERIZAR_SLIDES, DURACAO_TRANSICAO)
 from utils import criar_qr_code
-from workers import BaixadorNoticias, BaixadorAvisos, BaixadorImagem
+from workers import (BaixadorNoticias, BaixadorAvisos, baixar_imagem, obter_agendador,
+                     PRIORIDADE_VISIVEL, PRIORIDADE_PRE_CARREGAMENTO)
 
 class ClockWidget(QLabel):
+    """Data e hora do cabeçalho; update_time é chamado a cada virada de minuto pelo AgendadorEnergia."""
+    LOCALE_PT_BR = QLocale(QLocale.Language.Portuguese, QLocale.Country.Brazil)
+
     def __init__(self, parent=None):
         super().__init__(parent)
         self.setStyleSheet("color: white; font-size: 14pt; font-weight: bold;")
-        timer = QTimer(self); timer.timeout.connect(self.update_time); timer.start(1000)
         self.update_time()
 
     def update_time(self):
-        locale_pt_br = QLocale(QLocale.Language.Portuguese, QLocale.Country.Brazil)
-        data_str = locale_pt_br.toString(QDate.currentDate(), "dddd, dd 'de' MMMM 'de' yyyy")
+        data_str = self.LOCALE_PT_BR.toString(QDate.currentDate(), "dddd, dd 'de' MMMM 'de' yyyy")
         hora_str = QTime.currentTime().toString("HH:mm")
         self.setText(f"{data_str.capitalize()} | {hora_str}")
 
-class CarrosselNoticias(QWidget):
+class QuadroSlide(QStackedWidget):
+    """Páginas de notícia e de aviso do carrossel, com os rótulos de um item.
+
+    O carrossel tem dois: o visível e um oculto, onde o próximo item é montado e renderizado.
+    """
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.entradas_noticias = []
-        self.entradas_avisos = []
-        self.conteudo_combinado = []
-        self.indice_atual = 0
-        self.noticias_carregadas = False
-        self.avisos_carregados = False
-        self.baixador_imagem_thread = None
-
-        self.setStyleSheet("""
-            #container_noticia, #container_aviso { background-color: #ffffff; border-radius: 15px; }
-            #titulo { font-size: 22pt; font-weight: bold; color: #005a9e; }
-            #data { font-size: 12pt; color: #555555; font-style: italic; }
-            #descricao { font-size: 16pt; color: #333333; }
-            #imagem_placeholder { background-color: #eeeeee; border-radius: 10px; }
-        """)
-
-        main_layout = QVBoxLayout(self)
-        main_layout.setContentsMargins(30, 30, 30, 30)
-        
-        self.display_stack = QStackedWidget()
-        main_layout.addWidget(self.display_stack, 1)
-
         self.widget_noticia = self._criar_widget_noticia()
-        self.display_stack.addWidget(self.widget_noticia)
+        self.addWidget(self.widget_noticia)
         self.widget_aviso = self._criar_widget_aviso()
-        self.display_stack.addWidget(self.widget_aviso)
-        
-        self.timer_carrossel = QTimer(self)
-        self.timer_carrossel.timeout.connect(self.proximo_item)
-        
-        self.atualizar_conteudo()
+        self.addWidget(self.widget_aviso)
 
     def _criar_widget_noticia(self):
         container_noticia = QWidget(objectName="container_noticia")
         layout_noticias = QHBoxLayout(container_noticia)
         layout_noticias.setContentsMargins(40, 40, 40, 40); layout_noticias.setSpacing(40)
-        shadow = QGraphicsDropShadowEffect(self); shadow.setBlurRadius(25); shadow.setXOffset(0); shadow.setYOffset(5); shadow.setColor(QColor(0, 0, 0, 60))
-        container_noticia.setGraphicsEffect(shadow)
+        container_noticia.setGraphicsEffect(criar_sombra(25, QColor(0, 0, 0, 60), (0, 5), 15, self))
         self.rotulo_imagem_noticia = QLabel("Carregando..."); self.rotulo_imagem_noticia.setObjectName("imagem_placeholder"); self.rotulo_imagem_noticia.setAlignment(Qt.AlignmentFlag.AlignCenter); self.rotulo_imagem_noticia.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding)
         container_texto = QWidget(); container_texto.setStyleSheet("background: transparent;")
         layout_texto = QVBoxLayout(container_texto)
@@ -71,7 +55,7 @@ class CarrosselNoticias(QWidget):
         self.rotulo_data = QLabel("", objectName="data"); self.rotulo_data.setWordWrap(True)
         self.rotulo_descricao = QLabel("", objectName="descricao"); self.rotulo_descricao.setWordWrap(True); self.rotulo_descricao.setAlignment(Qt.AlignmentFlag.AlignJustify)
         container_qr = QWidget(); layout_qr = QHBoxLayout(container_qr); layout_qr.setContentsMargins(0, 0, 0, 0)
-        self.rotulo_qr = QLabel(); self.rotulo_qr.setFixedSize(150, 150)
+        self.rotulo_qr = QLabel(); self.rotulo_qr.setFixedSize(TAMANHO_QR_CODE, TAMANHO_QR_CODE)
         layout_qr.addStretch(); layout_qr.addWidget(self.rotulo_qr)
         layout_texto.addWidget(self.rotulo_titulo); layout_texto.addSpacing(10); layout_texto.addWidget(self.rotulo_data); layout_texto.addSpacing(25); layout_texto.addWidget(self.rotulo_descricao); layout_texto.addStretch(1); layout_texto.addWidget(container_qr)
         layout_noticias.addWidget(self.rotulo_imagem_noticia, 2); layout_noticias.addWidget(container_texto, 3)
@@ -81,38 +65,189 @@ class CarrosselNoticias(QWidget):
         container_aviso = QWidget(objectName="container_aviso")
         layout = QVBoxLayout(container_aviso)
         layout.setContentsMargins(15, 15, 15, 15)
-        shadow = QGraphicsDropShadowEffect(self); shadow.setBlurRadius(25); shadow.setXOffset(0); shadow.setYOffset(5); shadow.setColor(QColor(0, 0, 0, 60))
-        container_aviso.setGraphicsEffect(shadow)
+        container_aviso.setGraphicsEffect(criar_sombra(25, QColor(0, 0, 0, 60), (0, 5), 15, self))
         self.rotulo_imagem_aviso = QLabel("Carregando aviso..."); self.rotulo_imagem_aviso.setAlignment(Qt.AlignmentFlag.AlignCenter); self.rotulo_imagem_aviso.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding); self.rotulo_imagem_aviso.setStyleSheet("background-color: transparent;")
         layout.addWidget(self.rotulo_imagem_aviso)
         return container_aviso
-    
+
+    def preencher(self, item):
+        """Seleciona a página do item e preenche seus textos; a imagem é tratada à parte."""
+        if item['type'] == 'noticia':
+            self.setCurrentWidget(self.widget_noticia)
+            self.rotulo_titulo.setText(item['titulo']); self.rotulo_data.setText(item.get('data', ''))
+            desc_html = item['descricao']
+            if desc_html.endswith("... - "): desc_html += "<i>Leia a notícia completa no QR Code abaixo.</i>"
+            self.rotulo_descricao.setText(desc_html); self.rotulo_qr.setPixmap(criar_qr_code(item['link']) if item['link'] else QPixmap())
+        elif item['type'] == 'aviso':
+            self.setCurrentWidget(self.widget_aviso)
+
+    def rotulo_imagem(self, item) -> QLabel:
+        return self.rotulo_imagem_noticia if item['type'] == 'noticia' else self.rotulo_imagem_aviso
+
+    def exibir_imagem(self, item, pixmap):
+        """Exibe no rótulo do item um pixmap já escalado, ou o texto de ausência de imagem."""
+        rotulo = self.rotulo_imagem(item)
+        if not pixmap.isNull():
+            rotulo.setPixmap(pixmap)
+        else:
+            rotulo.setText("Sem imagem" if item['type'] == 'noticia' else "Imagem não disponível")
+
+    def exibir_carregando(self, item):
+        if item['type'] == 'noticia': self.rotulo_imagem_noticia.setText("Carregando Imagem...")
+        else: self.rotulo_imagem_aviso.setText(f"Carregando: {item.get('titulo', 'Aviso')}")
+
+class CarrosselNoticias(QWidget):
+    imagem_parcial = pyqtSignal(object, object)  # (chave, QImage) emitido pelo trabalhador durante o download
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.imagem_parcial.connect(self._quando_imagem_parcial)
+        self.entradas_noticias = []
+        self.entradas_avisos = []
+        self.conteudo_combinado = []
+        self.indice_atual = -1
+        self.noticias_carregadas = False
+        self.avisos_carregados = False
+        self.cache_pixmaps = CachePixmaps(LIMITE_CACHE_PIXMAPS)
+        self.agendador = obter_agendador()
+        self.imagens_solicitadas = set()  # urls com download agendado por este carrossel
+        self.quadro_preparado = None  # (item, tamanho, pixmap) do próximo item, renderizado fora da tela
+        self.quadro_exibido = None  # pixmap idêntico ao que está na tela, ponto de partida da transição
+        self.item_pendente = None  # item exibido pela sobreposição, ainda por aplicar aos widgets reais
+        self.motivos_pausa = {"oculto"}  # o carrossel só gira visível e fora do repouso noturno
+
+        self.setStyleSheet("""
+            #container_noticia, #container_aviso { background-color: #ffffff; border-radius: 15px; }
+            #titulo { font-size: 22pt; font-weight: bold; color: #005a9e; }
+            #data { font-size: 12pt; color: #555555; font-style: italic; }
+            #descricao { font-size: 16pt; color: #333333; }
+            #imagem_placeholder { background-color: #eeeeee; border-radius: 10px; }
+        """)
+
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(30, 30, 30, 30)
+        
+        self.display_stack = QuadroSlide()
+        main_layout.addWidget(self.display_stack, 1)
+        # O próximo item é montado num quadro igual, oculto, e vai para a tela como uma imagem pronta.
+        self.quadro_oculto = QuadroSlide(self); self.quadro_oculto.hide()
+        self.transicao = TransicaoCruzada(self); self.transicao.concluida.connect(self._concluir_transicao)
+        
+        self.timer_carrossel = QTimer(self)
+        self.timer_carrossel.timeout.connect(self.proximo_item)
+        self.timer_reescala = QTimer(self); self.timer_reescala.setSingleShot(True); self.timer_reescala.setInterval(200)
+        self.timer_reescala.timeout.connect(self._reescalar_imagem_atual)
+        # Preparar o próximo item fica para depois da troca (e da transição) já ter ido para a tela.
+        self.timer_preparo = QTimer(self); self.timer_preparo.setSingleShot(True); self.timer_preparo.setInterval(DURACAO_TRANSICAO + 600)
+        self.timer_preparo.timeout.connect(self._preparar_proximo)
+
+        self.baixador_noticias = BaixadorNoticias(self); self.baixador_noticias.noticias_prontas.connect(self.quando_noticias_prontas); self.baixador_noticias.falhou.connect(self.quando_noticias_falharem)
+        self.agenda_avisos = AgendaAvisos(self); self.agenda_avisos.vigentes_mudaram.connect(self.quando_avisos_vigentes_mudarem)
+        self.baixador_avisos = BaixadorAvisos(self); self.baixador_avisos.avisos_prontos.connect(self.quando_avisos_prontos); self.baixador_avisos.falhou.connect(self.quando_avisos_falharem)
+
+        # Exibe o último conteúdo salvo já no primeiro quadro e revalida em segundo plano.
+        self._restaurar_instantaneo()
+        self.atualizar_conteudo()
+
+    def _restaurar_instantaneo(self):
+        itens = carregar_instantaneo()
+        if not itens: return
+        # Os avisos salvos também entram na agenda: sem rede, eles ainda saem da tela no horário.
+        self.entradas_avisos = self.agenda_avisos.programar([item for item in itens if item['type'] == 'aviso'])
+        self.entradas_noticias = [item for item in itens if item['type'] == 'noticia']
+        self._aplicar_conteudo(self.entradas_avisos + self.entradas_noticias)
+
     def atualizar_conteudo(self):
-        self.timer_carrossel.stop()
+        # O carrossel segue girando com o conteúdo atual enquanto a atualização acontece.
         self.noticias_carregadas = False; self.avisos_carregados = False
-        self.baixador_noticias = BaixadorNoticias(); self.baixador_noticias.noticias_prontas.connect(self.quando_noticias_prontas); self.baixador_noticias.start()
-        self.baixador_avisos = BaixadorAvisos(); self.baixador_avisos.avisos_prontos.connect(self.quando_avisos_prontos); self.baixador_avisos.start()
+        self.atualizacao_com_sucesso = False
+        self.baixador_noticias.start()
+        self.baixador_avisos.start()
+
+    def quando_noticias_prontas(self, diff):
+        por_guid = {entrada['guid']: entrada for entrada in self.entradas_noticias}
+        for guid in diff['removidas']: por_guid.pop(guid, None)
+        for registro in diff['adicionadas'] + diff['alteradas']: por_guid[registro['guid']] = registro
+        self.entradas_noticias = [por_guid[guid] for guid in diff['ordem'] if guid in por_guid]
+        self.noticias_carregadas = True; self.atualizacao_com_sucesso = True
+        self.tentar_combinar_conteudo()
 
-    def quando_noticias_prontas(self, entradas):
-        self.entradas_noticias = entradas; self.noticias_carregadas = True
+    def quando_noticias_falharem(self):
+        self.noticias_carregadas = True
         self.tentar_combinar_conteudo()
 
-    def quando_avisos_prontos(self, entradas):
-        self.entradas_avisos = entradas; self.avisos_carregados = True
+    def quando_avisos_prontos(self, programados):
+        self.entradas_avisos = self.agenda_avisos.programar(programados); self.avisos_carregados = True; self.atualizacao_com_sucesso = True
+        self.tentar_combinar_conteudo()
+
+    def quando_avisos_vigentes_mudarem(self, vigentes):
+        """Um aviso entrou ou saiu do período de exibição: atualiza a lista na hora, sem consultar a API."""
+        self.entradas_avisos = vigentes
+        self._combinar_conteudo(salvar=True)
+
+    def quando_avisos_falharem(self):
+        self.avisos_carregados = True
         self.tentar_combinar_conteudo()
 
     def tentar_combinar_conteudo(self):
         if self.noticias_carregadas and self.avisos_carregados:
-            self.conteudo_combinado = self.entradas_avisos + self.entradas_noticias
-            
-            if not self.conteudo_combinado:
-                self.display_stack.setCurrentWidget(self.widget_noticia)
-                self.rotulo_titulo.setText("Sem conteúdo para exibir"); self.rotulo_descricao.setText("Não foram encontradas notícias ou avisos válidos no momento."); self.rotulo_imagem_noticia.setText("")
-                return
-                
+            # Falhas mantêm as entradas anteriores; só conteúdo obtido da rede atualiza o instantâneo.
+            self._combinar_conteudo(salvar=self.atualizacao_com_sucesso)
+
+    def _combinar_conteudo(self, salvar=False):
+        conteudo = self.entradas_avisos + self.entradas_noticias
+
+        if not conteudo:
+            self.conteudo_combinado = []; self._cancelar_imagens_obsoletas(); self.timer_carrossel.stop()
+            self._concluir_transicao(); self.quadro_preparado = self.quadro_exibido = None
+            quadro = self.display_stack; quadro.setCurrentWidget(quadro.widget_noticia)
+            quadro.rotulo_titulo.setText("Sem conteúdo para exibir"); quadro.rotulo_descricao.setText("Não foram encontradas notícias ou avisos válidos no momento."); quadro.rotulo_imagem_noticia.setText("")
+            return
+
+        # O instantâneo leva também os avisos futuros, para que entrem no horário mesmo sem rede.
+        if salvar: salvar_instantaneo(self.agenda_avisos.programados + self.entradas_noticias)
+        self._aplicar_conteudo(conteudo)
+
+    @staticmethod
+    def _chave_item(item):
+        return item.get('guid') if item['type'] == 'noticia' else ('aviso', item.get('url_imagem'), item.get('titulo'))
+
+    def _aplicar_conteudo(self, conteudo):
+        """Troca a lista exibida sem reiniciar o carrossel quando o item atual continua presente."""
+        item_atual = self.conteudo_combinado[self.indice_atual] if self.conteudo_combinado and self.indice_atual >= 0 else None
+        self.conteudo_combinado = conteudo
+        self._cancelar_imagens_obsoletas()
+        chaves = [self._chave_item(item) for item in conteudo]
+        if item_atual is not None and self._chave_item(item_atual) in chaves:
+            self.indice_atual = chaves.index(self._chave_item(item_atual))
+            if conteudo[self.indice_atual] != item_atual: self.exibir_item_atual()
+        else:
             self.indice_atual = -1
             self.proximo_item()
-            self.timer_carrossel.start(INTERVALO_CARROSSEL * 1000)
+            self._reiniciar_timer_carrossel()
+        if not self.timer_carrossel.isActive(): self._reiniciar_timer_carrossel()
+
+    def _reiniciar_timer_carrossel(self):
+        if not self.motivos_pausa: self.timer_carrossel.start(INTERVALO_CARROSSEL * 1000)
+
+    def pausar(self, motivo: str):
+        """Para a rotação (e a preparação do próximo item) enquanto houver algum motivo de pausa."""
+        self.motivos_pausa.add(motivo)
+        self.timer_carrossel.stop(); self.timer_preparo.stop()
+        self._concluir_transicao()
+
+    def retomar(self, motivo: str):
+        self.motivos_pausa.discard(motivo)
+        if self.conteudo_combinado and not self.timer_carrossel.isActive(): self._reiniciar_timer_carrossel()
+
+    def showEvent(self, evento):
+        super().showEvent(evento)
+        self.retomar("oculto")
+
+    def hideEvent(self, evento):
+        # Coberto pelo navegador: não há por que trocar itens que ninguém vê.
+        super().hideEvent(evento)
+        self.pausar("oculto")
     
     def proximo_item(self):
         if self.conteudo_combinado:
@@ -121,36 +256,125 @@ class CarrosselNoticias(QWidget):
 
     def exibir_item_atual(self):
         if not self.conteudo_combinado: return
-        if self.baixador_imagem_thread and self.baixador_imagem_thread.isRunning(): self.baixador_imagem_thread.terminate()
+        diagnostico.marcar("conteudo_exibido")
+        inicio = time.perf_counter()
+        self._concluir_transicao()
         item_atual = self.conteudo_combinado[self.indice_atual]
-        self.baixador_imagem_thread = BaixadorImagem(item_atual.get('url_imagem'))
-        if item_atual['type'] == 'noticia':
-            self.display_stack.setCurrentWidget(self.widget_noticia)
-            self.rotulo_titulo.setText(item_atual['titulo']); self.rotulo_data.setText(item_atual.get('data', ''))
-            desc_html = item_atual['descricao']
-            if desc_html.endswith("... - "): desc_html += "<i>Leia a notícia completa no QR Code abaixo.</i>"
-            self.rotulo_descricao.setText(desc_html); self.rotulo_qr.setPixmap(criar_qr_code(item_atual['link']) if item_atual['link'] else QPixmap())
-            self.rotulo_imagem_noticia.setText("Carregando Imagem...")
-            self.baixador_imagem_thread.imagem_pronta.connect(self.exibir_imagem_noticia)
-        elif item_atual['type'] == 'aviso':
-            self.display_stack.setCurrentWidget(self.widget_aviso)
-            self.rotulo_imagem_aviso.setText(f"Carregando: {item_atual.get('titulo', 'Aviso')}")
-            self.baixador_imagem_thread.imagem_pronta.connect(self.exibir_imagem_aviso)
-        self.baixador_imagem_thread.start()
-
-    def exibir_imagem_noticia(self, pixmap):
-        if not pixmap.isNull():
-            img = pixmap.scaled(self.rotulo_imagem_noticia.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.rotulo_imagem_noticia.setPixmap(img)
+        quadro = self._quadro_pronto(item_atual)
+        if quadro is not None:
+            # A troca é só a cópia do quadro pronto; os widgets reais recebem o item ao fim da transição.
+            anterior = (self.quadro_exibido or renderizar_opaco(self.display_stack)) if DURACAO_TRANSICAO > 0 else None
+            self.transicao.iniciar(self.display_stack.geometry(), quadro, anterior, DURACAO_TRANSICAO)
+            self.item_pendente = item_atual; self.quadro_exibido = quadro
         else:
-            self.rotulo_imagem_noticia.setText("Sem imagem")
+            self._preencher_quadro_visivel(item_atual); self.quadro_exibido = None
+        modo = "pre_renderizada" if quadro is not None else "direta"
+        diagnostico.medir_quadro(f"troca de item ({modo})", inicio, 'painel_troca_item_segundos', modo=modo)
+        self._pre_carregar_proximos()
+        self.timer_preparo.start()
 
-    def exibir_imagem_aviso(self, pixmap):
-        if not pixmap.isNull():
-            img = pixmap.scaled(self.rotulo_imagem_aviso.size(), Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            self.rotulo_imagem_aviso.setPixmap(img)
+    def _preencher_quadro_visivel(self, item):
+        """Atualiza direto os widgets da tela com o item (caminho sem pré-renderização)."""
+        self.display_stack.preencher(item)
+        pixmap = self.cache_pixmaps.obter(self._chave_imagem(item))
+        if pixmap is not None:
+            self._rotulo_imagem(item).setPixmap(pixmap)
+        elif not item.get('url_imagem'):
+            self.display_stack.exibir_imagem(item, QPixmap())
+        else:
+            self.display_stack.exibir_carregando(item)
+            self._baixar_imagem(item, PRIORIDADE_VISIVEL)
+
+    def _concluir_transicao(self):
+        """Passa o item da sobreposição para os widgets reais e retira a sobreposição."""
+        if self.item_pendente is None: return
+        item, self.item_pendente = self.item_pendente, None
+        self._preencher_quadro_visivel(item)
+        self.transicao.encerrar()
+
+    def _quadro_pronto(self, item):
+        """Quadro pré-renderizado do item, se ainda corresponder a ele e ao tamanho atual."""
+        if self.quadro_preparado is None: return None
+        item_preparado, tamanho, pixmap = self.quadro_preparado
+        self.quadro_preparado = None
+        return pixmap if item_preparado == item and tamanho == self.display_stack.size() else None
+
+    def _preparar_proximo(self):
+        """Monta e renderiza o próximo item no quadro oculto enquanto o atual está na tela."""
+        if not PRE_RENDERIZAR_SLIDES or len(self.conteudo_combinado) < 2 or self.transicao.ativa() or self.motivos_pausa: return
+        proximo = self.conteudo_combinado[(self.indice_atual + 1) % len(self.conteudo_combinado)]
+        tamanho = self.display_stack.size()
+        if self.quadro_preparado is not None and self.quadro_preparado[0] == proximo and self.quadro_preparado[1] == tamanho: return
+        if proximo.get('url_imagem'):
+            chave = self._chave_imagem(proximo)
+            if not self.cache_pixmaps.contem(chave): return  # a imagem ainda não chegou; _quando_imagem_pronta tenta de novo
+            pixmap = self.cache_pixmaps.obter(chave)
         else:
-            self.rotulo_imagem_aviso.setText("Imagem não disponível")
+            pixmap = QPixmap()
+        oculto = self.quadro_oculto
+        oculto.setGeometry(self.display_stack.geometry())
+        oculto.preencher(proximo); oculto.exibir_imagem(proximo, pixmap)
+        self.quadro_preparado = (proximo, tamanho, renderizar_opaco(oculto))
+
+    def _rotulo_imagem(self, item) -> QLabel:
+        return self.display_stack.rotulo_imagem(item)
+
+    def _chave_imagem(self, item):
+        tamanho = self._rotulo_imagem(item).size()
+        return (item.get('url_imagem'), tamanho.width(), tamanho.height())
+
+    def _pre_carregar_proximos(self):
+        """Prepara as imagens dos próximos itens enquanto o atual está na tela."""
+        for deslocamento in range(1, min(ITENS_PRE_CARREGADOS, len(self.conteudo_combinado) - 1) + 1):
+            item = self.conteudo_combinado[(self.indice_atual + deslocamento) % len(self.conteudo_combinado)]
+            if item.get('url_imagem') and not self.cache_pixmaps.contem(self._chave_imagem(item)):
+                self._baixar_imagem(item, PRIORIDADE_PRE_CARREGAMENTO)
+
+    def _baixar_imagem(self, item, prioridade):
+        # A chave inclui o tamanho do rótulo: o trabalhador decodifica direto nessa escala.
+        chave = self._chave_imagem(item)
+        url, largura, altura = chave
+        self.imagens_solicitadas.add(chave)
+        ao_parcial = lambda imagem: self.imagem_parcial.emit(chave, imagem)
+        self.agendador.agendar(chave, lambda cancelamento: baixar_imagem(url, cancelamento, (largura, altura), ao_parcial), prioridade, self._quando_imagem_pronta)
+
+    def _cancelar_imagens_obsoletas(self):
+        chaves_atuais = {self._chave_imagem(item) for item in self.conteudo_combinado if item.get('url_imagem')}
+        for chave in self.imagens_solicitadas - chaves_atuais:
+            self.agendador.cancelar(chave, self._quando_imagem_pronta)
+        self.imagens_solicitadas &= chaves_atuais
+
+    def _quando_imagem_pronta(self, chave, imagem):
+        self.imagens_solicitadas.discard(chave)
+        # None: a tarefa levantou uma exceção inesperada (o agendador entrega None nesse caso).
+        pixmap = QPixmap.fromImage(imagem) if imagem is not None and not imagem.isNull() else QPixmap()
+        if not pixmap.isNull(): self.cache_pixmaps.inserir(chave, pixmap)
+        item_atual = self.conteudo_combinado[self.indice_atual] if self.conteudo_combinado else None
+        if item_atual is not None and item_atual.get('url_imagem') and self._chave_imagem(item_atual) == chave:
+            self.display_stack.exibir_imagem(item_atual, pixmap); self.quadro_exibido = None
+        elif not self.timer_preparo.isActive():
+            self.timer_preparo.start()  # pode ser a imagem que faltava para preparar o próximo item
+
+    def _quando_imagem_parcial(self, chave, imagem):
+        """Quadro parcial de um download em andamento: substitui o "Carregando" se o item estiver na tela."""
+        if chave not in self.imagens_solicitadas or self.cache_pixmaps.contem(chave): return
+        item_atual = self.conteudo_combinado[self.indice_atual] if self.conteudo_combinado else None
+        if item_atual is not None and item_atual.get('url_imagem') and self._chave_imagem(item_atual) == chave:
+            self.display_stack.exibir_imagem(item_atual, QPixmap.fromImage(imagem)); self.quadro_exibido = None
+
+    def resizeEvent(self, evento):
+        # As imagens guardadas foram escaladas para o tamanho antigo dos rótulos.
+        self.cache_pixmaps.invalidar()
+        self._concluir_transicao(); self.quadro_preparado = self.quadro_exibido = None
+        super().resizeEvent(evento)
+        if self.conteudo_combinado and self.indice_atual >= 0:
+            self.timer_reescala.start()
+
+    def _reescalar_imagem_atual(self):
+        self._cancelar_imagens_obsoletas()  # pedidos feitos no tamanho antigo
+        item_atual = self.conteudo_combinado[self.indice_atual] if self.conteudo_combinado and self.indice_atual >= 0 else None
+        if item_atual and item_atual.get('url_imagem'):
+            self._baixar_imagem(item_atual, PRIORIDADE_VISIVEL)
 
 class MenuLateral(QWidget):
     def __init__(self, parent=None):
@@ -165,8 +389,7 @@ class MenuLateral(QWidget):
             QPushButton:disabled { color: #aaaaaa; background-color: transparent; }
         """)
         layout = QVBoxLayout(self); layout.setContentsMargins(10, 20, 10, 20); layout.setSpacing(8)
-        shadow = QGraphicsDropShadowEffect(); shadow.setBlurRadius(20); shadow.setColor(QColor(0,0,0,30)); shadow.setOffset(2,0)
-        self.setGraphicsEffect(shadow)
+        self.setGraphicsEffect(criar_sombra(20, QColor(0, 0, 0, 30), (2, 0)))
         botoes_info = [
             ("inicio", "🏠  Página Inicial"), ("campus", "🏛️  Conheça o Campus"), ("onibus", "🚌  Linha de Ônibus"),
             ("horarios", "⏰  Horário de Aulas"), ("agenda", "📅  Agenda FCT"), ("mapa", "🗺️  Mapa de Salas"),
@@ -1,28 +1,74 @@
 # utils.py
 
-import qrcode
-from io import BytesIO
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QImage, QPixmap
+from functools import lru_cache
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice, QSize, Qt
+from PyQt6.QtGui import QImage, QImageReader, QPixmap
 
-def criar_qr_code(url: str, tamanho: int = 150) -> QPixmap:
-    """Gera uma imagem QPixmap de um QR Code a partir de uma URL."""
+from config import TAMANHO_QR_CODE, BORDA_QR_CODE, LIMITE_CACHE_QR_CODES, LIMITE_PIXELS_IMAGEM
+
+def gerar_imagem_qr(url: str, tamanho: int = TAMANHO_QR_CODE, borda: int = BORDA_QR_CODE) -> QImage:
+    """Gera o QR Code da URL como QImage em tons de cinza, já no tamanho final.
+
+    A matriz de módulos é desenhada diretamente nos bytes da imagem, sem passar por PIL/PNG
+    nem por escala suavizada. Pode ser chamada fora da thread da interface; o resultado
+    fica em um cache LRU indexado por (url, tamanho, borda).
+    """
+    # Os padrões são preenchidos antes do cache: o lru_cache trata gerar(url) e gerar(url, 150)
+    # como chaves diferentes, e o aquecimento no trabalhador não serviria à interface.
+    return _gerar_imagem_qr(url, tamanho, borda)
+
+@lru_cache(maxsize=LIMITE_CACHE_QR_CODES)
+def _gerar_imagem_qr(url: str, tamanho: int, borda: int) -> QImage:
+    import qrcode
     try:
-        qr = qrcode.QRCode(version=1, box_size=10, border=4)
+        qr = qrcode.QRCode(version=1, border=borda)
         qr.add_data(url)
         qr.make(fit=True)
-        img_pil = qr.make_image(fill_color="black", back_color="white")
-        
-        buffer = BytesIO()
-        img_pil.save(buffer, format='PNG')
-        buffer.seek(0)
-        
-        qimagem = QImage.fromData(buffer.getvalue())
-        return QPixmap.fromImage(qimagem).scaled(
-            tamanho, tamanho, 
-            Qt.AspectRatioMode.KeepAspectRatio, 
-            Qt.TransformationMode.SmoothTransformation
-        )
+        matriz = qr.get_matrix()
+        modulos = len(matriz)
+        # Bordas de cada módulo em pixels; arredondar evita borrões quando o tamanho não é múltiplo.
+        limites = [round(i * tamanho / modulos) for i in range(modulos + 1)]
+        branco = b'\xff' * tamanho
+        linhas = []
+        for i, linha_matriz in enumerate(matriz):
+            pixels = bytearray(branco)
+            for j, escuro in enumerate(linha_matriz):
+                if escuro: pixels[limites[j]:limites[j + 1]] = bytes(limites[j + 1] - limites[j])
+            linhas.append(bytes(pixels) * (limites[i + 1] - limites[i]))
+        dados = b''.join(linhas)
+        return QImage(dados, tamanho, tamanho, tamanho, QImage.Format.Format_Grayscale8).copy()
     except Exception as e:
         print(f"Erro ao criar QR code: {e}")
-        return QPixmap()
\ No newline at end of file
+        return QImage()
+
+gerar_imagem_qr.cache_info = _gerar_imagem_qr.cache_info
+gerar_imagem_qr.cache_clear = _gerar_imagem_qr.cache_clear
+
+def criar_qr_code(url: str, tamanho: int = TAMANHO_QR_CODE) -> QPixmap:
+    """Gera uma imagem QPixmap de um QR Code a partir de uma URL."""
+    return QPixmap.fromImage(gerar_imagem_qr(url, tamanho))
+
+def decodificar_imagem(dados: bytes, tamanho=None, ampliar: bool = True) -> QImage:
+    """Decodifica a imagem já no tamanho em que será exibida.
+
+    Com `tamanho` (largura, altura), o QImageReader entrega a imagem ajustada a essa caixa,
+    mantendo a proporção; no JPEG a redução acontece na própria decodificação, sem
+    materializar a imagem inteira. Com `ampliar=False`, imagens menores que a caixa ficam
+    como estão. Imagens acima de LIMITE_PIXELS_IMAGEM são recusadas. Pode ser chamada fora
+    da thread da interface, pois retorna QImage.
+    """
+    buffer = QBuffer()
+    buffer.setData(QByteArray(dados))
+    buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+    leitor = QImageReader(buffer)
+    original = leitor.size()
+    if original.isValid():
+        if original.width() * original.height() > LIMITE_PIXELS_IMAGEM:
+            print(f"Imagem de {original.width()}x{original.height()} recusada: acima de {LIMITE_PIXELS_IMAGEM} pixels.")
+            return QImage()
+        if tamanho and tamanho[0] > 0 and tamanho[1] > 0:
+            caixa = QSize(*tamanho)
+            if ampliar or original.width() > caixa.width() or original.height() > caixa.height():
+                alvo = original.scaled(caixa, Qt.AspectRatioMode.KeepAspectRatio)
+                if alvo != original and not alvo.isEmpty(): leitor.setScaledSize(alvo)
+    return leitor.read()
@@ -1,83 +1,622 @@
 # workers.py
 
-import requests
-import feedparser
+import calendar
+import heapq
+import itertools
+import queue
+import socket
+import threading
 import time
 from datetime import datetime
-from bs4 import BeautifulSoup
-from PyQt6.QtCore import QThread, pyqtSignal
-from PyQt6.QtGui import QImage, QPixmap
+from urllib.parse import urlencode, urlsplit
+from PyQt6.QtCore import QObject, QCoreApplication, pyqtSignal
+from PyQt6.QtGui import QImage
 
-from config import URL_FEED, LIMITE_TITULO, LIMITE_DESCRICAO, URL_AVISOS
+from cache import obter_cache_imagens
+from extrator_html import extrair_descricao
+from leitor_rss import ler_rss, FormatoNaoSuportado
+from utils import gerar_imagem_qr, decodificar_imagem
+from config import (URL_FEED, LIMITE_POR_FONTE, TEMPO_MAXIMO_FONTE, LEITURAS_SIMULTANEAS_FEED, VANTAGEM_PESO_HORAS, LIMITE_TITULO, LIMITE_DESCRICAO, URL_AVISOS, NUM_TRABALHADORES_DOWNLOAD,
+                    SINCRONIZACAO_INCREMENTAL_AVISOS, PARAMETRO_AVISOS_DESDE, URL_RETRANSMISSOR, ID_TELA,
+                    EXIBICAO_PROGRESSIVA, INTERVALO_IMAGEM_PARCIAL, LEITURA_INCREMENTAL_FEED, TAMANHO_BLOCO_DOWNLOAD)
 
-class BaixadorNoticias(QThread):
-    noticias_prontas = pyqtSignal(list)
-    def run(self):
+# Prioridades do agendador: valores menores são atendidos primeiro.
+PRIORIDADE_VISIVEL = 0
+PRIORIDADE_PRE_CARREGAMENTO = 1
+PRIORIDADE_SEGUNDO_PLANO = 2
+
+# requests e feedparser são importados dentro das tarefas, já nas threads do
+# agendador, para que não pesem na abertura da janela.
+
+class Tarefa:
+    """Um download agendado. Vários solicitantes da mesma chave compartilham a mesma tarefa."""
+    def __init__(self, chave, funcao, prioridade):
+        self.chave = chave
+        self.funcao = funcao
+        self.prioridade = prioridade
+        self.callbacks = []
+        self.cancelamento = threading.Event()
+        self.em_execucao = False
+
+class AgendadorDownloads(QObject):
+    """Pool fixo de threads com fila por prioridade, coalescência por chave e cancelamento cooperativo.
+
+    As funções agendadas recebem um threading.Event de cancelamento e devem consultá-lo entre etapas
+    demoradas. Os callbacks são chamados na thread da interface com (chave, resultado); se a função
+    levantar uma exceção, o resultado é None.
+    """
+    _tarefa_concluida = pyqtSignal(object, object)
+
+    def __init__(self, num_trabalhadores: int, parent=None):
+        super().__init__(parent)
+        self._condicao = threading.Condition()
+        self._fila = []  # heap de (prioridade, sequência, tarefa)
+        self._tarefas = {}  # chave -> Tarefa pendente ou em execução
+        self._sequencia = itertools.count()
+        self._encerrando = False
+        self._tarefa_concluida.connect(self._entregar)
+        self._trabalhadores = [threading.Thread(target=self._trabalhar, name=f"download-{i}", daemon=True) for i in range(num_trabalhadores)]
+        for trabalhador in self._trabalhadores: trabalhador.start()
+        app = QCoreApplication.instance()
+        if app is not None: app.aboutToQuit.connect(self.encerrar)
+
+    def agendar(self, chave, funcao, prioridade=PRIORIDADE_VISIVEL, ao_concluir=None) -> Tarefa:
+        """Agenda funcao(cancelamento) sob a chave. Se a chave já estiver na fila, apenas soma o
+        callback e eleva a prioridade quando a nova for mais urgente."""
+        with self._condicao:
+            tarefa = self._tarefas.get(chave)
+            if tarefa is None or tarefa.cancelamento.is_set():
+                tarefa = Tarefa(chave, funcao, prioridade)
+                self._tarefas[chave] = tarefa
+                heapq.heappush(self._fila, (prioridade, next(self._sequencia), tarefa))
+                self._condicao.notify()
+            elif prioridade < tarefa.prioridade:
+                tarefa.prioridade = prioridade
+                if not tarefa.em_execucao:
+                    # A entrada antiga fica no heap e é ignorada ao ser retirada.
+                    heapq.heappush(self._fila, (prioridade, next(self._sequencia), tarefa))
+            if ao_concluir is not None and ao_concluir not in tarefa.callbacks:
+                tarefa.callbacks.append(ao_concluir)
+            return tarefa
+
+    def cancelar(self, chave, ao_concluir=None):
+        """Retira o callback da tarefa; sem solicitantes restantes, a tarefa é cancelada."""
+        with self._condicao:
+            tarefa = self._tarefas.get(chave)
+            if tarefa is None: return
+            if ao_concluir is not None and ao_concluir in tarefa.callbacks:
+                tarefa.callbacks.remove(ao_concluir)
+            if ao_concluir is None or not tarefa.callbacks:
+                tarefa.cancelamento.set()
+                del self._tarefas[chave]
+
+    def encerrar(self):
+        with self._condicao:
+            self._encerrando = True
+            for tarefa in self._tarefas.values(): tarefa.cancelamento.set()
+            self._tarefas.clear(); self._fila.clear()
+            self._condicao.notify_all()
+
+    def pendentes(self) -> int:
+        with self._condicao:
+            return len(self._tarefas)
+
+    def _proxima_tarefa(self):
+        with self._condicao:
+            while True:
+                if self._encerrando: return None
+                while self._fila:
+                    prioridade, _, tarefa = heapq.heappop(self._fila)
+                    if tarefa.cancelamento.is_set() or tarefa.em_execucao or prioridade != tarefa.prioridade:
+                        continue
+                    tarefa.em_execucao = True
+                    return tarefa
+                self._condicao.wait()
+
+    def _trabalhar(self):
+        while True:
+            tarefa = self._proxima_tarefa()
+            if tarefa is None: return
+            try:
+                resultado = tarefa.funcao(tarefa.cancelamento)
+            except Exception as e:
+                print(f"Erro na tarefa '{tarefa.chave}': {e}"); resultado = None
+            with self._condicao:
+                if self._tarefas.get(tarefa.chave) is tarefa: del self._tarefas[tarefa.chave]
+            if not tarefa.cancelamento.is_set():
+                self._tarefa_concluida.emit(tarefa, resultado)
+
+    def _entregar(self, tarefa, resultado):
+        with self._condicao:
+            callbacks = list(tarefa.callbacks)
+        for callback in callbacks:
+            callback(tarefa.chave, resultado)
+
+_agendador = None
+
+def obter_agendador() -> AgendadorDownloads:
+    """Retorna o agendador compartilhado. A primeira chamada deve ocorrer na thread da interface."""
+    global _agendador
+    if _agendador is None:
+        _agendador = AgendadorDownloads(NUM_TRABALHADORES_DOWNLOAD)
+    return _agendador
+
+class PoolFontes:
+    """Threads fixas que leem as fontes do feed. Cada rodada enfileira uma leitura por fonte e espera
+    pelos resultados; leituras canceladas antes de começar saem da fila sem acessar a rede."""
+    def __init__(self, num_threads: int):
+        self._fila = queue.Queue()
+        for i in range(num_threads): threading.Thread(target=self._trabalhar, name=f"feed-{i}", daemon=True).start()
+
+    def executar(self, funcao):
+        self._fila.put(funcao)
+
+    def _trabalhar(self):
+        while True:
+            funcao = self._fila.get()
+            try: funcao()
+            except Exception as e: print(f"Erro na leitura do feed: {e}")
+
+_pool_fontes = None
+_trava_pool_fontes = threading.Lock()
+
+def obter_pool_fontes() -> PoolFontes:
+    global _pool_fontes
+    with _trava_pool_fontes:
+        if _pool_fontes is None: _pool_fontes = PoolFontes(LEITURAS_SIMULTANEAS_FEED)
+        return _pool_fontes
+
+class CancelamentoLeitura:
+    """Cancelamento de uma leitura de fonte feito por outra thread: sinaliza, como o threading.Event
+    das tarefas do agendador, e interrompe o socket da resposta em andamento, o que desbloqueia a
+    leitura; a própria thread da leitura fecha a resposta em seguida."""
+    def __init__(self):
+        self._trava = threading.Lock()
+        self._cancelado = False
+        self._resposta = None
+
+    def is_set(self) -> bool:
+        return self._cancelado
+
+    def acompanhar(self, resposta) -> bool:
+        """Chamado pela thread da leitura com a resposta aberta; se já foi cancelada, fecha-a e retorna False."""
+        with self._trava:
+            self._resposta = resposta
+            if self._cancelado: resposta.close()
+            return not self._cancelado
+
+    def cancelar(self):
+        with self._trava:
+            self._cancelado = True
+            if self._resposta is None: return
+            # shutdown acorda um recv bloqueado na thread da leitura. Fechar a resposta daqui
+            # disputaria a trava do buffer com essa leitura e só voltaria no TIMEOUT_LEITURA.
+            sock = getattr(getattr(self._resposta.raw, 'connection', None), 'sock', None)
+            if sock is not None:
+                try: sock.shutdown(socket.SHUT_RDWR)
+                except OSError: pass
+
+class EstadoFonte:
+    """Validadores HTTP e entradas da última resposta válida de uma fonte do feed."""
+    def __init__(self):
+        self.etag = None
+        self.last_modified = None
+        self.entradas = []  # (guid, link normalizado, marca de atualização, instante de publicação, processar)
+
+class EstadoFeed:
+    """Estado da última leitura do feed: validadores HTTP e registros já processados por GUID."""
+    def __init__(self):
+        self.etag = None  # do retransmissor; as fontes RSS guardam os seus em `fontes`
+        self.last_modified = None
+        self.fontes = {}  # url -> EstadoFonte
+        self.registros = {}  # guid -> (marca de atualização, registro processado)
+        self.ordem = []
+
+def fontes_feed(valor=None) -> list:
+    """Normaliza URL_FEED (uma URL, uma fonte ou uma lista delas) em fontes com url, limite e peso."""
+    valor = URL_FEED if valor is None else valor
+    fontes = []
+    for item in ([valor] if isinstance(valor, (str, dict)) else valor):
+        fonte = {'url': item} if isinstance(item, str) else dict(item)
+        fonte.setdefault('limite', LIMITE_POR_FONTE); fonte.setdefault('peso', 1)
+        fonte.setdefault('tempo_maximo', TEMPO_MAXIMO_FONTE)
+        if all(fonte['url'] != outra['url'] for outra in fontes): fontes.append(fonte)
+    return fontes
+
+def _chave_link(link: str):
+    """O mesmo artigo com ou sem www, http/https ou barra final conta como um só."""
+    partes = urlsplit(link.strip())
+    host = partes.netloc.lower()
+    if host.startswith('www.'): host = host[4:]
+    return (host, partes.path.rstrip('/'), partes.query) if host else None
+
+def _entrada_feed(entrada) -> tuple:
+    publicacao = entrada.get('published_parsed') or entrada.get('updated_parsed')
+    link = entrada.get('link', '')
+    return (entrada.get('id') or link, _chave_link(link), entrada.get('updated') or entrada.get('published'),
+            calendar.timegm(publicacao) if publicacao else None, lambda: processar_entrada_feed(entrada))
+
+def _blocos(resposta, cancelamento):
+    """Blocos do corpo, já descomprimidos, à medida que chegam: read1 não espera juntar
+    TAMANHO_BLOCO_DOWNLOAD, então o cancelamento é visto mesmo numa fonte que goteja bytes."""
+    while True:
+        bloco = resposta.raw.read1(TAMANHO_BLOCO_DOWNLOAD, decode_content=True)
+        if cancelamento is not None and cancelamento.is_set(): raise InterruptedError("Leitura cancelada")
+        if not bloco: return
+        yield bloco
+
+def _ler_entradas(resposta, limite: int, cancelamento=None) -> list:
+    """Primeiras `limite` entradas da resposta (pedida com stream=True), que é fechada em seguida.
+
+    Com LEITURA_INCREMENTAL_FEED, o RSS 2.0 é lido em blocos só até o último item pedido; os
+    demais formatos, e o XML que o leitor incremental não aceita, seguem para o feedparser.
+    A leitura é interrompida entre blocos quando `cancelamento` é sinalizado.
+    """
+    blocos = _blocos(resposta, cancelamento)
+    try:
+        if LEITURA_INCREMENTAL_FEED:
+            try: return ler_rss(blocos, limite)
+            except FormatoNaoSuportado as e: conteudo = e.lidos + b"".join(blocos)
+        else:
+            conteudo = b"".join(blocos)
+        import feedparser
+        return feedparser.parse(conteudo, response_headers={k.lower(): v for k, v in resposta.headers.items()}).entries[:limite]
+    finally:
+        resposta.close()
+
+def ler_fonte(fonte: dict, estado_fonte: EstadoFonte, cancelamento: CancelamentoLeitura = None):
+    """Baixa uma fonte de forma condicional, sem alterar o estado.
+
+    Retorna 'inalterado' (304), (entradas, etag, last_modified) ou None em caso de erro ou
+    cancelamento. Como o estado só é atualizado por quem espera, uma resposta que chega depois
+    do prazo é descartada.
+    """
+    from rede import requisitar
+    try:
+        if cancelamento is not None and cancelamento.is_set(): return None
+        cabecalhos = {}
+        if estado_fonte.etag: cabecalhos['If-None-Match'] = estado_fonte.etag
+        if estado_fonte.last_modified: cabecalhos['If-Modified-Since'] = estado_fonte.last_modified
+        resposta = requisitar(fonte['url'], cabecalhos, stream=True, fonte="noticias")
+        if cancelamento is not None and not cancelamento.acompanhar(resposta): return None
+        if resposta.status_code == 304 or resposta.status_code >= 400: resposta.close()
+        if resposta.status_code == 304: return 'inalterado'
+        resposta.raise_for_status()
+        entradas = [_entrada_feed(entrada) for entrada in _ler_entradas(resposta, fonte['limite'], cancelamento)]
+        return entradas, resposta.headers.get('ETag'), resposta.headers.get('Last-Modified')
+    except Exception as e:
+        # Cancelada, a leitura falha por ter a conexão encerrada; quem esperava já registrou o atraso.
+        if cancelamento is None or not cancelamento.is_set(): print(f"Erro ao obter notícias de {fonte['url']}: {e}")
+        return None
+
+def mesclar_fontes(fontes_e_entradas) -> list:
+    """Junta as entradas das fontes da mais recente para a mais antiga, sem repetir GUID nem link.
+
+    Uma notícia presente em várias fontes fica com a cópia da fonte de maior peso (ou da primeira
+    listada, no empate). Cada unidade de peso acima de 1 adianta as notícias da fonte em
+    VANTAGEM_PESO_HORAS; as sem data vão para o fim, na ordem do feed. Retorna (guid, marca, processar).
+    """
+    vistas, mescladas = set(), []
+    por_peso = sorted(enumerate(fontes_e_entradas), key=lambda item: -item[1][0]['peso'])
+    for indice, (fonte, entradas) in por_peso:
+        vantagem = (fonte['peso'] - 1) * VANTAGEM_PESO_HORAS * 3600
+        for posicao, (guid, link, marca, instante, processar) in enumerate(entradas):
+            chaves = {('guid', guid)} | ({('link', link)} if link else set())
+            if chaves & vistas: continue
+            vistas |= chaves
+            recencia = -(instante + vantagem) if instante is not None else float('inf')
+            mescladas.append((recencia, indice, posicao, guid, marca, processar))
+    mescladas.sort(key=lambda item: item[:3])
+    return [(guid, marca, processar) for _, _, _, guid, marca, processar in mescladas]
+
+def _diff_noticias(adicionadas=(), alteradas=(), removidas=(), ordem=(), inalterado=False) -> dict:
+    return {'adicionadas': list(adicionadas), 'alteradas': list(alteradas), 'removidas': list(removidas),
+            'ordem': list(ordem), 'inalterado': inalterado}
+
+def processar_entrada_feed(entrada) -> dict:
+    """Converte uma entrada do feedparser no registro exibido pelo carrossel."""
+    url_imagem, descricao = extrair_descricao(entrada.get('description', ''), LIMITE_DESCRICAO)
+    titulo = entrada.get('title', 'Sem Título')
+    if len(titulo) > LIMITE_TITULO: titulo = titulo[:LIMITE_TITULO].rsplit(' ', 1)[0] + '...'
+    data_str = entrada.get('published', 'Data não disponível')
+    try:
+        data_obj = time.strptime(data_str, "%a, %d %b %Y %H:%M:%S %z")
+        data_formatada = time.strftime("%d/%m/%Y às %H:%M", data_obj)
+    except (ValueError, TypeError): data_formatada = 'Data Indisponível'
+    return {
+        'type': 'noticia', 'guid': entrada.get('id') or entrada.get('link', ''), 'titulo': titulo, 'descricao': descricao,
+        'link': entrada.get('link', ''), 'url_imagem': url_imagem, 'data': data_formatada
+    }
+
+class BaixadorNoticias(QObject):
+    """Atualiza o feed de forma condicional e incremental, emitindo apenas as diferenças.
+
+    O diff emitido tem as chaves 'adicionadas' e 'alteradas' (registros), 'removidas' (GUIDs),
+    'ordem' (GUIDs na ordem de exibição) e 'inalterado' (True quando nenhuma fonte mudou).
+    As fontes de URL_FEED (ou `url_feed`) são lidas em paralelo, cada uma com seu tempo máximo;
+    a que não responde a tempo fica de fora da rodada e mantém as notícias anteriores.
+    Com URL_RETRANSMISSOR definido (e sem `url_feed` explícito), os registros já processados
+    vêm do retransmissor da rede local em vez do feed RSS.
+    """
+    noticias_prontas = pyqtSignal(dict)
+    falhou = pyqtSignal()
+    def __init__(self, parent=None, url_feed=None, aquecer_qr=True):
+        super().__init__(parent)
+        self.estado = EstadoFeed()
+        self.url_feed = url_feed
+        self.aquecer_qr = aquecer_qr  # o retransmissor não exibe QR Codes; cada painel gera os seus
+    def start(self):
+        obter_agendador().agendar('noticias', self.run, PRIORIDADE_SEGUNDO_PLANO, self._emitir)
+    def _emitir(self, chave, diff):
+        if diff is None: self.falhou.emit()
+        else: self.noticias_prontas.emit(diff)
+    def run(self, cancelamento=None) -> dict:
+        if URL_RETRANSMISSOR and self.url_feed is None: return self._run_retransmissor()
+        estado, fontes = self.estado, fontes_feed(self.url_feed)
+        resultados = self._ler_fontes(fontes)
+        for fonte in fontes:
+            resultado = resultados.get(fonte['url'])
+            if isinstance(resultado, tuple):
+                estado_fonte = estado.fontes[fonte['url']]
+                estado_fonte.entradas, estado_fonte.etag, estado_fonte.last_modified = resultado
+        if not any(isinstance(resultado, tuple) for resultado in resultados.values()):
+            # Nenhuma fonte trouxe novidade: 304 em alguma delas basta para não contar como falha.
+            if 'inalterado' in resultados.values(): return _diff_noticias(ordem=estado.ordem, inalterado=True)
+            return None
         try:
-            feed = feedparser.parse(URL_FEED)
-            entradas_processadas = []
-            for entrada in feed.entries[:6]:
-                sopa = BeautifulSoup(entrada.get('description', ''), 'html.parser')
-                tag_img = sopa.find('img')
-                url_imagem = tag_img['src'] if tag_img and tag_img.get('src') else None
-                if url_imagem and url_imagem.startswith(("http://fct.ufg.brhttps:", "https://fct.ufg.brhttps:")):
-                    url_imagem = url_imagem.replace("https://fct.ufg.br", "").replace("http://fct.ufg.br", "")
-                [s.decompose() for s in sopa(["script", "style"])]
-                descricao = ' '.join(sopa.get_text(separator=' ', strip=True).split())
-                titulo = entrada.get('title', 'Sem Título')
-                if len(titulo) > LIMITE_TITULO: titulo = titulo[:LIMITE_TITULO].rsplit(' ', 1)[0] + '...'
-                if len(descricao) > LIMITE_DESCRICAO: descricao = descricao[:LIMITE_DESCRICAO].rsplit(' ', 1)[0] + '... - '
-                data_str = entrada.get('published', 'Data não disponível')
-                try:
-                    data_obj = time.strptime(data_str, "%a, %d %b %Y %H:%M:%S %z")
-                    data_formatada = time.strftime("%d/%m/%Y às %H:%M", data_obj)
-                except (ValueError, TypeError): data_formatada = 'Data Indisponível'
-                entradas_processadas.append({
-                    'type': 'noticia', 'titulo': titulo, 'descricao': descricao, 'link': entrada.get('link', ''),
-                    'url_imagem': url_imagem, 'data': data_formatada
-                })
-            self.noticias_prontas.emit(entradas_processadas)
+            return self._aplicar(mesclar_fontes([(fonte, estado.fontes[fonte['url']].entradas) for fonte in fontes]))
         except Exception as e:
-            print(f"Erro ao obter notícias: {e}"); self.noticias_prontas.emit([])
+            print(f"Erro ao processar notícias: {e}"); return None
+    def _ler_fontes(self, fontes) -> dict:
+        """Lê as fontes no pool do feed e espera cada uma até o seu prazo, contado do início da rodada.
 
-class BaixadorAvisos(QThread):
-    avisos_prontos = pyqtSignal(list)
-    def run(self):
+        A fonte que passa do prazo é cancelada: sai da fila se ainda não começou, ou tem a conexão
+        encerrada. Retorna url -> resultado de ler_fonte apenas das que responderam a tempo.
+        """
+        respostas = queue.Queue(); inicio = time.monotonic(); pendentes = {}
+        pool = obter_pool_fontes()
+        for fonte in fontes:
+            estado_fonte = self.estado.fontes.setdefault(fonte['url'], EstadoFonte())
+            cancelamento = CancelamentoLeitura()
+            pendentes[fonte['url']] = (inicio + fonte['tempo_maximo'], fonte, cancelamento)
+            pool.executar(lambda fonte=fonte, estado_fonte=estado_fonte, cancelamento=cancelamento:
+                          respostas.put((fonte['url'], ler_fonte(fonte, estado_fonte, cancelamento))))
+        resultados = {}
+        while pendentes:
+            proximo_prazo = min(prazo for prazo, _, _ in pendentes.values())
+            try: url, resultado = respostas.get(timeout=max(0.0, proximo_prazo - time.monotonic()))
+            except queue.Empty: url = None
+            agora = time.monotonic()
+            if url in pendentes and agora <= pendentes[url][0]:
+                resultados[url] = resultado; del pendentes[url]
+            for url in [url for url, (prazo, _, _) in pendentes.items() if prazo < agora]:
+                _, fonte, cancelamento = pendentes.pop(url)
+                cancelamento.cancelar()
+                print(f"Fonte {url} não respondeu em {fonte['tempo_maximo']}s; fica de fora nesta rodada")
+        return resultados
+    def _run_retransmissor(self) -> dict:
+        from rede import requisitar
+        estado = self.estado
         try:
-            resposta = requests.get(URL_AVISOS, timeout=10)
+            cabecalhos = {}
+            if estado.etag: cabecalhos['If-None-Match'] = estado.etag
+            if estado.last_modified: cabecalhos['If-Modified-Since'] = estado.last_modified
+            resposta = requisitar(f"{URL_RETRANSMISSOR.rstrip('/')}/noticias", cabecalhos, fonte="noticias")
+            if resposta.status_code == 304:
+                return _diff_noticias(ordem=estado.ordem, inalterado=True)
             resposta.raise_for_status()
-            avisos_api = resposta.json()
-            avisos_validos = []
-            agora = datetime.now()
-            for aviso in avisos_api:
-                if not aviso.get('targetScreens'):
-                    try:
-                        inicio = datetime.strptime(aviso['data_inicio'], '%Y-%m-%d %H:%M')
-                        fim = datetime.strptime(aviso['data_fim'], '%Y-%m-%d %H:%M')
-                        if inicio <= agora <= fim:
-                            avisos_validos.append({
-                                'type': 'aviso', 'url_imagem': aviso['url_imagem'],
-                                'titulo': aviso.get('titulo', 'Aviso'), 'data_inicio_obj': inicio # Adiciona obj para ordenar
-                            })
-                    except (ValueError, TypeError, KeyError) as e:
-                        print(f"Aviso '{aviso.get('titulo')}' ignorado por dados inválidos: {e}")
-            
-            avisos_validos.sort(key=lambda x: x['data_inicio_obj'], reverse=True)
-            self.avisos_prontos.emit(avisos_validos)
+            entradas = [(registro['guid'], registro, lambda registro=registro: registro) for registro in resposta.json()['noticias']]
+            diff = self._aplicar(entradas)
+            estado.etag, estado.last_modified = resposta.headers.get('ETag'), resposta.headers.get('Last-Modified')
+            return diff
         except Exception as e:
-            print(f"Erro ao obter avisos: {e}"); self.avisos_prontos.emit([])
+            # O estado é mantido: o carrossel segue com as notícias anteriores.
+            print(f"Erro ao obter notícias: {e}"); return None
+    def _aplicar(self, entradas) -> dict:
+        """Compara (guid, marca de atualização, função que produz o registro), na ordem de exibição, com o estado."""
+        estado = self.estado
+        adicionadas, alteradas, registros, ordem = [], [], {}, []
+        for guid, marca, processar in entradas:
+            if guid in registros: continue
+            anterior = estado.registros.get(guid)
+            if anterior and anterior[0] == marca:
+                registros[guid] = anterior
+            else:
+                registro = processar()
+                registro['guid'] = guid
+                # O QR Code fica pronto no cache antes de o slide aparecer.
+                if self.aquecer_qr and registro['link']: gerar_imagem_qr(registro['link'])
+                registros[guid] = (marca, registro)
+                (alteradas if anterior else adicionadas).append(registro)
+            ordem.append(guid)
+        removidas = [guid for guid in estado.ordem if guid not in registros]
+        estado.registros, estado.ordem = registros, ordem
+        return _diff_noticias(adicionadas, alteradas, removidas, ordem)
+
+def aviso_para_tela(aviso, tela=None) -> bool:
+    """Avisos sem targetScreens valem para todas as telas; os demais, só para as telas listadas."""
+    alvos = aviso.get('targetScreens')
+    return not alvos or (tela if tela is not None else ID_TELA) in alvos
+
+class LojaAvisos:
+    """Avisos conhecidos, indexados por id, com as janelas de exibição já convertidas em datetime.
+
+    Cada aviso guarda uma marca com os campos de origem; um aviso cuja marca não mudou não é
+    convertido de novo. Avisos já expirados saem do índice principal e ficam só com a marca,
+    para que o histórico da API não pese na seleção dos vigentes.
+    """
+    def __init__(self):
+        self.etag = None
+        self.url_etag = None  # o ETag vale apenas para a URL que o devolveu
+        self.cursor = None  # valor de 'atualizado_em' da última resposta incremental
+        self.incremental = SINCRONIZACAO_INCREMENTAL_AVISOS
+        self.registros = {}  # id -> (marca, registro); registro é None para avisos ignorados
+        self.expirados = {}  # id -> marca
+        self.ultima_sincronizacao = {}
 
-class BaixadorImagem(QThread):
-    imagem_pronta = pyqtSignal(QPixmap)
-    def __init__(self, url, parent=None):
+    @staticmethod
+    def _chave_e_marca(aviso):
+        marca = (aviso.get('data_inicio'), aviso.get('data_fim'), aviso.get('url_imagem'),
+                 aviso.get('titulo'), aviso_para_tela(aviso))
+        chave = aviso.get('id')
+        return (marca if chave is None else chave), marca
+
+    def _aplicar(self, aviso, agora, contagem) -> object:
+        chave, marca = self._chave_e_marca(aviso)
+        anterior = self.registros.get(chave)
+        if anterior is not None and anterior[0] == marca: return chave
+        if self.expirados.get(chave) == marca: return chave
+        contagem['atualizados' if anterior is not None or chave in self.expirados else 'inseridos'] += 1
+        self.expirados.pop(chave, None)
+        registro = None
+        if aviso_para_tela(aviso):
+            try:
+                inicio = datetime.strptime(aviso['data_inicio'], '%Y-%m-%d %H:%M')
+                fim = datetime.strptime(aviso['data_fim'], '%Y-%m-%d %H:%M')
+                registro = {
+                    'type': 'aviso', 'url_imagem': aviso['url_imagem'],
+                    'titulo': aviso.get('titulo', 'Aviso'), 'data_inicio_obj': inicio, 'data_fim_obj': fim # Objetos para ordenar e filtrar
+                }
+            except (ValueError, TypeError, KeyError) as e:
+                print(f"Aviso '{aviso.get('titulo')}' ignorado por dados inválidos: {e}")
+        if registro is not None and registro['data_fim_obj'] < agora:
+            self.registros.pop(chave, None); self.expirados[chave] = marca
+        else:
+            self.registros[chave] = (marca, registro)
+        return chave
+
+    def aplicar_lista(self, avisos_api, agora=None):
+        """Sincroniza com a lista completa da API: insere, atualiza e remove o que não veio."""
+        agora = agora or datetime.now()
+        contagem = {'inseridos': 0, 'atualizados': 0, 'removidos': 0}
+        chaves = [self._aplicar(aviso, agora, contagem) for aviso in avisos_api]
+        vistos = set(chaves)
+        removidos = [chave for chave in self.registros if chave not in vistos]
+        removidos += [chave for chave in self.expirados if chave not in vistos]
+        self.remover(removidos, contagem)
+        # Mantém a ordem da API, que desempata avisos com o mesmo início.
+        ordem = {chave: self.registros[chave] for chave in chaves if chave in self.registros}
+        self.registros = ordem
+        self.ultima_sincronizacao = contagem
+
+    def aplicar_delta(self, alterados, removidos, agora=None):
+        """Aplica uma resposta incremental: avisos novos ou alterados e ids removidos."""
+        agora = agora or datetime.now()
+        contagem = {'inseridos': 0, 'atualizados': 0, 'removidos': 0}
+        for aviso in alterados: self._aplicar(aviso, agora, contagem)
+        self.remover(removidos, contagem)
+        self.ultima_sincronizacao = contagem
+
+    def remover(self, chaves, contagem=None):
+        for chave in chaves:
+            if self.registros.pop(chave, None) is not None or self.expirados.pop(chave, None) is not None:
+                if contagem is not None: contagem['removidos'] += 1
+
+    def programados(self, agora=None) -> list:
+        """Avisos desta tela ainda não expirados (vigentes e futuros), do início mais recente para o mais antigo."""
+        agora = agora or datetime.now()
+        avisos, vencidos = [], []
+        for chave, (marca, registro) in self.registros.items():
+            if registro is None: continue
+            if registro['data_fim_obj'] < agora: vencidos.append(chave)
+            else: avisos.append(registro)
+        for chave in vencidos:
+            self.expirados[chave] = self.registros.pop(chave)[0]
+        avisos.sort(key=lambda x: x['data_inicio_obj'], reverse=True)
+        return avisos
+
+    def vigentes(self, agora=None) -> list:
+        """Avisos desta tela dentro da janela em `agora`, do início mais recente para o mais antigo."""
+        agora = agora or datetime.now()
+        return [aviso for aviso in self.programados(agora) if aviso['data_inicio_obj'] <= agora]
+
+def filtrar_avisos(avisos_api, agora=None) -> list:
+    """Mantém os avisos desta tela vigentes em `agora`, do início mais recente para o mais antigo."""
+    loja = LojaAvisos()
+    loja.aplicar_lista(avisos_api, agora)
+    return loja.vigentes(agora)
+
+class BaixadorAvisos(QObject):
+    """Sincroniza a LojaAvisos com a API e emite os avisos programados (vigentes e futuros);
+    a AgendaAvisos decide quando cada um entra e sai do carrossel.
+
+    Com um cursor de sincronização, pede só as mudanças (parâmetro PARAMETRO_AVISOS_DESDE); a API
+    que oferece isso responde {'avisos': [...], 'removidos': [ids], 'atualizado_em': cursor}.
+    Uma resposta em lista é sempre tratada como a lista completa, o que cobre APIs sem suporte,
+    e o ETag evita baixar de novo a lista que não mudou.
+    """
+    avisos_prontos = pyqtSignal(list)
+    falhou = pyqtSignal()
+    def __init__(self, parent=None):
         super().__init__(parent)
-        self.url = url
-    def run(self):
-        if not self.url: self.imagem_pronta.emit(QPixmap()); return
+        self.loja = LojaAvisos()
+    def start(self):
+        obter_agendador().agendar('avisos', self.run, PRIORIDADE_SEGUNDO_PLANO, self._emitir)
+    def _emitir(self, chave, avisos):
+        if avisos is None: self.falhou.emit()
+        else: self.avisos_prontos.emit(avisos)
+    def _url_base(self) -> str:
+        if URL_RETRANSMISSOR: return f"{URL_RETRANSMISSOR.rstrip('/')}/avisos?{urlencode({'tela': ID_TELA})}"
+        return URL_AVISOS
+    def _url(self) -> str:
+        loja, base = self.loja, self._url_base()
+        if not (loja.incremental and loja.cursor): return base
+        return f"{base}{'&' if '?' in base else '?'}{urlencode({PARAMETRO_AVISOS_DESDE: loja.cursor})}"
+    def run(self, cancelamento=None) -> list:
+        from rede import requisitar
+        loja = self.loja
         try:
-            resposta = requests.get(self.url, timeout=15)
+            url = self._url()
+            cabecalhos = {'If-None-Match': loja.etag} if loja.etag and loja.url_etag == url else {}
+            resposta = requisitar(url, cabecalhos, fonte="avisos")
+            if resposta.status_code == 304:
+                loja.ultima_sincronizacao = {'inseridos': 0, 'atualizados': 0, 'removidos': 0}
+                return loja.programados()
             resposta.raise_for_status()
-            img = QImage.fromData(resposta.content)
-            self.imagem_pronta.emit(QPixmap.fromImage(img))
-        except requests.RequestException as e:
-            print(f"Erro ao baixar imagem da URL {self.url}: {e}"); self.imagem_pronta.emit(QPixmap())
\ No newline at end of file
+            dados = resposta.json()
+            if isinstance(dados, dict) and 'avisos' in dados:
+                if url != self._url_base() and not dados.get('completo'):
+                    loja.aplicar_delta(dados['avisos'], dados.get('removidos', []))
+                else:
+                    loja.aplicar_lista(dados['avisos'])
+                loja.cursor = dados.get('atualizado_em')
+            else:
+                # A API devolveu a lista inteira mesmo com o cursor: não há sincronização incremental.
+                if url != self._url_base(): loja.incremental = False
+                loja.aplicar_lista(dados); loja.cursor = None
+            loja.etag, loja.url_etag = resposta.headers.get('ETag'), url
+            return loja.programados()
+        except Exception as e:
+            # A loja é mantida: na próxima tentativa a sincronização continua de onde parou.
+            print(f"Erro ao obter avisos: {e}"); return None
+
+def _decodificador_parcial(tamanho, ao_parcial):
+    """Função para ler_corpo que decodifica o JPEG recebido até aqui, no máximo a cada INTERVALO_IMAGEM_PARCIAL.
+
+    O leitor de PNG do Qt não decodifica arquivos incompletos, nem entrelaçados; esses só aparecem prontos.
+    """
+    intervalo = INTERVALO_IMAGEM_PARCIAL / 1000
+    proxima = [time.monotonic() + intervalo]
+    def ao_receber(dados):
+        if time.monotonic() < proxima[0] or dados[:2] != b'\xff\xd8': return
+        imagem = decodificar_imagem(bytes(dados), tamanho)
+        if not imagem.isNull(): ao_parcial(imagem)
+        proxima[0] = time.monotonic() + intervalo
+    return ao_receber
+
+def baixar_imagem(url: str, cancelamento=None, tamanho=None, ao_parcial=None) -> QImage:
+    """Tarefa do agendador: obtém a imagem (via cache em disco) e a decodifica já em `tamanho`.
+
+    Retorna QImage, vazia em caso de falha; o QPixmap é criado na thread da interface. Com EXIBICAO_PROGRESSIVA,
+    `ao_parcial(imagem)` recebe, ainda na thread do trabalhador, os quadros parciais de um download lento.
+    """
+    import requests
+    if not url or (cancelamento and cancelamento.is_set()): return QImage()
+    ao_receber = _decodificador_parcial(tamanho, ao_parcial) if ao_parcial is not None and EXIBICAO_PROGRESSIVA else None
+    try:
+        conteudo = obter_cache_imagens().obter(url, ao_receber, cancelamento)
+        if conteudo is None or (cancelamento and cancelamento.is_set()): return QImage()
+        return decodificar_imagem(conteudo, tamanho)
+    except (requests.RequestException, OSError) as e:
+        # OSError cobre o cache em disco (diretório sem permissão, disco cheio).
+        print(f"Erro ao baixar imagem da URL {url}: {e}"); return QImage()